@@ -0,0 +1,291 @@
+"""
+Sentiment Analysis Platform - ASGI Application
+Serves the Flask application from an event loop, for example with
+``uvicorn app.asgi:application``.
+
+POST /analyze runs natively on the loop: the upload is parsed on a thread
+pool and the Google API calls are awaited, so one process can keep hundreds
+of analyses in flight without a thread for each. Every other route (pages,
+batch, jobs, progress events) runs through a WSGI bridge on a bounded
+thread pool, with response chunks streamed as they are produced. Both paths
+use the same blueprints, templates and JSON responses as the WSGI app.
+"""
+
+import asyncio
+import contextvars
+import logging
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from app.main import create_app
+from config.settings import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Response messages buffered between a bridged WSGI response and a slow client
+BRIDGE_QUEUE_SIZE = 16
+
+_default_application = None
+_default_application_lock = threading.Lock()
+
+
+def _build_environ(scope, body, length):
+    """Translate an ASGI HTTP scope and its spooled request body into a WSGI environ."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'CONTENT_LENGTH': str(length),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': body,
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin-1').upper().replace('-', '_')
+        value = value.decode('latin-1')
+        if name == 'CONTENT_TYPE':
+            environ['CONTENT_TYPE'] = value
+        elif name != 'CONTENT_LENGTH':
+            key = f'HTTP_{name}'
+            environ[key] = f'{environ[key]},{value}' if key in environ else value
+
+    return environ
+
+
+async def _read_body(receive, limit):
+    """
+    Spool the request body, stopping once it is longer than ``limit``.
+
+    Large bodies spill to UPLOAD_FOLDER rather than staying in memory. A body
+    cut short this way is still one byte over the limit, so Flask rejects it
+    exactly as it would under a WSGI server.
+
+    Returns:
+        Tuple: (rewound spool file, length), or None if the client went away
+    """
+    from app.utils.uploads import spool_dir
+
+    body = tempfile.SpooledTemporaryFile(max_size=Config.UPLOAD_SPOOL_MAX_MEMORY, dir=spool_dir())
+    length = 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            body.close()
+            return None
+        chunk = message.get('body', b'')
+        if limit is not None and length + len(chunk) > limit:
+            chunk = chunk[:limit + 1 - length]
+        body.write(chunk)
+        length += len(chunk)
+        if (limit is not None and length > limit) or not message.get('more_body', False):
+            body.seek(0)
+            return body, length
+
+
+class AsgiApplication:
+    """
+    ASGI application wrapping a Flask application from create_app().
+
+    Args:
+        flask_app (Flask): The application whose routes are served
+        wsgi_threads (int): Threads for routes served through the WSGI
+            bridge, defaults to Config.ASYNC_WSGI_THREADS
+    """
+
+    def __init__(self, flask_app, wsgi_threads=None):
+        self.flask_app = flask_app
+        self.wsgi_executor = ThreadPoolExecutor(max_workers=wsgi_threads or Config.ASYNC_WSGI_THREADS,
+                                                thread_name_prefix='asgi-wsgi')
+        # Endpoints with a native coroutine handler
+        self.native_handlers = {'analysis.analyze': self._analyze}
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        from app.utils.async_http_client import close_async_client
+
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await close_async_client()
+                self.wsgi_executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _endpoint(self, scope):
+        from werkzeug.exceptions import HTTPException
+
+        adapter = self.flask_app.url_map.bind('localhost', script_name=scope.get('root_path') or None)
+        try:
+            return adapter.match(scope['path'], scope['method'])[0]
+        except HTTPException:
+            return None
+
+    async def _http(self, scope, receive, send):
+        from app.utils.profiling import profile_reason
+
+        limit = self.flask_app.config.get('MAX_CONTENT_LENGTH')
+        spooled = await _read_body(receive, limit)
+        if spooled is None:
+            return
+        body, length = spooled
+
+        try:
+            environ = _build_environ(scope, body, length)
+
+            # Oversized uploads go through Flask, which rejects them as it does under WSGI;
+            # profiled requests too, since cProfile follows a thread, not a coroutine
+            handler = self.native_handlers.get(self._endpoint(scope))
+            if (handler is not None and (limit is None or length <= limit)
+                    and profile_reason(environ, self.flask_app.config) is None):
+                response = await handler(environ)
+                await send({
+                    'type': 'http.response.start',
+                    'status': response.status_code,
+                    'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                for name, value in response.headers.items()]
+                })
+                await send({'type': 'http.response.body', 'body': response.get_data()})
+            else:
+                await self._call_wsgi(environ, send)
+        finally:
+            body.close()
+
+    async def _analyze(self, environ):
+        """POST /analyze with the same validation and responses as the Flask view."""
+        from flask import jsonify
+
+        from app.routes.analysis import prepare_analysis
+
+        loop = asyncio.get_running_loop()
+        with self.flask_app.request_context(environ):
+            try:
+                # Parsing the multipart form and queueing a job both block
+                context = contextvars.copy_context()
+                response, work = await loop.run_in_executor(None, context.run, prepare_analysis)
+                if response is None:
+                    pipeline, file, mode = work
+                    response = jsonify(await pipeline.run_async(file, file.filename, mode))
+
+            except Exception as e:
+                logger.error(f"Analysis error: {str(e)}")
+                response = jsonify({'error': f'An error occurred: {str(e)}'})
+
+            return self.flask_app.make_response(response)
+
+    async def _call_wsgi(self, environ, send):
+        """Run a request through the Flask WSGI app on the bridge pool, streaming its output."""
+        loop = asyncio.get_running_loop()
+        messages = asyncio.Queue(maxsize=BRIDGE_QUEUE_SIZE)
+        disconnected = threading.Event()
+
+        def put(*message):
+            # Block the producing thread while the queue is full, until the client is gone
+            future = asyncio.run_coroutine_threadsafe(messages.put(message), loop)
+            while not disconnected.is_set():
+                try:
+                    return future.result(timeout=0.5)
+                except FutureTimeout:
+                    continue
+            future.cancel()
+
+        def start_response(status, headers, exc_info=None):
+            put('start', int(status.split(' ', 1)[0]), headers)
+
+        def run():
+            try:
+                chunks = self.flask_app(environ, start_response)
+                try:
+                    for chunk in chunks:
+                        # Stop producing (e.g. progress events) once the client is gone
+                        if disconnected.is_set():
+                            break
+                        if chunk:
+                            put('body', chunk)
+                finally:
+                    if hasattr(chunks, 'close'):
+                        chunks.close()
+            except Exception as e:
+                logger.error(f"WSGI bridge error: {str(e)}")
+                put('start', 500, [('Content-Type', 'text/plain')])
+            finally:
+                put('end')
+
+        loop.run_in_executor(self.wsgi_executor, run)
+
+        start = None
+        started = False
+        try:
+            while True:
+                message = await messages.get()
+                if message[0] == 'start':
+                    # WSGI allows replacing the status until output begins
+                    if not started:
+                        start = message
+                    continue
+                if not started:
+                    await send({
+                        'type': 'http.response.start',
+                        'status': start[1],
+                        'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                                    for name, value in start[2]]
+                    })
+                    started = True
+                if message[0] == 'end':
+                    await send({'type': 'http.response.body', 'body': b''})
+                    return
+                await send({'type': 'http.response.body', 'body': message[1], 'more_body': True})
+        except OSError:
+            # The server raises once the client has disconnected
+            pass
+        finally:
+            # Also on cancellation, so a producer blocked on the full queue gives up
+            disconnected.set()
+
+
+def create_asgi_app(config_name=None, **overrides):
+    """
+    Create the ASGI application.
+
+    Args:
+        config_name (str): Key of config.settings.config, as for create_app()
+        **overrides: Config values passed on to create_app()
+
+    Returns:
+        AsgiApplication: The application to hand to an ASGI server
+    """
+    return AsgiApplication(create_app(config_name, **overrides))
+
+
+def __getattr__(name):
+    # `uvicorn app.asgi:application` builds the default application on first use
+    global _default_application
+    if name == 'application':
+        if _default_application is None:
+            with _default_application_lock:
+                if _default_application is None:
+                    _default_application = create_asgi_app()
+        return _default_application
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
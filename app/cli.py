@@ -0,0 +1,395 @@
+"""
+Bulk Command-Line Analyzer
+Scores every PDF under a directory tree without going through HTTP.
+
+Files are analyzed by worker processes, one file per worker at a time, with
+a per-file timeout, and results are streamed as JSON Lines or CSV as they
+finish. A file that runs past the timeout, or crashes its worker, is failed
+and only that worker is replaced; the other files keep running. A
+checkpoint file records every finished file, so an interrupted run started
+again with the same arguments carries on where it stopped.
+
+Usage:
+    python run.py analyze reports/ -o results.jsonl
+    python -m app.cli reports/ -o results.csv --backend local --workers 8
+"""
+
+import argparse
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from multiprocessing.connection import wait
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from config.settings import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CSV_FIELDS = [
+    'path', 'status', 'error', 'overall_sentiment', 'positive_percentage', 'negative_percentage',
+    'neutral_percentage', 'confidence_score', 'magnitude', 'backend', 'word_count',
+    'character_count', 'page_count', 'elapsed'
+]
+
+# Checkpoint lines are "<status>\t<relative path>"
+OK = 'ok'
+FAILED = 'failed'
+
+
+def iter_pdf_files(root: str) -> Iterator[str]:
+    """
+    Yield the paths of PDF files under ``root`` in a stable order.
+
+    Hidden files and directories are skipped. A single file is yielded
+    as-is.
+    """
+    if os.path.isfile(root):
+        yield root
+        return
+
+    for directory, subdirectories, filenames in os.walk(root):
+        subdirectories[:] = sorted(name for name in subdirectories if not name.startswith('.'))
+        for filename in sorted(filenames):
+            if filename.lower().endswith('.pdf') and not filename.startswith('.'):
+                yield os.path.join(directory, filename)
+
+
+def load_checkpoint(path: str, retry_failed: bool = False) -> Set[str]:
+    """
+    Read the files finished by earlier runs.
+
+    Args:
+        path (str): Checkpoint file; a missing file means nothing is finished
+        retry_failed (bool): Leave out files whose analysis failed, so they
+            are attempted again
+
+    Returns:
+        Set[str]: Relative paths to skip
+    """
+    finished = set()
+    if not path or not os.path.exists(path):
+        return finished
+
+    with open(path, encoding='utf-8') as checkpoint:
+        for line in checkpoint:
+            status, _, relative_path = line.rstrip('\n').partition('\t')
+            if not relative_path:
+                continue
+            if status == OK or not retry_failed:
+                finished.add(relative_path)
+            else:
+                finished.discard(relative_path)
+    return finished
+
+
+def _init_worker() -> None:
+    # The parent handles Ctrl-C; workers keep going until they are shut down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    # Files are already spread over processes; a nested extraction pool per
+    # worker would only oversubscribe the CPUs
+    Config.PDF_PARALLEL_WORKERS = 1
+
+
+def analyze_file(path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Analyze one PDF inside a pool worker.
+
+    Args:
+        path (str): PDF file
+        options (Dict[str, Any]): api_key, backend and insights
+
+    Returns:
+        Dict[str, Any]: The /analyze result for the file, or a dict with an
+        'error' key, plus 'elapsed' seconds
+    """
+    from app.engine import AnalysisPipeline
+
+    started = time.perf_counter()
+    try:
+        pipeline = AnalysisPipeline(options.get('api_key'), options.get('backend'),
+                                    options.get('insights', 'none'))
+        with open(path, 'rb') as pdf_file:
+            result = pipeline.run(pdf_file)
+    except Exception as e:
+        result = {'error': f'An error occurred: {str(e)}'}
+
+    result['elapsed'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def _worker_main(connection) -> None:
+    # Runs in the worker: (path, options) in, result out, until told to stop
+    _init_worker()
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        connection.send(analyze_file(*task))
+
+
+class _Worker:
+    """
+    A worker process analyzing one file at a time.
+
+    Since each worker holds at most one file, a file that hangs or crashes
+    its process is known exactly, and the worker can be stopped and replaced
+    without disturbing the files running in the others.
+    """
+
+    def __init__(self):
+        self.connection, child = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=_worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+        # (relative path, deadline or None) of the file being analyzed
+        self.task: Optional[Tuple[str, Optional[float]]] = None
+
+    def start(self, relative_path: str, path: str, options: Dict[str, Any], timeout: float) -> None:
+        self.connection.send((path, options))
+        self.task = (relative_path, time.monotonic() + timeout if timeout > 0 else None)
+
+    def result(self) -> Dict[str, Any]:
+        """
+        The result of the current file, once the connection is readable.
+
+        Raises:
+            EOFError, OSError: If the worker died before answering
+        """
+        result = self.connection.recv()
+        self.task = None
+        return result
+
+    def stop(self) -> None:
+        if self.task is None and self.process.is_alive():
+            try:
+                self.connection.send(None)
+            except OSError:
+                pass
+            self.process.join(1)
+        if self.process.is_alive():
+            # A running file cannot be interrupted any other way
+            self.process.terminate()
+            self.process.join()
+        self.connection.close()
+
+
+class JsonlWriter:
+    """Writes one JSON object per line."""
+
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, record: Dict[str, Any]) -> None:
+        self.stream.write(json.dumps(record) + '\n')
+        self.stream.flush()
+
+
+class CsvWriter:
+    """Writes the flat summary columns of each result."""
+
+    def __init__(self, stream, write_header: bool = True):
+        self.stream = stream
+        self.writer = csv.DictWriter(stream, fieldnames=CSV_FIELDS, extrasaction='ignore')
+        if write_header:
+            self.writer.writeheader()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        row = dict(record.get('sentiment_analysis', {}))
+        row.update(record)
+        self.writer.writerow(row)
+        self.stream.flush()
+
+
+def _record(relative_path: str, result: Dict[str, Any]) -> Dict[str, Any]:
+    record = {'path': relative_path, 'status': FAILED if 'error' in result else OK}
+    record.update(result)
+    return record
+
+
+def run_bulk_analysis(root: str, writer, options: Dict[str, Any], workers: int = None,
+                      checkpoint_path: str = None, retry_failed: bool = False) -> Dict[str, int]:
+    """
+    Analyze every PDF under ``root`` and write each result as it finishes.
+
+    At most ``workers`` files are in flight at once, each in its own worker
+    process, so memory stays flat for any number of files and each file's
+    timeout (options['timeout']) runs from when it was handed to a worker.
+    The timeout is enforced here, in the parent: a file that overruns has
+    its worker terminated and replaced, as does a file whose worker crashes;
+    the other files are not affected. Each result is written before its file
+    is added to the checkpoint; a crash between the two can only repeat a
+    file, never lose one.
+
+    Args:
+        root (str): Directory (or single PDF) to analyze
+        writer: JsonlWriter or CsvWriter for the results
+        options (Dict[str, Any]): Passed to analyze_file, plus 'timeout'
+        workers (int): Worker processes, defaults to Config.CLI_WORKERS
+        checkpoint_path (str): File recording finished files, or None
+        retry_failed (bool): Analyze files that failed in earlier runs again
+
+    Returns:
+        Dict[str, int]: Counts of 'succeeded', 'failed' and 'skipped' files
+    """
+    workers = workers or Config.CLI_WORKERS
+    timeout = options.get('timeout') or 0
+    finished = load_checkpoint(checkpoint_path, retry_failed)
+    counts = {'succeeded': 0, 'failed': 0, 'skipped': 0}
+    base = root if os.path.isdir(root) else os.path.dirname(os.path.abspath(root))
+
+    checkpoint = open(checkpoint_path, 'a', encoding='utf-8') if checkpoint_path else None
+    pool: List[_Worker] = []
+
+    def complete(relative_path, result):
+        record = _record(relative_path, result)
+        writer.write(record)
+        counts['succeeded' if record['status'] == OK else 'failed'] += 1
+        if checkpoint is not None:
+            checkpoint.write(f"{record['status']}\t{relative_path}\n")
+            checkpoint.flush()
+
+    def replace(worker):
+        worker.stop()
+        pool.remove(worker)
+
+    try:
+        paths = iter_pdf_files(root)
+        exhausted = False
+        while True:
+            # Hand a file to every idle worker, starting workers as needed
+            idle = [worker for worker in pool if worker.task is None]
+            while not exhausted and (idle or len(pool) < workers):
+                path = next(paths, None)
+                if path is None:
+                    exhausted = True
+                    break
+                relative_path = os.path.relpath(path, base).replace(os.sep, '/')
+                if relative_path in finished:
+                    counts['skipped'] += 1
+                    continue
+                if idle:
+                    worker = idle.pop()
+                else:
+                    worker = _Worker()
+                    pool.append(worker)
+                worker.start(relative_path, path, options, timeout)
+
+            busy = [worker for worker in pool if worker.task is not None]
+            if not busy:
+                break
+
+            deadlines = [worker.task[1] for worker in busy if worker.task[1] is not None]
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            ready = wait([worker.connection for worker in busy], timeout=wait_for)
+
+            for worker in busy:
+                relative_path, deadline = worker.task
+                if worker.connection in ready:
+                    try:
+                        complete(relative_path, worker.result())
+                    except (EOFError, OSError):
+                        complete(relative_path, {'error': 'Worker process crashed'})
+                        replace(worker)
+                elif deadline is not None and deadline <= time.monotonic():
+                    complete(relative_path, {'error': f'Timed out after {timeout:g} seconds', 'elapsed': timeout})
+                    replace(worker)
+    finally:
+        for worker in pool:
+            worker.stop()
+        if checkpoint is not None:
+            checkpoint.close()
+
+    return counts
+
+
+def parse_arguments(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(prog='run.py analyze',
+                                     description='Analyze the sentiment of every PDF under a directory.')
+    parser.add_argument('root', help='Directory to search recursively (or a single PDF)')
+    parser.add_argument('-o', '--output', default='-',
+                        help='Results file; "-" writes to standard output (default: -)')
+    parser.add_argument('--format', choices=['jsonl', 'csv'],
+                        help='Output format (default: from the output extension, else jsonl)')
+    parser.add_argument('--backend', help='Sentiment backend (default: Config.SENTIMENT_BACKEND)')
+    parser.add_argument('--insights', default='none', choices=['none', 'words', 'detailed'],
+                        help='Extra insights in each result (default: none)')
+    parser.add_argument('--api-key', default=os.environ.get('GOOGLE_API_KEY'),
+                        help='Google Cloud API key (default: $GOOGLE_API_KEY)')
+    parser.add_argument('--workers', type=int, default=Config.CLI_WORKERS,
+                        help=f'Worker processes (default: {Config.CLI_WORKERS})')
+    parser.add_argument('--timeout', type=float, default=Config.CLI_FILE_TIMEOUT,
+                        help=f'Seconds allowed per file, 0 for none (default: {Config.CLI_FILE_TIMEOUT:g})')
+    parser.add_argument('--checkpoint',
+                        help='Checkpoint file (default: <output>.checkpoint when writing to a file)')
+    parser.add_argument('--retry-failed', action='store_true',
+                        help='When resuming, analyze files that failed before again')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Command line entry point; returns the process exit status."""
+    args = parse_arguments(argv)
+
+    if not os.path.exists(args.root):
+        print(f"No such file or directory: {args.root}", file=sys.stderr)
+        return 2
+
+    from app.utils.backends import get_backend
+
+    try:
+        needs_api_key = args.insights == 'detailed' or get_backend(args.backend).requires_api_key
+    except ValueError as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    if needs_api_key and not args.api_key:
+        print("API key is required (--api-key or $GOOGLE_API_KEY)", file=sys.stderr)
+        return 2
+
+    output_format = args.format or ('csv' if args.output.lower().endswith('.csv') else 'jsonl')
+    checkpoint_path = args.checkpoint
+    if checkpoint_path is None and args.output != '-':
+        checkpoint_path = args.output + '.checkpoint'
+
+    # Resuming appends to the results of the interrupted run
+    resuming = bool(checkpoint_path) and os.path.exists(checkpoint_path)
+    if args.output == '-':
+        stream = sys.stdout
+    else:
+        stream = open(args.output, 'a' if resuming else 'w', newline='', encoding='utf-8')
+
+    try:
+        if output_format == 'csv':
+            writer = CsvWriter(stream, write_header=not (resuming and stream.tell() > 0))
+        else:
+            writer = JsonlWriter(stream)
+
+        options = {'api_key': args.api_key, 'backend': args.backend,
+                   'insights': args.insights, 'timeout': args.timeout}
+        started = time.perf_counter()
+        counts = run_bulk_analysis(args.root, writer, options, args.workers,
+                                   checkpoint_path, args.retry_failed)
+    except KeyboardInterrupt:
+        print("Interrupted; run the same command again to resume", file=sys.stderr)
+        return 130
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+    print(f"{counts['succeeded']} succeeded, {counts['failed']} failed, "
+          f"{counts['skipped']} skipped in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 1 if counts['failed'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,15 @@
+"""
+Analysis Engine
+Importable PDF sentiment pipeline used by every entry point of the platform.
+"""
+
+from app.engine.insights import combine_word_insights, generate_sentiment_explanations
+from app.engine.pipeline import INSIGHT_LEVELS, AnalysisError, AnalysisPipeline
+
+__all__ = [
+    'AnalysisError',
+    'AnalysisPipeline',
+    'INSIGHT_LEVELS',
+    'combine_word_insights',
+    'generate_sentiment_explanations'
+]
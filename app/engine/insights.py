@@ -0,0 +1,94 @@
+"""
+Word-Level Insights
+Explains a document sentiment result with the sentiment words and phrases
+found in the text.
+"""
+
+from typing import Any, Dict, List
+
+from app.utils.metrics import timed_stage
+
+
+@timed_stage('explanations')
+def generate_sentiment_explanations(base_result: Dict[str, Any],
+                                    word_insights: Dict[str, List]) -> Dict[str, str]:
+    """Generate explanations for why the sentiment percentages were calculated."""
+    positive_pct = base_result.get('positive_percentage', 0)
+    negative_pct = base_result.get('negative_percentage', 0)
+    overall = base_result.get('overall_sentiment', 'Neutral')
+
+    positive_words_count = len(word_insights['positive_words'])
+    negative_words_count = len(word_insights['negative_words'])
+
+    explanations = {}
+
+    # Positive explanation
+    if positive_words_count > 0:
+        pos_words = [item['word'] for item in word_insights['positive_words'][:5]]
+        explanations['positive_explanation'] = (
+            f"The {positive_pct}% positive sentiment is based on {positive_words_count} positive indicators "
+            f"found in the text, including words like: {', '.join(pos_words)}. "
+            f"These words contribute to the overall positive tone, though they may be overshadowed by negative elements."
+        )
+    else:
+        explanations['positive_explanation'] = (
+            f"The {positive_pct}% positive sentiment comes from neutral language and context, "
+            f"with no specific positive words detected."
+        )
+
+    # Negative explanation
+    if negative_words_count > 0:
+        neg_words = [item['word'] for item in word_insights['negative_words'][:5]]
+        explanations['negative_explanation'] = (
+            f"The {negative_pct}% negative sentiment is driven by {negative_words_count} negative indicators "
+            f"including words such as: {', '.join(neg_words)}. "
+            f"These words create a strongly negative impression and dominate the overall tone."
+        )
+    else:
+        explanations['negative_explanation'] = (
+            f"The {negative_pct}% negative sentiment is inferred from the overall context and tone, "
+            f"even without specific negative words being detected."
+        )
+
+    # Overall explanation
+    if overall == 'Negative':
+        explanations['overall_explanation'] = (
+            f"The document is classified as '{overall}' because negative sentiment significantly "
+            f"outweighs positive sentiment ({negative_pct}% vs {positive_pct}%). "
+            f"The negative indicators have a stronger impact on the overall tone."
+        )
+    elif overall == 'Positive':
+        explanations['overall_explanation'] = (
+            f"The document is classified as '{overall}' because positive sentiment dominates "
+            f"the text ({positive_pct}% vs {negative_pct}%). "
+            f"The positive indicators create an overall favorable impression."
+        )
+    else:
+        explanations['overall_explanation'] = (
+            f"The document is classified as '{overall}' because positive and negative sentiments "
+            f"are relatively balanced ({positive_pct}% positive vs {negative_pct}% negative)."
+        )
+
+    return explanations
+
+
+def combine_word_insights(base_result: Dict[str, Any], word_insights: Dict[str, List]) -> Dict[str, Any]:
+    """
+    Add the words, phrases and explanations of a word-level scan to a result.
+
+    Args:
+        base_result (Dict[str, Any]): Document sentiment from a backend
+        word_insights (Dict[str, List]): Output of analyze_word_level_sentiment
+
+    Returns:
+        Dict[str, Any]: A copy of base_result with the insights added
+    """
+    enhanced_result = base_result.copy()
+    enhanced_result.update({
+        'positive_words': word_insights['positive_words'],
+        'negative_words': word_insights['negative_words'],
+        'positive_phrases': word_insights['positive_phrases'],
+        'negative_phrases': word_insights['negative_phrases'],
+        'sentiment_explanation': generate_sentiment_explanations(base_result, word_insights)
+    })
+    return enhanced_result
@@ -0,0 +1,274 @@
+"""
+Analysis Pipeline
+The one path from a PDF to a sentiment result, shared by the web app, the
+batch endpoint, background jobs and command-line tools. Each stage is a
+method, so callers can run the whole pipeline or only the stages they need.
+
+``run_async`` is the same pipeline for the async serving path: parsing runs
+on a thread pool and the API calls are awaited without holding a thread.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, IO, Iterator, Tuple
+
+from werkzeug.utils import secure_filename
+
+from app.engine.insights import combine_word_insights
+from app.utils.backends import analyze_sentiment, analyze_sentiment_async
+from app.utils.fanout import get_parse_executor, run_parallel, run_parallel_async
+from app.utils.metrics import timed_stage
+from app.utils.pdf_processor import extract_pdf_document, iter_pdf_pages, join_pages
+from app.utils.sentiment_analyzer import (
+    analyze_pages_streaming, analyze_sentiment_with_detailed_insights, analyze_word_level_sentiment
+)
+from app.utils.text_normalizer import count_alnum
+from config.settings import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 'none': document sentiment only
+# 'words': plus the sentiment words and phrases found in the text, with explanations
+# 'detailed': plus entity sentiment and a score breakdown (Google API only)
+INSIGHT_LEVELS = ('none', 'words', 'detailed')
+
+PREVIEW_LENGTH = 300
+
+
+class AnalysisError(ValueError):
+    """A document could not be analyzed; the message is safe to show to users."""
+
+
+class AnalysisPipeline:
+    """
+    Extract, normalise, score and explain one PDF document.
+
+    Args:
+        api_key (str): API key for backends that need one
+        backend (str): Sentiment backend name, defaults to Config.SENTIMENT_BACKEND
+        insights (str): One of INSIGHT_LEVELS
+        collapse_whitespace (bool): Join pages with all whitespace runs
+            collapsed, rather than with newlines
+    """
+
+    def __init__(self, api_key: str = None, backend: str = None, insights: str = 'none',
+                 collapse_whitespace: bool = False):
+        if insights not in INSIGHT_LEVELS:
+            raise ValueError(f"Unknown insight level: {insights}")
+        self.api_key = api_key
+        self.backend = backend
+        self.insights = insights
+        self.collapse_whitespace = collapse_whitespace
+
+    @timed_stage('extract')
+    def extract(self, source) -> Dict[str, Any]:
+        """
+        Stage 1: read the pages of a PDF.
+
+        Returns:
+            Dict[str, Any]: 'pages' and 'page_count'
+
+        Raises:
+            AnalysisError: If the file cannot be read as a PDF
+        """
+        try:
+            return extract_pdf_document(source)
+        except Exception as e:
+            logger.error(f"Error extracting text from PDF: {str(e)}")
+            raise AnalysisError('Could not extract text from PDF')
+
+    @timed_stage('normalise')
+    def normalise(self, document: Dict[str, Any]) -> str:
+        """
+        Stage 2: assemble the page texts into the document to score.
+
+        Raises:
+            AnalysisError: If there is no text, too little to analyze, or
+                too few letters and digits (e.g. only symbols or OCR noise)
+        """
+        text = join_pages(document['pages'], normalize_whitespace=self.collapse_whitespace)
+
+        if not text:
+            raise AnalysisError('Could not extract text from PDF')
+
+        if len(text) < Config.MIN_TEXT_LENGTH:
+            raise AnalysisError('PDF contains insufficient text for analysis')
+
+        if count_alnum(text) < Config.MIN_TEXT_LENGTH // 2:
+            raise AnalysisError('PDF does not contain sufficient meaningful text content')
+
+        return text
+
+    def score(self, text: str) -> Dict[str, Any]:
+        """
+        Stage 3: document sentiment from the selected backend.
+
+        Raises:
+            AnalysisError: If the backend returns an error
+        """
+        result = analyze_sentiment(text, self.api_key, self.backend)
+        if 'error' in result:
+            raise AnalysisError(result['error'])
+        return result
+
+    def analyze_text(self, text: str) -> Dict[str, Any]:
+        """
+        Stages 3 and 4: score the text and add the configured insights.
+
+        The word-level scan is local, so it runs while the backend is
+        scoring; the 'detailed' level fetches everything from the Google API
+        in as few calls as possible.
+
+        Raises:
+            AnalysisError: If scoring fails
+        """
+        if self.insights == 'none':
+            return self.score(text)
+
+        if self.insights == 'detailed':
+            result = analyze_sentiment_with_detailed_insights(text, self.api_key)
+            if 'error' in result:
+                raise AnalysisError(result['error'])
+            return result
+
+        results, timings = run_parallel({
+            'sentiment': lambda: analyze_sentiment(text, self.api_key, self.backend),
+            'word_level': lambda: analyze_word_level_sentiment(text)
+        })
+        if 'error' in results['sentiment']:
+            raise AnalysisError(results['sentiment']['error'])
+
+        result = combine_word_insights(results['sentiment'], results['word_level'])
+        result['timings'] = timings
+        return result
+
+    def analyze_stream(self, source: IO[bytes]) -> Dict[str, Any]:
+        """
+        Analyze a very large document page by page with the Google API,
+        without assembling its full text.
+
+        Raises:
+            AnalysisError: If extraction or scoring fails
+        """
+        result = analyze_pages_streaming(iter_pdf_pages(source, use_cache=False), self.api_key)
+        if 'error' in result:
+            raise AnalysisError(result['error'])
+        return result
+
+    def _build_result(self, document: Dict[str, Any], text: str,
+                      sentiment: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'success': True,
+            'extracted_text': text[:PREVIEW_LENGTH] + '...' if len(text) > PREVIEW_LENGTH else text,
+            'word_count': len(text.split()),
+            'character_count': len(text),
+            'page_count': document['page_count'],
+            'sentiment_analysis': sentiment
+        }
+
+    def _extract_text(self, source):
+        document = self.extract(source)
+        return document, self.normalise(document)
+
+    def run(self, source, filename: str = None, mode: str = None) -> Dict[str, Any]:
+        """
+        Run every stage on one PDF.
+
+        Args:
+            source: Path, file object or upload holding the PDF
+            filename (str): Name reported back with the result
+            mode (str): 'stream' for page-by-page analysis of huge documents
+
+        Returns:
+            Dict[str, Any]: The /analyze response body, or a dict with an
+            'error' key
+        """
+        try:
+            if mode == 'stream':
+                result = self.analyze_stream(source)
+                result['success'] = True
+            else:
+                document, text = self._extract_text(source)
+                result = self._build_result(document, text, self.analyze_text(text))
+        except AnalysisError as e:
+            return {'error': str(e)}
+
+        if filename is not None:
+            result['filename'] = secure_filename(filename)
+        return result
+
+    def iter_events(self, source) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Run every stage on one PDF, yielding progress events as they happen.
+
+        The events are a subset of those of iter_analysis_events, for
+        backends and insight levels that do not score chunk by chunk:
+        'extract' ({'pages', 'done'}) once the pages are read, then 'result'
+        with the same body as run(), or 'error' ({'error'}).
+        """
+        try:
+            document = self.extract(source)
+            yield 'extract', {'pages': document['page_count'], 'done': True}
+            text = self.normalise(document)
+            result = self._build_result(document, text, self.analyze_text(text))
+        except AnalysisError as e:
+            yield 'error', {'error': str(e)}
+            return
+        yield 'result', result
+
+    async def analyze_text_async(self, text: str) -> Dict[str, Any]:
+        """
+        Coroutine form of analyze_text.
+
+        The 'detailed' level has no non-blocking client and runs the
+        blocking version on the event loop's default executor.
+
+        Raises:
+            AnalysisError: If scoring fails
+        """
+        loop = asyncio.get_running_loop()
+
+        if self.insights == 'detailed':
+            return await loop.run_in_executor(None, self.analyze_text, text)
+
+        if self.insights == 'none':
+            result = await analyze_sentiment_async(text, self.api_key, self.backend)
+            if 'error' in result:
+                raise AnalysisError(result['error'])
+            return result
+
+        results, timings = await run_parallel_async({
+            'sentiment': lambda: analyze_sentiment_async(text, self.api_key, self.backend),
+            'word_level': lambda: loop.run_in_executor(get_parse_executor(), analyze_word_level_sentiment, text)
+        })
+        if 'error' in results['sentiment']:
+            raise AnalysisError(results['sentiment']['error'])
+
+        result = combine_word_insights(results['sentiment'], results['word_level'])
+        result['timings'] = timings
+        return result
+
+    async def run_async(self, source, filename: str = None, mode: str = None) -> Dict[str, Any]:
+        """
+        Coroutine form of run, for event-loop servers.
+
+        Extraction and normalisation run on the parse pool; page-by-page
+        streaming, which interleaves parsing and API calls, runs on the
+        loop's default executor.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            if mode == 'stream':
+                result = await loop.run_in_executor(None, self.analyze_stream, source)
+                result['success'] = True
+            else:
+                document, text = await loop.run_in_executor(get_parse_executor(), self._extract_text, source)
+                result = self._build_result(document, text, await self.analyze_text_async(text))
+        except AnalysisError as e:
+            return {'error': str(e)}
+
+        if filename is not None:
+            result['filename'] = secure_filename(filename)
+        return result
@@ -0,0 +1,13 @@
+"""
+Route Blueprints
+Endpoints shared by every Flask entry point of the platform.
+"""
+
+from app.routes.analysis import analysis_bp
+from app.routes.batch import batch_bp
+from app.routes.jobs import jobs_bp
+from app.routes.metrics import metrics_bp
+from app.routes.profiles import profiles_bp
+from app.routes.progress import progress_bp
+
+__all__ = ['analysis_bp', 'batch_bp', 'jobs_bp', 'metrics_bp', 'profiles_bp', 'progress_bp']
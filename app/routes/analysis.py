@@ -0,0 +1,115 @@
+"""
+Analysis Routes
+The upload page, single-document analysis and cache statistics.
+"""
+
+import logging
+
+from flask import Blueprint, current_app, jsonify, render_template, request, url_for
+
+from app.utils.job_queue import get_job_queue, register_job_handler
+from app.utils.profiling import profiled
+from app.utils.result_cache import get_result_cache
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+analysis_bp = Blueprint('analysis', __name__)
+
+# Background job kind for queued /analyze requests
+ANALYSIS_JOB = 'analyze'
+
+
+def run_analysis_job(payload, data):
+    """Job handler for analyses queued with async=1."""
+    from app.engine import AnalysisPipeline
+
+    pipeline = AnalysisPipeline(payload.get('api_key'), payload.get('backend'), payload.get('insights', 'none'))
+    return pipeline.run(data, payload['filename'], payload.get('mode'))
+
+
+register_job_handler(ANALYSIS_JOB, run_analysis_job)
+
+
+@analysis_bp.route('/')
+def home():
+    """Render the upload page (the enhanced one when word insights are enabled)."""
+    if current_app.config['ANALYSIS_INSIGHTS'] == 'words':
+        return render_template('enhanced.html')
+    return render_template('index.html')
+
+
+@analysis_bp.route('/cache/stats')
+def cache_stats():
+    """Report result cache hit/miss counters for this worker."""
+    cache = get_result_cache()
+    return jsonify(cache.stats() if cache is not None else {'enabled': False})
+
+
+def prepare_analysis():
+    """
+    Validate the current /analyze request, and queue it if it asked for async=1.
+    
+    Shared by the Flask view and the async server (app.asgi), so both give
+    the same answers to the same form.
+    
+    Returns:
+        Tuple: (response, None) when the request is already answered (a
+        validation error or a queued job), otherwise (None, (pipeline, file, mode))
+    """
+    # Imported on first use so the analysis stack stays off the startup path
+    from app.engine import AnalysisPipeline
+    from app.utils.backends import get_backend
+    
+    if 'pdf_file' not in request.files:
+        return jsonify({'error': 'No PDF file uploaded'}), None
+    
+    file = request.files['pdf_file']
+    api_key = request.form.get('api_key')
+    mode = request.form.get('mode')
+    backend = request.form.get('backend') or None
+    insights = current_app.config['ANALYSIS_INSIGHTS']
+    
+    if file.filename == '':
+        return jsonify({'error': 'No file selected'}), None
+    
+    # Page-by-page streaming and detailed insights always use the Google API
+    if not api_key and (mode == 'stream' or insights == 'detailed'
+                        or get_backend(backend).requires_api_key):
+        return jsonify({'error': 'API key is required'}), None
+    
+    if not file.filename.lower().endswith('.pdf'):
+        return jsonify({'error': 'Please upload a PDF file'}), None
+    
+    # Asynchronous mode queues the analysis and returns a job id to poll
+    if request.form.get('async', '').lower() in ('1', 'true', 'yes'):
+        payload = {'filename': file.filename, 'mode': mode, 'backend': backend, 'insights': insights}
+        # The upload is copied to the queue in chunks; the key stays in memory
+        job_id = get_job_queue().submit(ANALYSIS_JOB, payload, file.stream,
+                                        secrets={'api_key': api_key} if api_key else None)
+        return (jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status': 'queued',
+            'status_url': url_for('jobs.job_status', job_id=job_id)
+        }), 202), None
+    
+    return None, (AnalysisPipeline(api_key, backend, insights), file, mode)
+
+
+@analysis_bp.route('/analyze', methods=['POST'])
+@profiled
+def analyze():
+    """Analyze sentiment of uploaded PDF document."""
+    try:
+        response, work = prepare_analysis()
+        if response is not None:
+            return response
+        
+        pipeline, file, mode = work
+        return jsonify(pipeline.run(file, file.filename, mode))
+    
+    except Exception as e:
+        logger.error(f"Analysis error: {str(e)}")
+        return jsonify({'error': f'An error occurred: {str(e)}'})
@@ -0,0 +1,76 @@
+"""
+Batch Analysis Routes
+Accepts many PDFs (or zip archives of PDFs) in a single request.
+"""
+
+import json
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+
+batch_bp = Blueprint('batch', __name__)
+
+
+def _wants_ndjson():
+    """Stream results when asked via ?stream=1 or an NDJSON Accept header."""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return request.accept_mimetypes.best == 'application/x-ndjson'
+
+
+@batch_bp.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """Analyze sentiment of every uploaded PDF and return per-file results."""
+    # Imported on first use so the analysis stack stays off the startup path
+    from app.engine import AnalysisPipeline
+    from app.utils.backends import get_backend
+    from app.utils.batch import close_batch_files, collect_batch_files, iter_batch_results, run_batch
+    
+    try:
+        api_key = request.form.get('api_key')
+        backend = request.form.get('backend') or None
+        insights = current_app.config['ANALYSIS_INSIGHTS']
+        
+        # Same rule as /analyze: detailed insights always use the Google API
+        if not api_key and (insights == 'detailed' or get_backend(backend).requires_api_key):
+            return jsonify({'error': 'API key is required'})
+        
+        uploads = [upload for key in request.files for upload in request.files.getlist(key)]
+        if not uploads:
+            return jsonify({'error': 'No PDF files uploaded'})
+        
+        pipeline = AnalysisPipeline(api_key, backend, insights, collapse_whitespace=True)
+        documents, rejected = collect_batch_files(uploads)
+        
+        if not documents and not rejected:
+            return jsonify({'error': 'No PDF files found in the upload'})
+        
+        if _wants_ndjson():
+            def generate():
+                results = iter_batch_results(documents, pipeline)
+                try:
+                    for result in rejected:
+                        yield json.dumps(result) + '\n'
+                    for result in results:
+                        yield json.dumps(result) + '\n'
+                finally:
+                    # Stops the batch and waits for running files before their streams close
+                    results.close()
+                    close_batch_files(documents)
+            
+            return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+        
+        try:
+            results = run_batch(documents, pipeline)
+        finally:
+            close_batch_files(documents)
+        return jsonify({
+            'success': True,
+            'file_count': len(results) + len(rejected),
+            'succeeded': sum(1 for result in results if result.get('success')),
+            'results': results + rejected
+        })
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)})
+    except Exception as e:
+        return jsonify({'error': f'An error occurred: {str(e)}'})
@@ -0,0 +1,19 @@
+"""
+Background Job Routes
+Reports the status and result of analyses queued with ``async=1``.
+"""
+
+from flask import Blueprint, jsonify
+
+from app.utils.job_queue import get_job_queue
+
+jobs_bp = Blueprint('jobs', __name__)
+
+
+@jobs_bp.route('/jobs/<job_id>')
+def job_status(job_id):
+    """Return a job's status, queue position, and result once finished."""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
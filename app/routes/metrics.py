@@ -0,0 +1,16 @@
+"""
+Metrics Routes
+Exposes pipeline latency histograms and counters for Prometheus to scrape.
+"""
+
+from flask import Blueprint, Response
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+@metrics_bp.route('/metrics')
+def metrics():
+    """Report metrics summed over every worker process, in the Prometheus text format."""
+    from app.utils.metrics import CONTENT_TYPE, render
+    
+    return Response(render(), content_type=CONTENT_TYPE)
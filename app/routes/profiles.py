@@ -0,0 +1,54 @@
+"""
+Profile Routes
+Lists and downloads the request profiles kept by app.utils.profiling. Both
+routes need PROFILE_TOKEN, in the X-Profile header or the ``profile`` query
+parameter, and are not served at all when no token is configured.
+"""
+
+import hmac
+import io
+import pstats
+
+from flask import Blueprint, Response, current_app, jsonify, request, send_file
+
+from app.utils.profiling import PROFILE_QUERY, get_profile_store
+
+profiles_bp = Blueprint('profiles', __name__, url_prefix='/admin/profiles')
+
+# Functions listed by ?format=text
+TEXT_REPORT_LIMIT = 60
+
+
+@profiles_bp.before_request
+def require_token():
+    """Answer 404 when profiling has no token, and 403 without the right one."""
+    token = current_app.config['PROFILE_TOKEN']
+    if not token:
+        return jsonify({'error': 'Not found'}), 404
+    
+    given = request.headers.get('X-Profile') or request.args.get(PROFILE_QUERY) or ''
+    if not hmac.compare_digest(given.encode(), token.encode()):
+        return jsonify({'error': 'Invalid profile token'}), 403
+
+
+@profiles_bp.route('')
+def list_profiles():
+    """List the kept profiles, newest first."""
+    return jsonify({'profiles': get_profile_store(current_app.config).list()})
+
+
+@profiles_bp.route('/<profile_id>')
+def download_profile(profile_id):
+    """Download a profile as a pstats file, or as a text report with ?format=text."""
+    path = get_profile_store(current_app.config).path(profile_id)
+    if path is None:
+        return jsonify({'error': 'Profile not found'}), 404
+    
+    if request.args.get('format') == 'text':
+        report = io.StringIO()
+        stats = pstats.Stats(path, stream=report)
+        stats.sort_stats('cumulative').print_stats(TEXT_REPORT_LIMIT)
+        return Response(report.getvalue(), mimetype='text/plain')
+    
+    return send_file(path, mimetype='application/octet-stream', as_attachment=True,
+                     download_name=f'{profile_id}.prof')
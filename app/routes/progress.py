@@ -0,0 +1,106 @@
+"""
+Analysis Progress Routes
+Streams per-stage progress and partial sentiment as server-sent events.
+"""
+
+import json
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from werkzeug.utils import secure_filename
+
+from config.settings import Config
+
+progress_bp = Blueprint('progress', __name__)
+
+
+def _event(name, data):
+    """Format one server-sent event."""
+    return f"event: {name}\ndata: {json.dumps(data)}\n\n"
+
+
+@progress_bp.route('/analyze/progress', methods=['POST'])
+def analyze_progress():
+    """
+    Analyze an uploaded PDF, reporting progress as a text/event-stream.
+    
+    Invalid requests get the usual JSON error; once the stream has started,
+    failures arrive as an 'error' event and a completed analysis as a
+    'result' event with the same fields as /analyze.
+    
+    The Google backend scores the document chunk by chunk, with a partial
+    result after each chunk; when the API is unavailable the document is
+    scored again by SENTIMENT_FALLBACK_BACKEND, as on /analyze. Other
+    backends and 'detailed' insights run through the AnalysisPipeline and
+    report extraction progress only.
+    """
+    # Imported on first use so the analysis stack stays off the startup path
+    from app.engine import AnalysisPipeline
+    from app.utils.backends import fallback_reason, get_backend
+    from app.utils.pdf_processor import iter_pdf_pages
+    from app.utils.sentiment_analyzer import iter_analysis_events
+    
+    try:
+        if 'pdf_file' not in request.files:
+            return jsonify({'error': 'No PDF file uploaded'})
+        
+        file = request.files['pdf_file']
+        api_key = request.form.get('api_key')
+        backend = request.form.get('backend') or None
+        insights = current_app.config['ANALYSIS_INSIGHTS']
+        
+        if file.filename == '':
+            return jsonify({'error': 'No file selected'})
+        
+        selected = get_backend(backend)
+        
+        # Same rule as /analyze: detailed insights always use the Google API
+        if not api_key and (insights == 'detailed' or selected.requires_api_key):
+            return jsonify({'error': 'API key is required'})
+        
+        if not file.filename.lower().endswith('.pdf'):
+            return jsonify({'error': 'Please upload a PDF file'})
+        
+        filename = secure_filename(file.filename)
+        # The spooled upload stays open until the stream below has finished
+        document = file
+        
+    except ValueError as e:
+        return jsonify({'error': str(e)})
+    except Exception as e:
+        return jsonify({'error': f'An error occurred: {str(e)}'})
+    
+    def events():
+        if selected.name != 'google' or insights == 'detailed':
+            yield from AnalysisPipeline(api_key, backend, insights).iter_events(document)
+            return
+        
+        for name, data in iter_analysis_events(iter_pdf_pages(document), api_key):
+            if name == 'result':
+                data['sentiment_analysis']['backend'] = selected.name
+            elif name == 'error' and data.get('stage') == 'sentiment':
+                reason = fallback_reason(selected, data)
+                if reason is not None:
+                    yield from fallback_events(reason)
+                    return
+            yield name, data
+    
+    def fallback_events(reason):
+        # The upload is spooled, so the fallback reads it again from the start
+        document.seek(0)
+        pipeline = AnalysisPipeline(api_key, Config.SENTIMENT_FALLBACK_BACKEND, insights)
+        for name, data in pipeline.iter_events(document):
+            if name == 'result':
+                data['sentiment_analysis']['fallback_reason'] = reason
+            yield name, data
+    
+    def generate():
+        try:
+            for name, data in events():
+                if name == 'result':
+                    data.update({'success': True, 'filename': filename})
+                yield _event(name, data)
+        except Exception as e:
+            yield _event('error', {'error': f'An error occurred: {str(e)}'})
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
@@ -0,0 +1,144 @@
+"""
+Async HTTP Client
+Non-blocking counterpart of http_client for the async serving path:
+pooled httpx.AsyncClients per event loop, with the same timeouts, retry
+policy and rate limiting as the shared requests session.
+
+httpx scans its whole pool for every request it queues, which costs more
+CPU than the call itself once hundreds of connections are open, so the
+connections are split over several small clients used in turn.
+
+httpx is an optional dependency, only needed when serving through
+app.asgi.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import weakref
+from typing import TYPE_CHECKING, Any, Dict
+
+from app.utils.metrics import API_RESPONSES, api_method
+from app.utils.rate_limiter import call_with_rate_limit_async
+from config.settings import Config
+
+if TYPE_CHECKING:
+    import httpx
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# httpx logs every request URL at INFO, and Google API URLs carry the API key
+logging.getLogger('httpx').setLevel(logging.WARNING)
+
+# Same statuses the requests session retries with exponential backoff
+RETRY_STATUS_CODES = (500, 502, 503, 504)
+
+# Per event loop: (clients, round-robin iterator over them)
+_clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple]' = weakref.WeakKeyDictionary()
+
+
+def _import_httpx():
+    try:
+        import httpx
+    except ImportError:
+        raise RuntimeError('The async serving path needs httpx: pip install httpx')
+    return httpx
+
+
+def create_async_client(max_connections: int = None, verify: Any = True) -> 'httpx.AsyncClient':
+    """
+    Create an AsyncClient with its own keep-alive pool.
+
+    Args:
+        max_connections (int): Open connections allowed at once, defaults
+            to Config.ASYNC_HTTP_POOL_SIZE
+        verify: TLS verification, as for httpx; clients created together
+            share one SSLContext rather than each loading the CA bundle
+
+    Returns:
+        httpx.AsyncClient: Configured client
+
+    Raises:
+        RuntimeError: If httpx is not installed
+    """
+    httpx = _import_httpx()
+    max_connections = max_connections or Config.ASYNC_HTTP_POOL_SIZE
+    # The pool limits belong to the transport; the client ignores its own once one is given
+    transport = httpx.AsyncHTTPTransport(
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        retries=Config.GOOGLE_API_MAX_RETRIES,
+        verify=verify
+    )
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(Config.GOOGLE_API_READ_TIMEOUT, connect=Config.GOOGLE_API_CONNECT_TIMEOUT),
+        transport=transport,
+        headers={'Content-Type': 'application/json'}
+    )
+
+
+def get_async_client() -> 'httpx.AsyncClient':
+    """
+    Return the next client of the running event loop, creating them on first use.
+
+    Together the clients hold up to Config.ASYNC_HTTP_MAX_CONNECTIONS
+    connections, Config.ASYNC_HTTP_POOL_SIZE per client.
+    """
+    loop = asyncio.get_running_loop()
+    pool = _clients.get(loop)
+    if pool is None:
+        pool_size = max(1, min(Config.ASYNC_HTTP_POOL_SIZE, Config.ASYNC_HTTP_MAX_CONNECTIONS))
+        ssl_context = _import_httpx().create_ssl_context()
+        clients = [create_async_client(pool_size, ssl_context)
+                   for _ in range(max(1, Config.ASYNC_HTTP_MAX_CONNECTIONS // pool_size))]
+        pool = _clients[loop] = (clients, itertools.cycle(clients))
+    return next(pool[1])
+
+
+async def close_async_client() -> None:
+    """Close the running event loop's clients and their pooled connections."""
+    pool = _clients.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await asyncio.gather(*(client.aclose() for client in pool[0]))
+
+
+async def async_post_json(url: str, payload: Dict[str, Any], rate_limit_key: str = None) -> Any:
+    """
+    POST a JSON payload without blocking the event loop.
+
+    Connection failures are retried by the transport. 5xx responses are
+    retried up to Config.GOOGLE_API_MAX_RETRIES times with the session's
+    exponential backoff. With ``rate_limit_key`` the call also waits for a
+    rate limit slot, and a 429 is retried after the server's Retry-After.
+
+    Args:
+        url (str): Request URL
+        payload (Dict[str, Any]): JSON-serialisable request body
+        rate_limit_key (str): API key whose rate limit the call counts against
+
+    Returns:
+        httpx.Response: The final response after any retries
+
+    Raises:
+        RateLimitExceeded: If the call would queue too long for a slot
+    """
+    client = get_async_client()
+    data = json.dumps(payload)
+
+    async def send():
+        for attempt in range(Config.GOOGLE_API_MAX_RETRIES + 1):
+            try:
+                response = await client.post(url, content=data)
+            except Exception:
+                API_RESPONSES.inc(method=api_method(url), status='error')
+                raise
+            API_RESPONSES.inc(method=api_method(url), status=response.status_code)
+            if response.status_code not in RETRY_STATUS_CODES or attempt == Config.GOOGLE_API_MAX_RETRIES:
+                return response
+            await asyncio.sleep(Config.GOOGLE_API_BACKOFF_FACTOR * (2 ** attempt))
+
+    if rate_limit_key is None:
+        return await send()
+    return await call_with_rate_limit_async(rate_limit_key, send)
@@ -0,0 +1,144 @@
+"""
+Async Sentiment Analysis
+Coroutine versions of the Google analyzeSentiment calls for the async
+serving path. They share caching, chunking and response processing with
+app.utils.sentiment_analyzer and return exactly the same results, but wait
+on the network without holding a thread. Cache lookups and stores (SQLite)
+and chunking run on the default executor, so they never block the loop.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict
+
+from app.utils.async_http_client import async_post_json
+from app.utils.chunking import SentimentAccumulator, split_into_chunks
+from app.utils.http_client import google_api_url
+from app.utils.metrics import timed_stage
+from app.utils.sentiment_analyzer import (
+    _cache_lookup, _cache_store, _preprocess_chunk_for_api, _preprocess_text_for_api, _process_sentiment_response,
+    _use_full_document
+)
+from config.settings import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def _sentiment_payload(text: str) -> Dict[str, Any]:
+    return {
+        "document": {
+            "type": "PLAIN_TEXT",
+            "content": text
+        },
+        "encodingType": "UTF8"
+    }
+
+
+@timed_stage('sentiment')
+async def analyze_sentiment_with_google_async(text: str, api_key: str) -> Dict[str, Any]:
+    """
+    Coroutine form of analyze_sentiment_with_google.
+
+    Args:
+        text (str): Text content to analyze
+        api_key (str): Google Cloud API key
+
+    Returns:
+        Dict[str, Any]: Sentiment results, or a dict with an 'error' key
+    """
+    try:
+        if _use_full_document(text):
+            return await analyze_full_document_sentiment_async(text, api_key)
+
+        loop = asyncio.get_running_loop()
+        text = _preprocess_text_for_api(text)
+
+        cached = await loop.run_in_executor(None, _cache_lookup, 'sentiment', text)
+        if cached is not None:
+            return cached
+
+        response = await async_post_json(google_api_url('analyzeSentiment', api_key),
+                                         _sentiment_payload(text), rate_limit_key=api_key)
+
+        if response.status_code == 200:
+            result = _process_sentiment_response(response.json(), text)
+            await loop.run_in_executor(None, _cache_store, 'sentiment', text, result)
+            return result
+        else:
+            return {'error': f'Google API Error: {response.status_code}', 'status_code': response.status_code}
+
+    except Exception as e:
+        return {'error': f'API request failed: {str(e)}'}
+
+
+async def analyze_chunk_sentiment_async(text: str, api_key: str) -> Dict[str, Any]:
+    """Coroutine form of analyze_chunk_sentiment (raw API response for one chunk)."""
+    try:
+        loop = asyncio.get_running_loop()
+        text = _preprocess_chunk_for_api(text)
+
+        cached = await loop.run_in_executor(None, _cache_lookup, 'sentiment_raw', text)
+        if cached is not None:
+            return cached
+
+        response = await async_post_json(google_api_url('analyzeSentiment', api_key),
+                                         _sentiment_payload(text), rate_limit_key=api_key)
+
+        if response.status_code == 200:
+            result = response.json()
+            await loop.run_in_executor(None, _cache_store, 'sentiment_raw', text, result)
+            return result
+        else:
+            return {'error': f'Google API Error: {response.status_code}', 'status_code': response.status_code}
+
+    except Exception as e:
+        return {'error': f'API request failed: {str(e)}'}
+
+
+async def analyze_full_document_sentiment_async(text: str, api_key: str, max_chars: int = None,
+                                                max_concurrency: int = None) -> Dict[str, Any]:
+    """
+    Coroutine form of analyze_full_document_sentiment.
+
+    At most ``max_concurrency`` chunk requests of this document are in
+    flight at once; chunks are merged in document order.
+    """
+    max_chars = max_chars or Config.FULL_DOCUMENT_CHUNK_LENGTH
+    max_concurrency = max(1, max_concurrency or Config.CHUNK_MAX_CONCURRENCY)
+
+    loop = asyncio.get_running_loop()
+    cache_key = f'sentiment_full:{max_chars}'
+
+    cached = await loop.run_in_executor(None, _cache_lookup, cache_key, text)
+    if cached is not None:
+        return cached
+
+    chunks = await loop.run_in_executor(None, split_into_chunks, text, max_chars)
+    slots = asyncio.Semaphore(max_concurrency)
+
+    async def score_chunk(chunk):
+        async with slots:
+            return await analyze_chunk_sentiment_async(chunk, api_key)
+
+    responses = await asyncio.gather(*(score_chunk(chunk) for chunk in chunks))
+
+    for response in responses:
+        if 'error' in response:
+            return response
+    return await loop.run_in_executor(None, _merge_chunk_responses, chunks, responses, text, cache_key)
+
+
+def _merge_chunk_responses(chunks, responses, text: str, cache_key: str) -> Dict[str, Any]:
+    """Merge the chunk responses of a document in order and cache the result."""
+    accumulator = SentimentAccumulator(keep_sentences=True)
+    accumulator.add_many(responses, [len(chunk) for chunk in chunks])
+
+    if accumulator.chunks == 0:
+        return {'error': 'No text to analyze'}
+
+    result = _process_sentiment_response(accumulator.to_response(), text)
+    result['chunks_analyzed'] = accumulator.chunks
+    _cache_store(cache_key, text, result)
+    return result
@@ -0,0 +1,188 @@
+"""
+Sentiment Backends
+Pluggable document-level sentiment scorers behind one interface, with an
+optional automatic fallback when the remote API is unavailable.
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+from app.utils.local_sentiment import score_text
+from app.utils.metrics import timed_stage
+from app.utils.sentiment_analyzer import _process_sentiment_response, analyze_sentiment_with_google
+from config.settings import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class SentimentBackend:
+    """
+    Interface for a document sentiment scorer.
+
+    ``analyze`` returns the same fields as ``_process_sentiment_response``
+    (overall_sentiment, percentages, confidence_score, magnitude, ...) or a
+    dict with an 'error' key.
+    """
+
+    name = ''
+    requires_api_key = False
+
+    def analyze(self, text: str, api_key: str = None) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    async def analyze_async(self, text: str, api_key: str = None) -> Dict[str, Any]:
+        """Coroutine form of ``analyze``; by default runs it on the loop's executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.analyze, text, api_key)
+
+
+class GoogleBackend(SentimentBackend):
+    """Google Cloud Natural Language API."""
+
+    name = 'google'
+    requires_api_key = True
+
+    def analyze(self, text: str, api_key: str = None) -> Dict[str, Any]:
+        return analyze_sentiment_with_google(text, api_key)
+
+    async def analyze_async(self, text: str, api_key: str = None) -> Dict[str, Any]:
+        # Imported here so httpx stays an optional dependency
+        from app.utils.async_sentiment import analyze_sentiment_with_google_async
+        return await analyze_sentiment_with_google_async(text, api_key)
+
+
+class LocalBackend(SentimentBackend):
+    """Offline lexicon scorer; scores the whole text with no network access."""
+
+    name = 'local'
+
+    @timed_stage('sentiment')
+    def analyze(self, text: str, api_key: str = None) -> Dict[str, Any]:
+        try:
+            return _process_sentiment_response(score_text(text), text)
+        except Exception as e:
+            return {'error': f'Local analysis failed: {str(e)}'}
+
+
+_backends: Dict[str, SentimentBackend] = {}
+
+
+def register_backend(backend: SentimentBackend) -> None:
+    """Make a backend selectable by its name."""
+    _backends[backend.name] = backend
+
+
+def get_backend(name: str = None) -> SentimentBackend:
+    """
+    Return the backend called ``name``, or the configured default.
+
+    Raises:
+        ValueError: If no backend has that name
+    """
+    name = name or Config.SENTIMENT_BACKEND
+    if name not in _backends:
+        raise ValueError(f"Unknown sentiment backend: {name}")
+    return _backends[name]
+
+
+def _is_unavailable(result: Dict[str, Any]) -> bool:
+    """Whether an error result means the service could not answer (not a bad request)."""
+    status_code = result.get('status_code')
+    return status_code is None or status_code == 429 or status_code >= 500
+
+
+def _select(api_key: str, backend: str):
+    """Return (backend, None) or (None, error result) for a request."""
+    try:
+        selected = get_backend(backend)
+    except ValueError as e:
+        return None, {'error': str(e)}
+
+    if selected.requires_api_key and not api_key:
+        return None, {'error': 'API key is required'}
+    return selected, None
+
+
+def fallback_reason(selected: SentimentBackend, result: Dict[str, Any]) -> Optional[str]:
+    """
+    Why Config.SENTIMENT_FALLBACK_BACKEND should answer for a failed result.
+
+    Returns:
+        Optional[str]: A reason safe to show to users, or None when the
+        failure is not one the fallback covers
+    """
+    fallback = Config.SENTIMENT_FALLBACK_BACKEND
+    if not fallback or fallback == selected.name or not _is_unavailable(result):
+        return None
+
+    # Error messages can embed the request URL, which carries the API key
+    reason = f"{selected.name} backend unavailable"
+    if result.get('status_code'):
+        reason += f" (HTTP {result['status_code']})"
+    logger.warning(f"{reason}, using the '{fallback}' backend")
+    return reason
+
+
+def analyze_sentiment(text: str, api_key: str = None, backend: str = None) -> Dict[str, Any]:
+    """
+    Score a document with the selected backend.
+
+    When the backend fails because its service is unreachable, overloaded
+    or erroring (not on client errors such as a rejected API key), the text
+    is scored by Config.SENTIMENT_FALLBACK_BACKEND instead, if one is set.
+
+    Args:
+        text (str): Text content to analyze
+        api_key (str): API key for backends that need one
+        backend (str): Backend name, defaults to Config.SENTIMENT_BACKEND
+
+    Returns:
+        Dict[str, Any]: Sentiment results with 'backend' naming the scorer
+        used, plus 'fallback_reason' when the fallback answered, or a dict
+        with an 'error' key
+    """
+    selected, error = _select(api_key, backend)
+    if error:
+        return error
+
+    result = selected.analyze(text, api_key)
+    if 'error' not in result:
+        return dict(result, backend=selected.name)
+
+    reason = fallback_reason(selected, result)
+    if reason is None:
+        return result
+
+    fallback = Config.SENTIMENT_FALLBACK_BACKEND
+    fallback_result = get_backend(fallback).analyze(text, api_key)
+    if 'error' in fallback_result:
+        return result
+    return dict(fallback_result, backend=fallback, fallback_reason=reason)
+
+
+async def analyze_sentiment_async(text: str, api_key: str = None, backend: str = None) -> Dict[str, Any]:
+    """Coroutine form of analyze_sentiment, with the same fallback rules."""
+    selected, error = _select(api_key, backend)
+    if error:
+        return error
+
+    result = await selected.analyze_async(text, api_key)
+    if 'error' not in result:
+        return dict(result, backend=selected.name)
+
+    reason = fallback_reason(selected, result)
+    if reason is None:
+        return result
+
+    fallback = Config.SENTIMENT_FALLBACK_BACKEND
+    fallback_result = await get_backend(fallback).analyze_async(text, api_key)
+    if 'error' in fallback_result:
+        return result
+    return dict(fallback_result, backend=fallback, fallback_reason=reason)
+
+
+register_backend(GoogleBackend())
+register_backend(LocalBackend())
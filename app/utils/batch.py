@@ -0,0 +1,186 @@
+"""
+Batch Analysis
+Analyzes many PDF documents per request on a shared worker pool.
+"""
+
+import io
+import logging
+import os
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from typing import IO, Any, Dict, Iterator, List, Tuple, Union
+
+from werkzeug.utils import secure_filename
+
+from app.engine import AnalysisPipeline
+from app.utils.uploads import COPY_CHUNK_SIZE, SpooledUpload
+from config.settings import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_batch_executor = None
+_batch_executor_lock = threading.Lock()
+
+
+def get_batch_executor() -> ThreadPoolExecutor:
+    """
+    Return the process-wide batch worker pool.
+    
+    Workers are threads so every document shares the pooled HTTP session
+    and the result and extraction caches.
+    """
+    global _batch_executor
+    if _batch_executor is None:
+        with _batch_executor_lock:
+            if _batch_executor is None:
+                _batch_executor = ThreadPoolExecutor(max_workers=Config.BATCH_WORKERS,
+                                                     thread_name_prefix='batch')
+    return _batch_executor
+
+
+def _too_many_files() -> ValueError:
+    return ValueError(f'A batch may contain at most {Config.BATCH_MAX_FILES} PDF files')
+
+
+def _spool_member(archive: zipfile.ZipFile, member: zipfile.ZipInfo, limit: int) -> SpooledUpload:
+    """Decompress one archive member into a SpooledUpload, failing past ``limit`` bytes."""
+    spooled = SpooledUpload()
+    try:
+        with archive.open(member) as source:
+            while True:
+                chunk = source.read(COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                if spooled.size + len(chunk) > limit:
+                    raise ValueError('Zip archives may expand to at most '
+                                     f'{Config.MAX_CONTENT_LENGTH // (1024 * 1024)} MB')
+                spooled.write(chunk)
+    except BaseException:
+        spooled.close()
+        raise
+    return spooled
+
+
+def close_batch_files(documents: List[Tuple[str, IO[bytes]]]) -> None:
+    """Release the streams returned by collect_batch_files."""
+    for _, stream in documents:
+        stream.close()
+
+
+def collect_batch_files(uploads) -> Tuple[List[Tuple[str, IO[bytes]]], List[Dict[str, Any]]]:
+    """
+    Collect uploaded PDFs and the PDFs inside zip archives.
+    
+    Uploaded PDFs are kept as their spooled upload streams; archive members
+    are decompressed one at a time into SpooledUploads, so large ones go to
+    UPLOAD_FOLDER rather than memory. The file count is checked before each
+    member is read, and all members together may expand to at most
+    MAX_CONTENT_LENGTH bytes. Pass the documents to close_batch_files()
+    when done.
+    
+    Args:
+        uploads: Iterable of FileStorage objects
+        
+    Returns:
+        Tuple: (filename, stream) pairs to analyze, and error results for
+        rejected files
+        
+    Raises:
+        ValueError: If the batch has too many PDFs or expands too far
+    """
+    documents = []
+    rejected = []
+    expanded = 0
+    
+    try:
+        for upload in uploads:
+            filename = upload.filename or ''
+            lower = filename.lower()
+            
+            if lower.endswith('.pdf'):
+                if len(documents) >= Config.BATCH_MAX_FILES:
+                    raise _too_many_files()
+                documents.append((secure_filename(filename), upload.stream))
+            elif lower.endswith('.zip'):
+                try:
+                    with zipfile.ZipFile(upload.stream) as archive:
+                        for member in archive.infolist():
+                            name = member.filename
+                            if member.is_dir() or not name.lower().endswith('.pdf') \
+                                    or os.path.basename(name).startswith('.') or name.startswith('__MACOSX/'):
+                                continue
+                            if len(documents) >= Config.BATCH_MAX_FILES:
+                                raise _too_many_files()
+                            spooled = _spool_member(archive, member, Config.MAX_CONTENT_LENGTH - expanded)
+                            expanded += spooled.size
+                            # Member names are echoed back like uploaded names, so sanitised alike
+                            documents.append((secure_filename(name), spooled))
+                except zipfile.BadZipFile:
+                    rejected.append({'filename': secure_filename(filename), 'error': 'Invalid zip archive'})
+            elif filename:
+                rejected.append({'filename': secure_filename(filename), 'error': 'Please upload a PDF file'})
+    except BaseException:
+        close_batch_files(documents)
+        raise
+    
+    return documents, rejected
+
+
+def analyze_pdf_bytes(filename: str, data: Union[bytes, IO[bytes]], pipeline: AnalysisPipeline) -> Dict[str, Any]:
+    """
+    Extract and analyze one PDF.
+    
+    Args:
+        filename (str): Name reported back with the result
+        data: PDF file contents, or a seekable stream over them
+        pipeline (AnalysisPipeline): Pipeline shared by the whole batch
+        
+    Returns:
+        Dict[str, Any]: The /analyze response body for this file
+    """
+    try:
+        result = pipeline.run(io.BytesIO(data) if isinstance(data, bytes) else data)
+        result['filename'] = filename
+        return result
+        
+    except Exception as e:
+        logger.error(f"Batch analysis failed for {filename}: {str(e)}")
+        return {'filename': filename, 'error': f'An error occurred: {str(e)}'}
+
+
+def iter_batch_results(documents: List[Tuple[str, Union[bytes, IO[bytes]]]],
+                       pipeline: AnalysisPipeline) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze documents on the batch pool, yielding each result as it finishes.
+    
+    Each result carries the document's position in the batch as 'index'.
+    If the generator is closed early (e.g. the client of a streamed batch
+    disconnected), documents not yet started are cancelled and the call
+    returns once the running ones have finished, so the caller can then
+    close the documents' streams safely.
+    """
+    executor = get_batch_executor()
+    futures = {executor.submit(analyze_pdf_bytes, filename, data, pipeline): index
+               for index, (filename, data) in enumerate(documents)}
+    
+    try:
+        for future in as_completed(futures):
+            result = future.result()
+            result['index'] = futures[future]
+            yield result
+    finally:
+        for future in futures:
+            future.cancel()
+        wait(futures)
+
+
+def run_batch(documents: List[Tuple[str, Union[bytes, IO[bytes]]]], pipeline: AnalysisPipeline) -> List[Dict[str, Any]]:
+    """
+    Analyze documents on the batch pool and return results in input order.
+    """
+    results = list(iter_batch_results(documents, pipeline))
+    results.sort(key=lambda result: result['index'])
+    return results
@@ -0,0 +1,188 @@
+"""
+Text Chunking
+Splits document text into API-sized windows on sentence boundaries and
+aggregates per-chunk sentiment back into a document-level result.
+"""
+
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+import numpy as np
+
+# A sentence ends at ., ! or ? followed by whitespace
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+')
+
+
+def _split_long(sentence: str, max_chars: int) -> List[str]:
+    """Hard-split a sentence longer than ``max_chars``, preferring spaces."""
+    pieces = []
+    while len(sentence) > max_chars:
+        cut = sentence.rfind(' ', 0, max_chars + 1)
+        if cut <= 0:
+            cut = max_chars
+        pieces.append(sentence[:cut].strip())
+        sentence = sentence[cut:].strip()
+    if sentence:
+        pieces.append(sentence)
+    return pieces
+
+
+def iter_sentences(pages: Iterable[str], max_pending: int = None) -> Iterator[str]:
+    """
+    Yield whitespace-normalised sentences from a stream of page texts.
+
+    A sentence that runs over a page break is joined back together; only
+    the unfinished tail of the current page is held between pages. If that
+    tail grows past ``max_pending`` characters (text without punctuation),
+    it is emitted as is so memory stays bounded.
+    """
+    pending = ''
+    for page_text in pages:
+        page_text = ' '.join(page_text.split())
+        if not page_text:
+            continue
+        text = f'{pending} {page_text}' if pending else page_text
+        sentences = _SENTENCE_END.split(text)
+        pending = sentences.pop()
+        yield from sentences
+        if max_pending is not None and len(pending) > max_pending:
+            yield pending
+            pending = ''
+    if pending:
+        yield pending
+
+
+def iter_text_chunks(pages: Iterable[str], max_chars: int) -> Iterator[str]:
+    """
+    Group sentences from a stream of pages into chunks of at most ``max_chars``.
+
+    Sentences are never split unless a single sentence is itself longer than
+    ``max_chars``.
+
+    Args:
+        pages (Iterable[str]): Page texts in document order
+        max_chars (int): Maximum chunk length in characters
+
+    Yields:
+        str: The next chunk of text
+    """
+    current: List[str] = []
+    length = 0
+    for sentence in iter_sentences(pages, max_chars):
+        for piece in _split_long(sentence, max_chars):
+            added = len(piece) + (1 if current else 0)
+            if current and length + added > max_chars:
+                yield ' '.join(current)
+                current, length = [], 0
+                added = len(piece)
+            current.append(piece)
+            length += added
+    if current:
+        yield ' '.join(current)
+
+
+def split_into_chunks(text: str, max_chars: int) -> List[str]:
+    """Split a complete text into sentence-aligned chunks of at most ``max_chars``."""
+    return list(iter_text_chunks([text], max_chars))
+
+
+class SentimentAccumulator:
+    """
+    Incrementally merges per-chunk Natural Language API sentiment responses.
+
+    Each chunk's score is weighted by its length times its magnitude, so
+    long, emotionally strong passages dominate short or neutral ones; when
+    every chunk has zero magnitude the weighting falls back to length alone.
+    Magnitudes add up across chunks, as they do across sentences in the API.
+
+    Only running sums are kept unless ``keep_sentences`` is set, so memory
+    stays constant however many chunks are added.
+    """
+
+    def __init__(self, keep_sentences: bool = False):
+        self.keep_sentences = keep_sentences
+        self.sentences: List[Dict[str, Any]] = []
+        self.chunks = 0
+        self.characters = 0
+        self.magnitude = 0.0
+        self._weighted_score = 0.0
+        self._weight = 0.0
+        self._length_score = 0.0
+
+    def add(self, api_response: Dict[str, Any], chunk_length: int, offset: int = 0) -> None:
+        """
+        Add one chunk's API response.
+
+        Args:
+            api_response (Dict[str, Any]): Raw analyzeSentiment response
+            chunk_length (int): Length of the chunk in characters
+            offset (int): Character offset of the chunk in the document
+        """
+        document_sentiment = api_response.get('documentSentiment', {})
+        score = float(document_sentiment.get('score', 0))
+        magnitude = float(document_sentiment.get('magnitude', 0))
+
+        self.chunks += 1
+        self.characters += chunk_length
+        self.magnitude += magnitude
+        self._weighted_score += score * chunk_length * magnitude
+        self._weight += chunk_length * magnitude
+        self._length_score += score * chunk_length
+
+        if self.keep_sentences:
+            self._add_sentences(api_response, offset)
+
+    def add_many(self, api_responses: Sequence[Dict[str, Any]], chunk_lengths: Sequence[int]) -> None:
+        """
+        Add the responses of consecutive chunks at once.
+
+        The running sums are updated with array operations; chunk offsets
+        follow from the lengths, with chunks separated by one character.
+
+        Args:
+            api_responses (Sequence[Dict[str, Any]]): Raw analyzeSentiment responses
+            chunk_lengths (Sequence[int]): Length of each chunk in characters
+        """
+        if not api_responses:
+            return
+        sentiments = [response.get('documentSentiment', {}) for response in api_responses]
+        scores = np.array([float(sentiment.get('score', 0)) for sentiment in sentiments], dtype=np.float64)
+        magnitudes = np.array([float(sentiment.get('magnitude', 0)) for sentiment in sentiments],
+                              dtype=np.float64)
+        lengths = np.array(chunk_lengths, dtype=np.float64)
+        offsets = self.characters + self.chunks + np.concatenate(([0], np.cumsum(lengths + 1)[:-1]))
+
+        self.chunks += len(api_responses)
+        self.characters += int(lengths.sum())
+        self.magnitude += float(magnitudes.sum())
+        self._weighted_score += float(np.dot(scores * lengths, magnitudes))
+        self._weight += float(np.dot(lengths, magnitudes))
+        self._length_score += float(np.dot(scores, lengths))
+
+        if self.keep_sentences:
+            for response, offset in zip(api_responses, offsets.astype(np.int64).tolist()):
+                self._add_sentences(response, offset)
+
+    def _add_sentences(self, api_response: Dict[str, Any], offset: int) -> None:
+        for sentence in api_response.get('sentences', []):
+            text = dict(sentence.get('text', {}))
+            if 'beginOffset' in text:
+                text['beginOffset'] = int(text['beginOffset']) + offset
+            self.sentences.append({'text': text, 'sentiment': sentence.get('sentiment', {})})
+
+    @property
+    def score(self) -> float:
+        if self._weight > 0:
+            return self._weighted_score / self._weight
+        if self.characters > 0:
+            return self._length_score / self.characters
+        return 0.0
+
+    def to_response(self) -> Dict[str, Any]:
+        """Return the merged result in analyzeSentiment response format."""
+        response = {
+            'documentSentiment': {'score': self.score, 'magnitude': self.magnitude}
+        }
+        if self.keep_sentences:
+            response['sentences'] = self.sentences
+        return response
@@ -0,0 +1,125 @@
+"""
+Fan-out Execution
+Runs independent analysis steps concurrently on a shared thread pool.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.utils.profiling import wrap_task
+from config.settings import Config
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_chunk_executor: Optional[ThreadPoolExecutor] = None
+_parse_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide fan-out pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=Config.ANALYSIS_FANOUT_WORKERS,
+                                               thread_name_prefix='analysis-fanout')
+    return _executor
+
+
+def get_chunk_executor() -> ThreadPoolExecutor:
+    """
+    Return the pool that sends document chunks to the API.
+
+    It is separate from the fan-out pool because chunked analysis is itself
+    started from fan-out tasks; sharing one pool could deadlock it.
+    """
+    global _chunk_executor
+    if _chunk_executor is None:
+        with _executor_lock:
+            if _chunk_executor is None:
+                _chunk_executor = ThreadPoolExecutor(max_workers=Config.CHUNK_DISPATCH_WORKERS,
+                                                     thread_name_prefix='chunk-dispatch')
+    return _chunk_executor
+
+
+def get_parse_executor() -> ThreadPoolExecutor:
+    """
+    Return the pool the async serving path runs CPU-bound work on.
+
+    PDF parsing and the word-level scan run here so they never block the
+    event loop; a small pool keeps them from crowding out the loop thread.
+    """
+    global _parse_executor
+    if _parse_executor is None:
+        with _executor_lock:
+            if _parse_executor is None:
+                _parse_executor = ThreadPoolExecutor(max_workers=Config.ASYNC_PARSE_WORKERS,
+                                                     thread_name_prefix='pdf-parse')
+    return _parse_executor
+
+
+def _timed(func: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def run_parallel(tasks: Dict[str, Callable[[], Any]]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Run independent tasks concurrently and wait for all of them.
+
+    Args:
+        tasks (Dict[str, Callable]): Task name to zero-argument callable
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, float]]: Results by task name, and
+        timings in milliseconds as ``<name>_ms`` plus ``total_ms`` for the
+        wall-clock time of the whole fan-out
+
+    Raises:
+        Exception: The first exception raised by any task
+    """
+    start = time.perf_counter()
+    executor = get_executor()
+    futures = {name: executor.submit(_timed, wrap_task(func)) for name, func in tasks.items()}
+
+    results = {}
+    timings = {}
+    for name, future in futures.items():
+        results[name], elapsed = future.result()
+        timings[f'{name}_ms'] = round(elapsed, 1)
+    timings['total_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return results, timings
+
+
+async def run_parallel_async(tasks: Dict[str, Callable[[], Awaitable[Any]]]) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """
+    Coroutine form of run_parallel: awaits all tasks concurrently.
+
+    Args:
+        tasks (Dict[str, Callable]): Task name to zero-argument coroutine
+            function (or function returning an awaitable)
+
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, float]]: Results and timings in the
+        same shape as run_parallel
+    """
+    start = time.perf_counter()
+
+    async def timed(func):
+        task_start = time.perf_counter()
+        result = await func()
+        return result, (time.perf_counter() - task_start) * 1000
+
+    outcomes = await asyncio.gather(*(timed(func) for func in tasks.values()))
+
+    results = {}
+    timings = {}
+    for name, (result, elapsed) in zip(tasks, outcomes):
+        results[name] = result
+        timings[f'{name}_ms'] = round(elapsed, 1)
+    timings['total_ms'] = round((time.perf_counter() - start) * 1000, 1)
+    return results, timings
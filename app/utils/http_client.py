@@ -0,0 +1,129 @@
+"""
+HTTP Client
+Shared, pooled HTTP session for calls to the Google Cloud Natural Language API.
+"""
+
+import json
+import logging
+import threading
+from typing import TYPE_CHECKING, Dict, Any, Optional
+
+from app.utils.metrics import API_RESPONSES, api_method
+from app.utils.rate_limiter import call_with_rate_limit
+from config.settings import Config
+
+# requests is imported when the first session is created, keeping it off the
+# startup path of processes that never call the API
+if TYPE_CHECKING:
+    import requests
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_session: Optional['requests.Session'] = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_size: int = None, max_retries: int = None,
+                   backoff_factor: float = None) -> 'requests.Session':
+    """
+    Create a session with a keep-alive connection pool and retry policy.
+
+    Args:
+        pool_size (int): Connections kept open per host
+        max_retries (int): Retries for connection errors and 5xx responses
+        backoff_factor (float): Exponential backoff base between retries
+
+    Returns:
+        requests.Session: Configured session
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    pool_size = pool_size or Config.GOOGLE_API_POOL_SIZE
+    max_retries = Config.GOOGLE_API_MAX_RETRIES if max_retries is None else max_retries
+    backoff_factor = Config.GOOGLE_API_BACKOFF_FACTOR if backoff_factor is None else backoff_factor
+
+    # The Natural Language endpoints are read-only, so POSTs are safe to retry
+    retry = Retry(
+        total=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'POST']),
+        raise_on_status=False,
+        # 429s are retried by the rate limiter, which honours Retry-After
+        # for every caller sharing the API key rather than one connection
+        respect_retry_after_header=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=retry)
+
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Content-Type': 'application/json'})
+    return session
+
+
+def get_session() -> 'requests.Session':
+    """Return the process-wide session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+
+def close_session() -> None:
+    """Close the shared session and its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def google_api_url(method: str, api_key: str) -> str:
+    """Build the URL for a Natural Language API method, e.g. ``analyzeSentiment``."""
+    return f"{Config.GOOGLE_NL_BASE_URL}/documents:{method}?key={api_key}"
+
+
+def post_json(url: str, payload: Dict[str, Any], timeout=None,
+              rate_limit_key: str = None) -> 'requests.Response':
+    """
+    POST a JSON payload over the shared session.
+
+    Args:
+        url (str): Request URL
+        payload (Dict[str, Any]): JSON-serialisable request body
+        timeout: ``(connect, read)`` timeout in seconds; defaults to config
+        rate_limit_key (str): API key whose rate limit the call counts
+            against; throttled (429) calls are then retried after the
+            server's Retry-After
+
+    Returns:
+        requests.Response: The final response after any retries
+
+    Raises:
+        RateLimitExceeded: If the call would queue longer than
+            Config.GOOGLE_API_MAX_QUEUE_WAIT for a rate limit slot
+    """
+    if timeout is None:
+        timeout = (Config.GOOGLE_API_CONNECT_TIMEOUT, Config.GOOGLE_API_READ_TIMEOUT)
+    data = json.dumps(payload)
+
+    def send():
+        try:
+            response = get_session().post(url, data=data, timeout=timeout)
+        except Exception:
+            API_RESPONSES.inc(method=api_method(url), status='error')
+            raise
+        API_RESPONSES.inc(method=api_method(url), status=response.status_code)
+        return response
+
+    if rate_limit_key is None:
+        return send()
+    return call_with_rate_limit(rate_limit_key, send)
@@ -0,0 +1,381 @@
+"""
+Background Job Queue
+Runs long analyses outside the request thread. Pending jobs are kept in a
+local SQLite file, so they survive restarts and are shared by every worker
+process of the server without an external broker.
+
+Uploaded input is streamed into a file of its own next to the database
+(readable by the server's user only) rather than held in memory or stored
+in the database. Secrets such as API keys are never written to disk: they
+stay in the memory of the submitting process, which is then the only one
+that runs the job. If it exits first, the job fails and must be resubmitted.
+"""
+
+import io
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from typing import IO, Any, Callable, Dict, List, Optional, Union
+
+from app.utils.process import pid_alive
+from app.utils.uploads import COPY_CHUNK_SIZE
+from config.settings import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# Job kind to handler; a handler takes (payload, data stream) and returns a result dict
+_handlers: Dict[str, Callable[[Dict[str, Any], Optional[IO[bytes]]], Dict[str, Any]]] = {}
+
+LOST_SECRETS_ERROR = 'The server restarted before the job ran; please submit it again'
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+class JobQueue:
+    """
+    Persistent FIFO job queue with a bounded pool of worker threads.
+
+    Jobs move from ``queued`` to ``running`` to ``done`` or ``failed``. A
+    worker claims the oldest queued job inside an immediate transaction, so
+    several processes can serve the same queue file. Each worker only claims
+    kinds that have a registered handler.
+    """
+
+    def __init__(self, path: str, workers: int = 2, poll_interval: float = 1.0,
+                 result_ttl: float = None):
+        self.path = path
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.result_ttl = result_ttl
+        self._local = threading.local()
+        self._wakeup = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+        # Job id to the secrets submitted with it, for jobs of this process
+        self._secrets: Dict[str, Dict[str, Any]] = {}
+        self._secrets_lock = threading.Lock()
+        self.data_dir = os.path.abspath(path) + '-data'
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        os.makedirs(self.data_dir, mode=0o700, exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+            "payload TEXT NOT NULL, data BLOB, result TEXT, error TEXT, worker_pid INTEGER, "
+            "created_at REAL NOT NULL, started_at REAL, finished_at REAL, submitter_pid INTEGER)"
+        )
+        try:
+            # Queue files created before jobs could carry in-memory secrets
+            conn.execute("ALTER TABLE jobs ADD COLUMN submitter_pid INTEGER")
+        except sqlite3.OperationalError:
+            pass
+        conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def start(self) -> None:
+        """Requeue jobs orphaned by dead processes and start the worker threads."""
+        if self._threads:
+            return
+        self.recover()
+        for number in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f'job-worker-{number}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float = None) -> None:
+        """Ask the workers to exit once their current job is finished."""
+        self._stopping = True
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+        self._stopping = False
+
+    def recover(self) -> int:
+        """
+        Put ``running`` jobs whose process has exited back in the queue.
+
+        A job claimed under this process's own pid is also stale, since the
+        workers of this process have not started yet (pids are reused when a
+        container restarts). Unfinished jobs whose secrets died with the
+        process that submitted them are failed instead.
+        """
+        def gone(pid):
+            return pid is None or pid == os.getpid() or not pid_alive(pid)
+
+        conn = self._connect()
+        orphaned = [
+            job_id for job_id, pid in conn.execute(
+                "SELECT id, submitter_pid FROM jobs WHERE status IN (?, ?) AND submitter_pid IS NOT NULL",
+                (QUEUED, RUNNING))
+            if gone(pid)
+        ]
+        for job_id in orphaned:
+            self._finish(job_id, error=LOST_SECRETS_ERROR)
+
+        stale = [
+            (job_id,) for job_id, pid in conn.execute(
+                "SELECT id, worker_pid FROM jobs WHERE status = ?", (RUNNING,))
+            if gone(pid)
+        ]
+        conn.executemany(
+            "UPDATE jobs SET status = 'queued', worker_pid = NULL, started_at = NULL "
+            "WHERE id = ? AND status = 'running'", stale
+        )
+        if orphaned:
+            logger.info(f"Failed {len(orphaned)} job(s) whose submitting process has exited")
+        if stale:
+            logger.info(f"Requeued {len(stale)} interrupted job(s)")
+        return len(stale)
+
+    def _data_path(self, job_id: str) -> str:
+        return os.path.join(self.data_dir, job_id)
+
+    def _store_data(self, job_id: str, data: Union[bytes, IO[bytes]]) -> None:
+        # Created for the server's user only; copied in chunks, never read whole
+        fd = os.open(self._data_path(job_id), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'wb') as handle:
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                handle.write(data)
+            else:
+                shutil.copyfileobj(data, handle, COPY_CHUNK_SIZE)
+
+    def _remove_data(self, job_id: str) -> None:
+        try:
+            os.remove(self._data_path(job_id))
+        except FileNotFoundError:
+            pass
+
+    def submit(self, kind: str, payload: Dict[str, Any], data: Union[bytes, IO[bytes]] = None,
+               secrets: Dict[str, Any] = None) -> str:
+        """
+        Queue a job and return its id.
+
+        Args:
+            kind (str): Registered handler name
+            payload (Dict[str, Any]): JSON-serializable job arguments
+            data: Optional binary input, e.g. the uploaded PDF, as bytes or a
+                stream read from its current position
+            secrets (Dict[str, Any]): Arguments kept only in this process's
+                memory (e.g. an API key) and merged into the payload when the
+                job runs; such a job is run by this process only
+
+        Returns:
+            str: The job id
+        """
+        job_id = uuid.uuid4().hex
+        if data is not None:
+            self._store_data(job_id, data)
+        if secrets:
+            with self._secrets_lock:
+                self._secrets[job_id] = dict(secrets)
+
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, created_at, submitter_pid) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, json.dumps(payload), time.time(), os.getpid() if secrets else None)
+            )
+        except BaseException:
+            self._remove_data(job_id)
+            with self._secrets_lock:
+                self._secrets.pop(job_id, None)
+            raise
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job's status, and its result or error once finished."""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT status, result, error, created_at, started_at, finished_at FROM jobs WHERE id = ?",
+            (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        status, result, error, created_at, started_at, finished_at = row
+        job = {
+            'job_id': job_id,
+            'status': status,
+            'created_at': created_at,
+            'started_at': started_at,
+            'finished_at': finished_at
+        }
+        if status == QUEUED:
+            job['position'] = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND created_at < ?", (QUEUED, created_at)
+            ).fetchone()[0]
+        elif status == DONE:
+            job['result'] = json.loads(result)
+        elif status == FAILED:
+            job['error'] = error
+        return job
+
+    def purge(self) -> None:
+        """Delete finished jobs older than the result TTL."""
+        if self.result_ttl is None:
+            return
+        self._connect().execute(
+            "DELETE FROM jobs WHERE status IN ('done', 'failed') AND finished_at < ?",
+            (time.time() - self.result_ttl,)
+        )
+
+    def _claim(self) -> Optional[tuple]:
+        kinds = list(_handlers)
+        if not kinds:
+            return None
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # Jobs holding secrets can only run in the process that has them
+            row = conn.execute(
+                f"SELECT id, kind, payload, data, submitter_pid FROM jobs WHERE status = ? "
+                f"AND kind IN ({', '.join('?' * len(kinds))}) "
+                f"AND (submitter_pid IS NULL OR submitter_pid = ?) ORDER BY created_at LIMIT 1",
+                [QUEUED] + kinds + [os.getpid()]
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, worker_pid = ?, started_at = ? WHERE id = ?",
+                    (RUNNING, os.getpid(), time.time(), row[0])
+                )
+            conn.execute('COMMIT')
+        except BaseException:
+            # Also on KeyboardInterrupt and the like, or the write lock stays held
+            conn.execute('ROLLBACK')
+            raise
+        return row
+
+    def _finish(self, job_id: str, result: Dict[str, Any] = None, error: str = None) -> None:
+        # Inputs (uploaded data, the payload and any secrets) are dropped
+        # once the job is finished; only the outcome is kept
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, payload = '{}', data = NULL, "
+            "finished_at = ? WHERE id = ?",
+            (FAILED if error else DONE, json.dumps(result) if result is not None else None,
+             error, time.time(), job_id)
+        )
+        self._remove_data(job_id)
+        with self._secrets_lock:
+            self._secrets.pop(job_id, None)
+
+    def _open_data(self, job_id: str, data: Optional[bytes]) -> Optional[IO[bytes]]:
+        try:
+            return open(self._data_path(job_id), 'rb')
+        except FileNotFoundError:
+            # Jobs queued before input moved out of the database
+            return io.BytesIO(data) if data is not None else None
+
+    def _run(self, job_id: str, kind: str, payload: str, data: Optional[bytes],
+             submitter_pid: Optional[int]) -> None:
+        arguments = json.loads(payload)
+        if submitter_pid is not None:
+            with self._secrets_lock:
+                secrets = self._secrets.get(job_id)
+            if secrets is None:
+                self._finish(job_id, error=LOST_SECRETS_ERROR)
+                return
+            arguments.update(secrets)
+
+        stream = self._open_data(job_id, data)
+        try:
+            result = _handlers[kind](arguments, stream)
+        finally:
+            if stream is not None:
+                stream.close()
+        if 'error' in result:
+            self._finish(job_id, error=result['error'])
+        else:
+            self._finish(job_id, result=result)
+
+    def _work(self) -> None:
+        while not self._stopping:
+            try:
+                job = self._claim()
+            except sqlite3.Error as e:
+                logger.error(f"Job queue error: {str(e)}")
+                job = None
+
+            if job is None:
+                # Jobs submitted by other processes are picked up on the next poll
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+                continue
+
+            job_id = job[0]
+            try:
+                self._run(*job)
+            except Exception as e:
+                logger.error(f"Job {job_id} failed: {str(e)}")
+                self._finish(job_id, error=f'An error occurred: {str(e)}')
+
+            try:
+                self.purge()
+            except sqlite3.Error as e:
+                logger.error(f"Job queue error: {str(e)}")
+
+
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue, starting its workers on first use."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                queue = JobQueue(Config.JOB_QUEUE_DB_PATH, workers=Config.JOB_WORKERS,
+                                 poll_interval=Config.JOB_POLL_INTERVAL,
+                                 result_ttl=Config.JOB_RESULT_TTL)
+                queue.start()
+                _queue = queue
+    return _queue
+
+
+def register_job_handler(kind: str,
+                         handler: Callable[[Dict[str, Any], Optional[IO[bytes]]], Dict[str, Any]]) -> None:
+    """
+    Register the function that runs jobs of ``kind``.
+
+    The handler receives the job payload (with any secrets merged in) and a
+    seekable stream over the binary data, or None, and returns a result
+    dict; a result containing ``'error'`` marks the job as failed.
+    """
+    _handlers[kind] = handler
+
+
+def _reset_after_fork() -> None:
+    # Worker threads do not survive fork (e.g. gunicorn --preload), so a
+    # child of a process that was serving the queue starts its own workers.
+    global _queue, _queue_lock
+    was_running = _queue is not None
+    _queue = None
+    _queue_lock = threading.Lock()
+    if was_running:
+        get_job_queue()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
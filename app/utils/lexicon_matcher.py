@@ -0,0 +1,162 @@
+"""
+Lexicon Matcher
+Single-pass matching of sentiment words and phrases against document text.
+"""
+
+import re
+from typing import Dict, Any, List, Mapping, Optional
+
+# Tokens are runs of word characters, matching the ``\b\w+\b`` boundaries
+# the analyzer has always used for words.
+_TOKEN_PATTERN = re.compile(r'\w+')
+
+# Tokens of one term may be separated by whitespace, apostrophes or hyphens
+# ("can't stand", "well-known"), but never by other punctuation
+_TERM_JOINER = re.compile(r"[\s'’\-]+")
+
+
+def term_tokens(term: str) -> List[str]:
+    """
+    Split a lexicon term into the tokens the matcher sees in text.
+
+    Terms are tokenized with the same pattern as the text, so entries such
+    as "can't stand" or "well-known" can match. A term without letters or
+    digits (an emoticon such as ":)") has no tokens and can never match.
+    """
+    return _TOKEN_PATTERN.findall(term.lower())
+
+
+def term_key(term: str) -> str:
+    """Lookup key of a lexicon term: its tokens joined by single spaces."""
+    return ' '.join(term_tokens(term))
+
+
+class InMemoryLexicon:
+    """
+    Dictionary-backed lexicon mapping lowercase terms to sentiment weights.
+
+    Multi-word terms (phrases) are split with term_tokens(); every proper
+    prefix of a phrase is recorded so the matcher can stop extending a
+    candidate as soon as it can no longer lead to a lexicon entry.
+    """
+
+    def __init__(self, terms: Mapping[str, float]):
+        self._weights: Dict[str, float] = {}
+        self._prefixes = set()
+        self.max_tokens = 1
+
+        for term, weight in terms.items():
+            tokens = term_tokens(term)
+            if not tokens:
+                continue
+            key = ' '.join(tokens)
+            self._weights[key] = float(weight)
+            self.max_tokens = max(self.max_tokens, len(tokens))
+            for end in range(1, len(tokens)):
+                self._prefixes.add(' '.join(tokens[:end]))
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def weight(self, term: str) -> Optional[float]:
+        """Return the weight of ``term`` or None if it is not in the lexicon."""
+        return self._weights.get(term)
+
+    def is_prefix(self, term: str) -> bool:
+        """Return True if ``term`` is the leading part of a longer phrase."""
+        return term in self._prefixes
+
+
+class LexiconMatcher:
+    """
+    Find every lexicon word and phrase in a text with one scan.
+
+    The text is tokenized once; each token starts a walk over the lexicon
+    that extends token by token while the joined candidate is still a phrase
+    prefix. Cost is linear in document length and independent of lexicon
+    size, since every step is a hash lookup.
+    """
+
+    def __init__(self, lexicon):
+        self.lexicon = lexicon
+
+    def scan(self, text: str) -> List[Dict[str, Any]]:
+        """
+        Scan text for lexicon terms.
+
+        Args:
+            text (str): Text content to scan
+
+        Returns:
+            List[Dict[str, Any]]: One entry per distinct term found, in order
+            of first occurrence, with ``term`` (as first written in the
+            text), ``weight``, ``count``, ``tokens`` and the ``start``/``end``
+            offsets of the first match
+        """
+        lexicon = self.lexicon
+        max_tokens = lexicon.max_tokens
+        tokens = [(m.group().lower(), m.start(), m.end())
+                  for m in _TOKEN_PATTERN.finditer(text)]
+        hits: Dict[str, Dict[str, Any]] = {}
+
+        for index, (token, start, end) in enumerate(tokens):
+            candidate = token
+            length = 1
+            while True:
+                weight = lexicon.weight(candidate)
+                if weight is not None:
+                    hit = hits.get(candidate)
+                    if hit is None:
+                        hits[candidate] = {
+                            'term': ' '.join(text[start:end].lower().split()),
+                            'weight': weight,
+                            'count': 1,
+                            'tokens': length,
+                            'start': start,
+                            'end': end
+                        }
+                    else:
+                        hit['count'] += 1
+
+                next_index = index + length
+                if (length >= max_tokens or next_index >= len(tokens)
+                        or not lexicon.is_prefix(candidate)):
+                    break
+
+                # Phrases only match across whitespace, apostrophes and
+                # hyphens, never across punctuation such as sentence ends.
+                next_token, next_start, next_end = tokens[next_index]
+                if not _TERM_JOINER.fullmatch(text, end, next_start):
+                    break
+                candidate = candidate + ' ' + next_token
+                end = next_end
+                length += 1
+
+        return list(hits.values())
+
+
+def extract_context(text: str, start: int, end: int, context_length: int = 50) -> str:
+    """
+    Return the text surrounding a match.
+
+    Args:
+        text (str): Full text that was scanned
+        start (int): Start offset of the match
+        end (int): End offset of the match
+        context_length (int): Characters to include on either side
+
+    Returns:
+        str: Stripped context snippet
+    """
+    return text[max(0, start - context_length):min(len(text), end + context_length)].strip()
+
+
+def build_matcher(positive_terms: List[str], negative_terms: List[str]) -> LexiconMatcher:
+    """
+    Build a matcher from plain positive and negative term lists.
+
+    Positive terms get a weight of +1.0 and negative terms -1.0.
+    """
+    terms = {term: 1.0 for term in positive_terms}
+    terms.update({term: -1.0 for term in negative_terms})
+    return LexiconMatcher(InMemoryLexicon(terms))
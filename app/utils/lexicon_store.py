@@ -0,0 +1,314 @@
+"""
+Lexicon Store
+Compiles weighted sentiment lexicon files into a memory-mapped binary index.
+
+Sources are plain-text files in either AFINN format (``term<TAB>weight``) or
+VADER format (``term<TAB>mean<TAB>stddev<TAB>ratings``). They are compiled
+into a single hash-table index file that every worker process maps read-only,
+so the operating system shares one copy of the pages between them. The store
+recompiles and remaps the index whenever a source file changes.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from typing import Dict, Optional, Sequence, Tuple
+
+from app.utils.lexicon_matcher import LexiconMatcher, term_key
+from config.settings import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEXICON_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                                    'lexicons', 'default.tsv')
+
+# Index layout (little-endian):
+#   header  magic, version, entry count, slot count, max phrase tokens,
+#           sha1 of the source signature
+#   slots   uint32 entry number + 1 per hash slot (0 = empty)
+#   entries key offset (uint32), key length (uint16), flags (uint8),
+#           padding, weight (float32)
+#   keys    UTF-8 key bytes
+_MAGIC = b'SLEX'
+_VERSION = 2
+_HEADER = struct.Struct('<4sIIII20s')
+_SLOT = struct.Struct('<I')
+_ENTRY = struct.Struct('<IHBxf')
+
+FLAG_TERM = 1
+FLAG_PREFIX = 2
+
+
+def load_lexicon_file(path: str) -> Dict[str, float]:
+    """
+    Parse an AFINN- or VADER-style lexicon file.
+
+    Args:
+        path (str): Path to a tab-separated lexicon file
+
+    Terms are tokenized like the text they are matched against (see
+    term_tokens()); entries without letters or digits, such as emoticons,
+    can never match and are left out with a warning.
+
+    Returns:
+        Dict[str, float]: Term key (lowercase tokens joined by spaces) to weight
+    """
+    terms = {}
+    unmatchable = []
+    with open(path, encoding='utf-8') as handle:
+        for line_number, line in enumerate(handle, 1):
+            line = line.rstrip('\n')
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            columns = line.split('\t')
+            if len(columns) < 2:
+                logger.warning(f"Skipping malformed lexicon line {line_number} in {path}")
+                continue
+            try:
+                weight = float(columns[1])
+            except ValueError:
+                logger.warning(f"Skipping lexicon line {line_number} in {path}: bad weight")
+                continue
+            if not columns[0].strip():
+                continue
+            term = term_key(columns[0])
+            if term:
+                terms[term] = weight
+            else:
+                unmatchable.append(columns[0].strip())
+    if unmatchable:
+        logger.warning(f"Skipping {len(unmatchable)} lexicon entries in {path} without letters or digits, "
+                       f"which can never match (e.g. {', '.join(unmatchable[:5])})")
+    return terms
+
+
+def source_signature(sources: Sequence[str]) -> bytes:
+    """Digest of the index format and the source paths, sizes and modification times."""
+    parts = [f"version:{_VERSION}"]
+    for path in sources:
+        stat = os.stat(path)
+        parts.append(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}")
+    return hashlib.sha1('\n'.join(parts).encode('utf-8')).digest()
+
+
+def compile_lexicon(sources: Sequence[str], index_path: str) -> None:
+    """
+    Compile lexicon sources into a binary index file.
+
+    Later sources override weights from earlier ones. The index is written to
+    a temporary file and atomically renamed, so readers never observe a
+    partially written index.
+
+    Args:
+        sources (Sequence[str]): Lexicon file paths
+        index_path (str): Destination path for the compiled index
+    """
+    signature = source_signature(sources)
+    terms: Dict[str, float] = {}
+    for path in sources:
+        terms.update(load_lexicon_file(path))
+
+    # Every proper prefix of a phrase gets an entry so the matcher can stop
+    # extending candidates early; a prefix may also be a term in its own right.
+    flags: Dict[str, int] = {term: FLAG_TERM for term in terms}
+    max_tokens = 1
+    for term in terms:
+        tokens = term.split(' ')
+        max_tokens = max(max_tokens, len(tokens))
+        for end in range(1, len(tokens)):
+            prefix = ' '.join(tokens[:end])
+            flags[prefix] = flags.get(prefix, 0) | FLAG_PREFIX
+
+    keys = sorted(flags)
+    slot_count = 1
+    while slot_count < len(keys) * 2:
+        slot_count *= 2
+
+    slots = [0] * slot_count
+    entries = bytearray()
+    blob = bytearray()
+    for number, key in enumerate(keys):
+        encoded = key.encode('utf-8')
+        entries += _ENTRY.pack(len(blob), len(encoded), flags[key], terms.get(key, 0.0))
+        blob += encoded
+        slot = zlib.crc32(encoded) & (slot_count - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (slot_count - 1)
+        slots[slot] = number + 1
+
+    directory = os.path.dirname(os.path.abspath(index_path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as handle:
+            handle.write(_HEADER.pack(_MAGIC, _VERSION, len(keys), slot_count,
+                                      max_tokens, signature))
+            handle.write(struct.pack(f'<{slot_count}I', *slots))
+            handle.write(entries)
+            handle.write(blob)
+        os.replace(temp_path, index_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    logger.info(f"Compiled {len(terms)} lexicon terms from {len(sources)} source(s) into {index_path}")
+
+
+class LexiconIndex:
+    """
+    Read-only view over a compiled, memory-mapped lexicon index.
+
+    Implements the lexicon interface used by ``LexiconMatcher``.
+    """
+
+    def __init__(self, index_path: str):
+        self.path = index_path
+        with open(index_path, 'rb') as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, count, slot_count, max_tokens, signature = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC or version != _VERSION:
+            self._mmap.close()
+            raise ValueError(f"Not a lexicon index: {index_path}")
+
+        self.signature = signature
+        self.max_tokens = max_tokens
+        self._count = count
+        self._mask = slot_count - 1
+        self._slots_offset = _HEADER.size
+        self._entries_offset = self._slots_offset + slot_count * _SLOT.size
+        self._keys_offset = self._entries_offset + count * _ENTRY.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def _find(self, term: str) -> Optional[Tuple[int, float]]:
+        encoded = term.encode('utf-8')
+        data = self._mmap
+        slot = zlib.crc32(encoded) & self._mask
+        while True:
+            number = _SLOT.unpack_from(data, self._slots_offset + slot * _SLOT.size)[0]
+            if not number:
+                return None
+            key_offset, key_length, flags, weight = _ENTRY.unpack_from(
+                data, self._entries_offset + (number - 1) * _ENTRY.size)
+            start = self._keys_offset + key_offset
+            if key_length == len(encoded) and data[start:start + key_length] == encoded:
+                return flags, weight
+            slot = (slot + 1) & self._mask
+
+    def weight(self, term: str) -> Optional[float]:
+        """Return the weight of ``term`` or None if it is not in the lexicon."""
+        found = self._find(term)
+        if found is None or not found[0] & FLAG_TERM:
+            return None
+        return found[1]
+
+    def is_prefix(self, term: str) -> bool:
+        """Return True if ``term`` is the leading part of a longer phrase."""
+        found = self._find(term)
+        return found is not None and bool(found[0] & FLAG_PREFIX)
+
+    def items(self):
+        """Iterate over ``(term, weight)`` pairs in sorted term order."""
+        data = self._mmap
+        for number in range(self._count):
+            key_offset, key_length, flags, weight = _ENTRY.unpack_from(
+                data, self._entries_offset + number * _ENTRY.size)
+            if flags & FLAG_TERM:
+                start = self._keys_offset + key_offset
+                yield data[start:start + key_length].decode('utf-8'), weight
+
+
+class LexiconStore:
+    """
+    Keeps a compiled lexicon index mapped and up to date with its sources.
+
+    The sources are checked at most once every ``reload_interval`` seconds.
+    When they changed, the index is recompiled; when another process already
+    recompiled it, the fresh file is simply remapped.
+    """
+
+    def __init__(self, sources: Sequence[str], index_path: str, reload_interval: float = 5.0):
+        self.sources = list(sources)
+        self.index_path = index_path
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._index: Optional[LexiconIndex] = None
+        self._matcher: Optional[LexiconMatcher] = None
+        self._index_mtime = None
+        self._checked_at = 0.0
+
+    def _refresh(self) -> None:
+        signature = source_signature(self.sources)
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+
+        if self._index is not None and mtime == self._index_mtime \
+                and self._index.signature == signature:
+            return
+
+        index = None
+        if mtime is not None:
+            try:
+                index = LexiconIndex(self.index_path)
+            except (ValueError, struct.error) as e:
+                logger.warning(f"Discarding unreadable lexicon index: {str(e)}")
+        if index is None or index.signature != signature:
+            if index is not None:
+                index.close()
+            compile_lexicon(self.sources, self.index_path)
+            index = LexiconIndex(self.index_path)
+
+        # Old mappings are left for the garbage collector so scans that are
+        # still running against them are not cut short.
+        self._index = index
+        self._matcher = LexiconMatcher(index)
+        self._index_mtime = os.stat(self.index_path).st_mtime_ns
+
+    def matcher(self) -> LexiconMatcher:
+        """Return a matcher over the current index, reloading it if stale."""
+        now = time.monotonic()
+        if self._matcher is None or now - self._checked_at >= self.reload_interval:
+            with self._lock:
+                if self._matcher is None or now - self._checked_at >= self.reload_interval:
+                    self._refresh()
+                    self._checked_at = now
+        return self._matcher
+
+    def index(self) -> LexiconIndex:
+        """Return the current index, reloading it if stale."""
+        self.matcher()
+        return self._index
+
+
+_default_store: Optional[LexiconStore] = None
+_default_store_lock = threading.Lock()
+
+
+def get_lexicon_store() -> LexiconStore:
+    """Return the process-wide store configured from ``Config``."""
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = LexiconStore(
+                    Config.LEXICON_SOURCES or [DEFAULT_LEXICON_PATH],
+                    Config.LEXICON_INDEX_PATH,
+                    Config.LEXICON_RELOAD_INTERVAL
+                )
+    return _default_store
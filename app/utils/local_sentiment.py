@@ -0,0 +1,130 @@
+"""
+Local Sentiment Scorer
+Scores text offline against the sentiment lexicon, with negation and
+intensifier handling, vectorized with NumPy over the document's tokens.
+
+The result has the shape of an analyzeSentiment response (document score in
+[-1, 1], non-negative magnitude, per-sentence sentiment), so it goes through
+the same processing as Google results.
+"""
+
+import re
+from typing import Any, Dict
+
+import numpy as np
+
+from app.utils.lexicon_matcher import term_key
+from app.utils.lexicon_store import get_lexicon_store
+
+# Words, contractions ("don't") and the punctuation that ends a clause
+_TOKEN = re.compile(r"\w+(?:'\w+)?|[.!?;]")
+
+SENTENCE_ENDS = frozenset('.!?')
+CLAUSE_ENDS = SENTENCE_ENDS | {';'}
+
+NEGATORS = frozenset((
+    'not', 'no', 'never', 'none', 'nobody', 'nothing', 'neither', 'nor', 'nowhere',
+    'cannot', 'without', 'hardly', 'barely', 'rarely', 'seldom', 'lack', 'lacks', 'lacked',
+    'dont', 'doesnt', 'didnt', 'isnt', 'wasnt', 'arent', 'werent', 'wont', 'wouldnt',
+    'cant', 'couldnt', 'shouldnt', 'havent', 'hasnt', 'hadnt', 'aint'
+))
+
+# Relative change applied to the sentiment word that follows
+INTENSIFIERS = {
+    'very': 0.293, 'really': 0.293, 'extremely': 0.293, 'absolutely': 0.293,
+    'completely': 0.293, 'totally': 0.293, 'highly': 0.293, 'incredibly': 0.293,
+    'exceptionally': 0.293, 'remarkably': 0.293, 'truly': 0.293, 'deeply': 0.293,
+    'especially': 0.293, 'particularly': 0.293, 'so': 0.293, 'most': 0.293, 'more': 0.293,
+    'slightly': -0.293, 'somewhat': -0.293, 'marginally': -0.293, 'partly': -0.293,
+    'fairly': -0.293, 'rather': -0.293, 'less': -0.293
+}
+
+# Each negator in the window before a word scales it by this (VADER's value)
+NEGATION_SCALAR = -0.74
+NEGATION_WINDOW = 3
+
+# Lexicon weights run from -5 to 5; ALPHA damps scores backed by little evidence
+WEIGHT_SCALE = 5.0
+ALPHA = 2.0
+
+
+def _token_tables(vocabulary: np.ndarray):
+    """Look up weight, negator, intensifier and boundary flags per distinct token."""
+    index = get_lexicon_store().index()
+    size = len(vocabulary)
+    weights = np.zeros(size)
+    negators = np.zeros(size, dtype=bool)
+    boosts = np.zeros(size)
+    clause_ends = np.zeros(size, dtype=bool)
+    sentence_ends = np.zeros(size, dtype=bool)
+
+    for position, token in enumerate(vocabulary.tolist()):
+        if token in CLAUSE_ENDS:
+            clause_ends[position] = True
+            sentence_ends[position] = token in SENTENCE_ENDS
+        elif token in NEGATORS or token.endswith("n't"):
+            negators[position] = True
+        elif token in INTENSIFIERS:
+            boosts[position] = INTENSIFIERS[token]
+        else:
+            # Lexicon keys split "x'y" into tokens, as the matcher does
+            key = term_key(token) if "'" in token else token
+            weights[position] = index.weight(key) or 0.0
+    return weights, negators, boosts, clause_ends, sentence_ends
+
+
+def _score(total, mass):
+    return total / (mass + ALPHA)
+
+
+def score_text(text: str) -> Dict[str, Any]:
+    """
+    Score text locally.
+
+    Each distinct token is looked up once; weights, negation and intensifiers
+    are then applied with array operations over the whole token sequence. A
+    sentiment word is scaled by NEGATION_SCALAR for every negator among the
+    NEGATION_WINDOW tokens before it in the same clause, and by the
+    intensifier directly before it.
+
+    Args:
+        text (str): Text of any length
+
+    Returns:
+        Dict[str, Any]: analyzeSentiment-style response with
+        'documentSentiment' and 'sentences'
+    """
+    tokens = _TOKEN.findall(text.lower().replace('’', "'"))
+    if not tokens:
+        return {'documentSentiment': {'score': 0.0, 'magnitude': 0.0}, 'sentences': []}
+
+    vocabulary, inverse = np.unique(np.array(tokens), return_inverse=True)
+    weights, negators, boosts, clause_ends, sentence_ends = (
+        table[inverse] for table in _token_tables(vocabulary)
+    )
+
+    # Tokens share a clause when no clause end lies between them
+    clause = np.cumsum(clause_ends)
+    negations = np.zeros(len(tokens), dtype=np.int64)
+    for distance in range(1, min(NEGATION_WINDOW, len(tokens) - 1) + 1):
+        negations[distance:] += negators[:-distance] & (clause[distance:] == clause[:-distance])
+
+    scale = np.power(NEGATION_SCALAR, negations)
+    scale[1:] *= 1.0 + boosts[:-1]
+    adjusted = weights * scale
+
+    # A sentence end belongs to the sentence it closes
+    sentence = np.concatenate(([0], np.cumsum(sentence_ends)[:-1]))
+    sentence_totals = np.bincount(sentence, weights=adjusted)
+    sentence_mass = np.bincount(sentence, weights=np.abs(adjusted))
+
+    total = float(adjusted.sum())
+    mass = float(sentence_mass.sum())
+    return {
+        'documentSentiment': {'score': _score(total, mass), 'magnitude': mass / WEIGHT_SCALE},
+        'sentences': [
+            {'sentiment': {'score': _score(sentence_total, sentence_magnitude),
+                           'magnitude': sentence_magnitude / WEIGHT_SCALE}}
+            for sentence_total, sentence_magnitude in zip(sentence_totals.tolist(), sentence_mass.tolist())
+        ]
+    }
@@ -0,0 +1,385 @@
+"""
+Metrics
+Low-overhead in-process counters and histograms, exposed at /metrics in the
+Prometheus text format.
+
+Recording a value is a dictionary update under a per-metric lock. To
+aggregate across gunicorn workers, every process serving the web app writes
+a snapshot of its metrics to its own file in Config.METRICS_DIR every few
+seconds; a scrape sums the files of all workers. Files of workers that have
+exited are folded into one archive file, so counters never go backwards
+when a worker is replaced.
+"""
+
+import atexit
+import bisect
+import fcntl
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.utils.process import pid_alive
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Seconds; spans a cached lookup up to a long chunked document
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+ARCHIVE_FILE = 'archive.json'
+
+
+class Counter:
+    """Monotonic count per label set."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'|'.join(key): value for key, value in self._values.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Histogram:
+    """Bucketed distribution of observed values per label set."""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: [count in each bucket..., count above the last bucket, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                counts = self._values[key] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the duration of the block, in seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'|'.join(key): list(counts) for key, counts in self._values.items()}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Registry:
+    """The metrics of one process."""
+
+    def __init__(self):
+        self.metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Values of every metric, keyed by metric name then label values."""
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def reset(self) -> None:
+        for metric in self.metrics.values():
+            metric.reset()
+
+
+def merge_snapshots(target: Dict[str, Dict[str, Any]], snapshot: Dict[str, Dict[str, Any]]) -> None:
+    """Add the values of ``snapshot`` into ``target``."""
+    for name, values in snapshot.items():
+        merged = target.setdefault(name, {})
+        for key, value in values.items():
+            if isinstance(value, list):
+                current = merged.get(key)
+                merged[key] = [a + b for a, b in zip(current, value)] if current else list(value)
+            else:
+                merged[key] = merged.get(key, 0) + value
+
+
+class SnapshotStore:
+    """
+    Per-process snapshot files in a directory shared by all workers.
+
+    Args:
+        directory (str): Directory for the snapshot files
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._new_file()
+
+    def _new_file(self) -> None:
+        # The token keeps a reused pid from overwriting an exited worker's file
+        self.path = os.path.join(self.directory, f'worker-{os.getpid()}-{uuid.uuid4().hex[:8]}.json')
+
+    def _read(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path) as handle:
+                return json.load(handle)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path: str, snapshot: Dict[str, Any]) -> None:
+        temporary = f'{path}.tmp'
+        with open(temporary, 'w') as handle:
+            json.dump(snapshot, handle)
+        os.replace(temporary, path)
+
+    def write(self, snapshot: Dict[str, Any]) -> None:
+        """Replace this process's snapshot."""
+        self._write(self.path, snapshot)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        with open(os.path.join(self.directory, '.lock'), 'a') as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def collect(self) -> Dict[str, Dict[str, Any]]:
+        """Sum the snapshots of every worker, archiving those of exited ones."""
+        total: Dict[str, Dict[str, Any]] = {}
+        with self._locked():
+            archive_path = os.path.join(self.directory, ARCHIVE_FILE)
+            archive = self._read(archive_path) or {}
+            archived = False
+
+            for name in os.listdir(self.directory):
+                if not (name.startswith('worker-') and name.endswith('.json')):
+                    continue
+                path = os.path.join(self.directory, name)
+                snapshot = self._read(path)
+                if snapshot is None:
+                    continue
+                if pid_alive(int(name.split('-')[1])):
+                    merge_snapshots(total, snapshot)
+                else:
+                    merge_snapshots(archive, snapshot)
+                    archived = True
+                    os.remove(path)
+
+            if archived:
+                self._write(archive_path, archive)
+            merge_snapshots(total, archive)
+        return total
+
+
+_registry = Registry()
+_store: Optional[SnapshotStore] = None
+_flush_interval = 5.0
+_store_lock = threading.Lock()
+
+
+def get_registry() -> Registry:
+    """Return this process's registry."""
+    return _registry
+
+
+def _flush_loop(interval: float) -> None:
+    while True:
+        time.sleep(interval)
+        flush()
+
+
+def flush() -> None:
+    """Write this process's snapshot, if metrics are shared between processes."""
+    store = _store
+    if store is None:
+        return
+    try:
+        store.write(_registry.snapshot())
+    except OSError as e:
+        logger.warning(f"Could not write metrics snapshot: {str(e)}")
+
+
+def init_metrics(directory: str, flush_interval: float = 5.0) -> None:
+    """
+    Share this process's metrics through ``directory`` (called by create_app).
+
+    Processes that never call this, such as command-line tools, keep their
+    metrics to themselves. An empty directory disables sharing.
+    """
+    global _store, _flush_interval
+    if not directory:
+        return
+    with _store_lock:
+        if _store is None:
+            try:
+                _store = SnapshotStore(directory)
+            except OSError as e:
+                logger.warning(f"Metrics directory unavailable, reporting this process only: {str(e)}")
+                return
+            _flush_interval = flush_interval
+            threading.Thread(target=_flush_loop, args=(flush_interval,),
+                             name='metrics-flush', daemon=True).start()
+
+
+def collect() -> Dict[str, Dict[str, Any]]:
+    """Current totals: summed over all workers when shared, else this process's."""
+    if _store is None:
+        return _registry.snapshot()
+    flush()
+    return _store.collect()
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+def render(snapshot: Dict[str, Dict[str, Any]] = None) -> str:
+    """
+    Render metrics in the Prometheus text exposition format.
+
+    Args:
+        snapshot: Values from collect(), collected now when omitted
+
+    Returns:
+        str: The /metrics response body
+    """
+    if snapshot is None:
+        snapshot = collect()
+
+    lines = []
+    for name, metric in sorted(_registry.metrics.items()):
+        lines.append(f'# HELP {name} {metric.documentation}')
+        lines.append(f'# TYPE {name} {metric.kind}')
+        for key, value in sorted(snapshot.get(name, {}).items()):
+            label_values = key.split('|') if metric.labelnames else []
+            if metric.kind == 'counter':
+                lines.append(f'{name}{_format_labels(metric.labelnames, label_values)} {_format_number(value)}')
+                continue
+
+            cumulative = 0
+            for bound, count in zip(metric.buckets, value):
+                cumulative += count
+                labels = _format_labels(metric.labelnames, label_values, f'le="{bound}"')
+                lines.append(f'{name}_bucket{labels} {_format_number(cumulative)}')
+            cumulative += value[-2]
+            labels = _format_labels(metric.labelnames, label_values, 'le="+Inf"')
+            lines.append(f'{name}_bucket{labels} {_format_number(cumulative)}')
+            labels = _format_labels(metric.labelnames, label_values)
+            lines.append(f'{name}_sum{labels} {_format_number(value[-1])}')
+            lines.append(f'{name}_count{labels} {_format_number(cumulative)}')
+    return '\n'.join(lines) + '\n'
+
+
+def _reset_after_fork() -> None:
+    # A forked worker (gunicorn --preload) starts from zero with its own file;
+    # the parent's counts stay in the parent's file
+    global _store, _store_lock
+    _registry.reset()
+    _store_lock = threading.Lock()
+    if _store is not None:
+        directory = _store.directory
+        _store = None
+        init_metrics(directory, _flush_interval)
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+atexit.register(flush)
+
+
+# Metrics recorded by the analysis pipeline
+STAGE_SECONDS = _registry.histogram(
+    'analysis_stage_seconds', 'Time spent in each analysis stage', ('stage',))
+API_RESPONSES = _registry.counter(
+    'google_api_responses_total', 'Google Natural Language API responses by method and HTTP status',
+    ('method', 'status'))
+CACHE_REQUESTS = _registry.counter(
+    'cache_requests_total', 'Result and PDF extraction cache lookups', ('cache', 'result'))
+PAGES_PARSED = _registry.counter(
+    'pdf_pages_parsed_total', 'PDF pages whose text was extracted')
+BYTES_PROCESSED = _registry.counter(
+    'pdf_bytes_processed_total', 'Bytes of PDF uploads opened for analysis')
+
+
+def timed_stage(stage: str):
+    """
+    Decorator recording a function's run time in analysis_stage_seconds.
+
+    Works on plain functions and coroutine functions.
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with STAGE_SECONDS.time(stage=stage):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with STAGE_SECONDS.time(stage=stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def api_method(url: str) -> str:
+    """The API method named in a Google NL URL, e.g. 'analyzeSentiment'."""
+    return url.split('?', 1)[0].rsplit(':', 1)[-1]
@@ -3,96 +3,264 @@ PDF Processing Utilities
 Handles PDF text extraction and preprocessing for sentiment analysis.
 """
 
-import PyPDF2
+import json
 import logging
+import multiprocessing
+import shutil
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from app.utils.metrics import CACHE_REQUESTS, PAGES_PARSED
+from app.utils.profiling import active_session
+from app.utils.result_cache import SQLiteCache
+from app.utils.uploads import open_upload
+from config.settings import Config
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def extract_text_from_pdf(pdf_file):
+_extraction_cache = None
+_extraction_cache_lock = threading.Lock()
+_extraction_pool = None
+_extraction_pool_lock = threading.Lock()
+
+def get_extraction_cache():
+    """
+    Return the process-wide PDF extraction cache, or None when disabled.
+    
+    The cache lives in SQLite so every worker process shares it.
+    """
+    global _extraction_cache
+    if not Config.PDF_CACHE_DB_PATH:
+        return None
+    if _extraction_cache is None:
+        with _extraction_cache_lock:
+            if _extraction_cache is None:
+                _extraction_cache = SQLiteCache(
+                    Config.PDF_CACHE_DB_PATH,
+                    table='pdf_extractions',
+                    max_entries=Config.PDF_CACHE_MAX_ENTRIES,
+                    max_bytes=Config.PDF_CACHE_MAX_BYTES
+                )
+    return _extraction_cache
+
+def get_extraction_pool():
+    """
+    Return the process pool used for parallel page extraction.
+    
+    Workers are spawned rather than forked so they never inherit locks held
+    by the request threads of the parent process.
+    """
+    global _extraction_pool
+    if _extraction_pool is None:
+        with _extraction_pool_lock:
+            if _extraction_pool is None:
+                _extraction_pool = ProcessPoolExecutor(
+                    max_workers=Config.PDF_PARALLEL_WORKERS,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+    return _extraction_pool
+
+def _reset_extraction_pool():
+    """
+    Discard a broken process pool so the next call starts a fresh one.
+    """
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is not None:
+            _extraction_pool.shutdown(wait=False, cancel_futures=True)
+            _extraction_pool = None
+
+def _open_pdf(source):
+    """Open a PDF reader; PyPDF2 is imported on first use to keep startup fast."""
+    import PyPDF2
+    return PyPDF2.PdfReader(source)
+
+def _extract_page_range(path, start, end):
+    """
+    Extract the text of pages ``start`` to ``end - 1`` (runs in a pool worker).
+    """
+    pdf_reader = _open_pdf(path)
+    return [pdf_reader.pages[page_num].extract_text() for page_num in range(start, end)]
+
+def _extract_pages_parallel(source, page_count):
     """
-    Extract text content from uploaded PDF file.
+    Extract page text across the process pool.
+    
+    The document is written once to a temporary file that each worker opens
+    independently; results are reassembled in page order.
     
     Args:
-        pdf_file: FileStorage object containing the PDF file
+        source: Seekable binary stream with the complete PDF
+        page_count (int): Number of pages in the document
         
     Returns:
-        str: Extracted text content or None if extraction fails
-        
-    Raises:
-        Exception: If PDF processing fails
+        list: Page texts in page order
+    """
+    workers = Config.PDF_PARALLEL_WORKERS
+    # A few ranges per worker keeps them busy when pages vary in cost
+    range_size = max(1, -(-page_count // (workers * 4)))
+    ranges = [(start, min(start + range_size, page_count))
+              for start in range(0, page_count, range_size)]
+    
+    with tempfile.NamedTemporaryFile(suffix='.pdf') as handle:
+        source.seek(0)
+        shutil.copyfileobj(source, handle)
+        handle.flush()
+        pool = get_extraction_pool()
+        futures = [pool.submit(_extract_page_range, handle.name, start, end)
+                   for start, end in ranges]
+        pages = []
+        for future in futures:
+            pages.extend(future.result())
+    
+    PAGES_PARSED.inc(page_count)
+    logger.info(f"Extracted {page_count} pages in parallel across {workers} workers")
+    return pages
+
+def _load_cached_document(cache, digest):
+    """
+    Return the cached extraction for a digest, or None on a miss.
     """
+    if cache is None:
+        return None
     try:
-        logger.info(f"Starting PDF text extraction for file: {pdf_file.filename}")
-        
-        pdf_reader = PyPDF2.PdfReader(pdf_file)
-        text = ""
-        
-        # Extract text from all pages
-        for page_num, page in enumerate(pdf_reader.pages):
-            page_text = page.extract_text()
-            text += page_text + "\n"
-            logger.debug(f"Extracted {len(page_text)} characters from page {page_num + 1}")
-        
-        # Clean and process the extracted text
-        text = text.strip()
-        
-        # Remove excessive whitespace
-        text = ' '.join(text.split())
+        cached = cache.get(digest)
+    except sqlite3.Error as e:
+        logger.warning(f"PDF cache read failed: {str(e)}")
+        return None
+    CACHE_REQUESTS.inc(cache='pdf', result='miss' if cached is None else 'hit')
+    if cached is None:
+        return None
+    logger.info(f"PDF extraction cache hit for {digest[:12]}")
+    return json.loads(cached)
+
+def _store_cached_document(cache, document):
+    """
+    Store an extraction under its digest, ignoring cache write failures.
+    """
+    if cache is None:
+        return
+    try:
+        cache.set(document['digest'], json.dumps(document))
+    except sqlite3.Error as e:
+        logger.warning(f"PDF cache write failed: {str(e)}")
+
+def _iter_reader_pages(pdf_reader):
+    """
+    Yield the text of each page of an open PdfReader in page order.
+    """
+    for page_num, page in enumerate(pdf_reader.pages):
+        page_text = page.extract_text()
+        logger.debug(f"Extracted {len(page_text)} characters from page {page_num + 1}")
+        PAGES_PARSED.inc()
+        yield page_text
+
+def iter_pdf_pages(pdf_file, use_cache=True):
+    """
+    Yield the text of each page of an uploaded PDF in page order.
+    
+    Pages are extracted lazily, so a consumer that processes them one at a
+    time never holds the whole document. With ``use_cache`` a cached
+    extraction is replayed, and a fresh one is stored once every page has
+    been consumed (which requires keeping the page texts until then).
+    
+    Args:
+        pdf_file: FileStorage object containing the PDF file
+        use_cache (bool): Read from and write to the extraction cache
         
-        logger.info(f"Successfully extracted {len(text)} characters from {len(pdf_reader.pages)} pages")
+    Yields:
+        str: Text of the next page
+    """
+    with open_upload(pdf_file) as (digest, source):
+        cache = get_extraction_cache() if use_cache else None
         
-        return text if text else None
+        cached = _load_cached_document(cache, digest)
+        if cached is not None:
+            yield from cached['pages']
+            return
         
-    except Exception as e:
-        logger.error(f"Error extracting text from PDF: {str(e)}")
-        return None
+        pages = [] if cache is not None else None
+        for page_text in _iter_reader_pages(_open_pdf(source)):
+            if pages is not None:
+                pages.append(page_text)
+            yield page_text
+    
+    if cache is not None:
+        _store_cached_document(cache, {'digest': digest, 'pages': pages, 'page_count': len(pages)})
 
-def preprocess_text(text, max_length=2000):
+def join_pages(pages, normalize_whitespace=True):
     """
-    Preprocess text for sentiment analysis.
+    Assemble page texts into one document string in a single pass.
+    
+    Each page is normalised on its own and the results are joined once, so
+    the document is never rebuilt by repeated concatenation and peak memory
+    stays close to the size of the final text.
     
     Args:
-        text (str): Raw extracted text
-        max_length (int): Maximum text length for API processing
+        pages: Iterable of page texts
+        normalize_whitespace (bool): Collapse all whitespace runs to single
+            spaces; otherwise pages are joined with newlines and stripped
         
     Returns:
-        str: Preprocessed text ready for sentiment analysis
+        str: Assembled document text
     """
-    if not text:
-        return ""
+    if not normalize_whitespace:
+        return '\n'.join(pages).strip()
     
-    # Remove non-ASCII characters for better API compatibility
-    text = ''.join(char for char in text if ord(char) < 128)
-    
-    # Limit text length for API constraints
-    if len(text) > max_length:
-        text = text[:max_length]
-        logger.info(f"Text truncated to {max_length} characters for API processing")
-    
-    return text.strip()
+    normalized = (' '.join(page_text.split()) for page_text in pages)
+    return ' '.join(page_text for page_text in normalized if page_text)
 
-def validate_pdf_content(text, min_length=10):
+def extract_pdf_document(pdf_file):
     """
-    Validate that extracted PDF content is suitable for analysis.
+    Extract per-page text from an uploaded PDF, reusing earlier extractions.
+    
+    Identical files are recognised by the SHA-256 digest of their bytes and
+    skip parsing entirely. Uploads are parsed in place (see
+    app.utils.uploads), never copied into memory.
     
     Args:
-        text (str): Extracted text content
-        min_length (int): Minimum required text length
+        pdf_file: FileStorage object containing the PDF file
         
     Returns:
-        tuple: (is_valid: bool, error_message: str)
+        dict: ``digest``, ``pages`` (list of page texts) and ``page_count``
+        
+    Raises:
+        Exception: If PDF processing fails
     """
-    if not text:
-        return False, "No text could be extracted from the PDF"
+    with open_upload(pdf_file) as (digest, source):
+        cache = get_extraction_cache()
+        
+        cached = _load_cached_document(cache, digest)
+        if cached is not None:
+            return cached
+        
+        pdf_reader = _open_pdf(source)
+        page_count = len(pdf_reader.pages)
+        pages = None
+        
+        # A profiled request parses in-process, so the profile shows PyPDF2
+        if (Config.PDF_PARALLEL_WORKERS > 1 and page_count >= Config.PDF_PARALLEL_PAGE_THRESHOLD
+                and active_session() is None):
+            try:
+                pages = _extract_pages_parallel(source, page_count)
+            except BrokenProcessPool as e:
+                logger.warning(f"Parallel PDF extraction failed, falling back to serial: {str(e)}")
+                _reset_extraction_pool()
+        
+        if pages is None:
+            pages = list(_iter_reader_pages(pdf_reader))
     
-    if len(text.strip()) < min_length:
-        return False, f"PDF contains insufficient text for analysis (minimum {min_length} characters required)"
+    document = {
+        'digest': digest,
+        'pages': pages,
+        'page_count': len(pages)
+    }
     
-    # Check for meaningful content (not just whitespace/special characters)
-    meaningful_chars = sum(1 for char in text if char.isalnum())
-    if meaningful_chars < min_length // 2:
-        return False, "PDF does not contain sufficient meaningful text content"
+    _store_cached_document(cache, document)
     
-    return True, ""
\ No newline at end of file
+    return document
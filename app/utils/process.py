@@ -0,0 +1,26 @@
+"""
+Process Helpers
+Small helpers about other processes on this machine, shared by the modules
+that keep per-process state in files (the job queue and metrics).
+"""
+
+import os
+
+
+def pid_alive(pid: int) -> bool:
+    """
+    Check whether a process with the given id is running.
+
+    Args:
+        pid (int): Process id
+
+    Returns:
+        bool: True if the process exists (even if owned by another user)
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
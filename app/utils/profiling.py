@@ -0,0 +1,305 @@
+"""
+Request Profiling
+Runs selected /analyze requests under cProfile and keeps the profiles of the
+slow ones in Config.PROFILE_DIR, to find out whether PDF parsing, text
+normalisation or the word-level scan is what makes a document slow.
+
+A request is profiled when it carries PROFILE_TOKEN in the ``X-Profile``
+header or the ``profile`` query parameter, or when it is picked at random at
+PROFILE_SAMPLE_RATE. Requested profiles are always kept; sampled ones only
+when the request took at least PROFILE_MIN_SECONDS. Each profile is a pstats
+file (``python -m pstats``, snakeviz, flameprof) with a JSON description
+next to it; only the newest PROFILE_KEEP are kept.
+
+Work the request fans out to the shared thread pool is profiled too and
+merged into the request's profile. PDF pages are extracted in-process while
+profiling, so PyPDF2 shows up instead of a wait on the process pool.
+
+Only one request per process is profiled at a time: Python 3.12 and later
+allow a single active profiler, so a request that arrives while another is
+being profiled, or whose profiler cannot be enabled, runs unprofiled.
+"""
+
+import cProfile
+import functools
+import hmac
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PROFILE_QUERY = 'profile'
+PROFILE_ID_HEADER = 'X-Profile-Id'
+
+# environ key holding the decision, so the ASGI server and the view agree on it
+_ENVIRON_KEY = 'sentiment.profile_reason'
+
+_PROFILE_ID = re.compile(r'^[0-9]{8}T[0-9]{6}-[0-9a-f]{8}$')
+
+# From 3.12 cProfile uses sys.monitoring: one profiler for the whole process
+_PROCESS_WIDE_PROFILER = sys.version_info >= (3, 12)
+
+_local = threading.local()
+_session_lock = threading.Lock()
+
+
+class ProfileSession:
+    """The profiles of one request: its own thread plus any fan-out tasks."""
+
+    def __init__(self):
+        self.profiler = cProfile.Profile()
+        self.task_profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+
+    def add_task_profile(self, profiler: cProfile.Profile) -> None:
+        with self._lock:
+            self.task_profiles.append(profiler)
+
+    def stats(self) -> pstats.Stats:
+        stats = pstats.Stats(self.profiler)
+        with self._lock:
+            for profiler in self.task_profiles:
+                stats.add(profiler)
+        return stats
+
+
+def active_session() -> Optional[ProfileSession]:
+    """The session profiling the current thread, if any."""
+    return getattr(_local, 'session', None)
+
+
+def _runcall(profiler: cProfile.Profile, func: Callable[[], Any]) -> Tuple[Any, bool]:
+    """
+    Call ``func`` under ``profiler``, or unprofiled if it cannot be enabled.
+
+    Returns:
+        Tuple: (func's result, whether it was profiled)
+    """
+    try:
+        profiler.enable()
+    except ValueError as e:
+        # Another profiler is already active
+        logger.warning(f"Could not start the profiler: {str(e)}")
+        return func(), False
+    try:
+        return func(), True
+    finally:
+        profiler.disable()
+
+
+def wrap_task(func: Callable[[], Any]) -> Callable[[], Any]:
+    """
+    Profile a task handed to another thread as part of the current request.
+
+    Returns ``func`` unchanged when the current thread is not being profiled,
+    or when the request's profiler already sees every thread (Python 3.12+).
+    A task that runs on a thread that is itself being profiled is not
+    profiled again.
+    """
+    session = active_session()
+    if session is None or _PROCESS_WIDE_PROFILER:
+        return func
+
+    @functools.wraps(func)
+    def wrapper():
+        if active_session() is not None:
+            return func()
+        profiler = cProfile.Profile()
+        _local.session = session
+        try:
+            result, was_profiled = _runcall(profiler, func)
+        finally:
+            _local.session = None
+        if was_profiled:
+            session.add_task_profile(profiler)
+        return result
+    return wrapper
+
+
+def _token_matches(value: Optional[str], token: str) -> bool:
+    return bool(token) and bool(value) and hmac.compare_digest(value.encode(), token.encode())
+
+
+def profile_reason(environ: Dict[str, Any], config) -> Optional[str]:
+    """
+    Decide whether a request is profiled.
+
+    The decision is stored in the environ, so asking again for the same
+    request gives the same answer.
+
+    Args:
+        environ (dict): WSGI environ of the request
+        config: Application config with the PROFILE_* settings
+
+    Returns:
+        Optional[str]: 'requested', 'sampled', or None when not profiled
+    """
+    if _ENVIRON_KEY not in environ:
+        token = config.get('PROFILE_TOKEN', '')
+        requested = (environ.get('HTTP_X_PROFILE')
+                     or parse_qs(environ.get('QUERY_STRING', '')).get(PROFILE_QUERY, [None])[0])
+        rate = config.get('PROFILE_SAMPLE_RATE', 0.0)
+        if _token_matches(requested, token):
+            environ[_ENVIRON_KEY] = 'requested'
+        elif rate > 0 and random.random() < rate:
+            environ[_ENVIRON_KEY] = 'sampled'
+        else:
+            environ[_ENVIRON_KEY] = None
+    return environ[_ENVIRON_KEY]
+
+
+class ProfileStore:
+    """
+    Profiles saved as ``<id>.prof`` (pstats) and ``<id>.json`` (description).
+
+    Args:
+        directory (str): Directory for the profiles
+        keep (int): Newest profiles kept; older ones are deleted on save
+    """
+
+    def __init__(self, directory: str, keep: int = 50):
+        self.directory = directory
+        self.keep = keep
+
+    def _path(self, profile_id: str, extension: str) -> str:
+        return os.path.join(self.directory, f'{profile_id}.{extension}')
+
+    def save(self, stats: pstats.Stats, info: Dict[str, Any]) -> str:
+        """Save a profile and return its id."""
+        os.makedirs(self.directory, exist_ok=True)
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        stats.dump_stats(self._path(profile_id, 'prof'))
+        with open(self._path(profile_id, 'json'), 'w') as handle:
+            json.dump(dict(info, id=profile_id), handle)
+        self._prune()
+        return profile_id
+
+    def _prune(self) -> None:
+        for profile in self.list()[self.keep:]:
+            for extension in ('prof', 'json'):
+                try:
+                    os.remove(self._path(profile['id'], extension))
+                except FileNotFoundError:
+                    pass
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Descriptions of the saved profiles, newest first."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+
+        profiles = []
+        for name in names:
+            if not name.endswith('.json') or not _PROFILE_ID.match(name[:-5]):
+                continue
+            try:
+                with open(os.path.join(self.directory, name)) as handle:
+                    profiles.append(json.load(handle))
+            except (OSError, ValueError):
+                continue
+        profiles.sort(key=lambda profile: (profile.get('created', 0), profile['id']), reverse=True)
+        return profiles
+
+    def path(self, profile_id: str) -> Optional[str]:
+        """Path of a profile's pstats file, or None if there is no such profile."""
+        if not _PROFILE_ID.match(profile_id):
+            return None
+        path = self._path(profile_id, 'prof')
+        return path if os.path.exists(path) else None
+
+
+def get_profile_store(config) -> ProfileStore:
+    """Return the store for the configured PROFILE_DIR."""
+    return ProfileStore(config['PROFILE_DIR'], config['PROFILE_KEEP'])
+
+
+def run_profiled(func: Callable[[], Any]) -> Tuple[Any, Optional[ProfileSession], float]:
+    """
+    Call ``func`` with the current thread (and its fan-out tasks) profiled.
+
+    ``func`` runs unprofiled when another request is being profiled or the
+    profiler cannot be started; the session is then None.
+
+    Returns:
+        Tuple: (func's result, the ProfileSession or None, wall-clock seconds)
+    """
+    start = time.perf_counter()
+    if active_session() is not None or not _session_lock.acquire(blocking=False):
+        return func(), None, time.perf_counter() - start
+
+    session = ProfileSession()
+    _local.session = session
+    try:
+        result, was_profiled = _runcall(session.profiler, func)
+    finally:
+        _local.session = None
+        _session_lock.release()
+    return result, session if was_profiled else None, time.perf_counter() - start
+
+
+def save_profile(session: ProfileSession, elapsed: float, reason: str, info: Dict[str, Any],
+                 config) -> Optional[str]:
+    """
+    Keep a request's profile if it qualifies.
+
+    Args:
+        session (ProfileSession): From run_profiled()
+        elapsed (float): Wall-clock seconds of the request
+        reason (str): 'requested' or 'sampled', from profile_reason()
+        info (dict): Description saved with the profile (path, filename...)
+        config: Application config with the PROFILE_* settings
+
+    Returns:
+        Optional[str]: The profile id, or None when it was not kept
+    """
+    if reason == 'sampled' and elapsed < config['PROFILE_MIN_SECONDS']:
+        return None
+
+    info = dict(info, reason=reason, seconds=round(elapsed, 4), created=time.time(), pid=os.getpid())
+    try:
+        profile_id = get_profile_store(config).save(session.stats(), info)
+    except OSError as e:
+        logger.warning(f"Could not save profile: {str(e)}")
+        return None
+    logger.info(f"Saved profile {profile_id} of {info.get('path')} ({elapsed:.2f}s, {reason})")
+    return profile_id
+
+
+def profiled(view):
+    """
+    Decorator for Flask views that may be profiled (see profile_reason()).
+
+    Kept profiles are named in the X-Profile-Id response header.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        from flask import current_app, make_response, request
+
+        reason = profile_reason(request.environ, current_app.config)
+        if reason is None:
+            return view(*args, **kwargs)
+
+        response, session, elapsed = run_profiled(lambda: make_response(view(*args, **kwargs)))
+        if session is None:
+            return response
+        upload = request.files.get('pdf_file')
+        info = {'method': request.method, 'path': request.path,
+                'filename': upload.filename if upload is not None else None}
+        profile_id = save_profile(session, elapsed, reason, info, current_app.config)
+        if profile_id is not None:
+            response.headers[PROFILE_ID_HEADER] = profile_id
+        return response
+    return wrapper
@@ -0,0 +1,282 @@
+"""
+Rate Limiter
+Client-side token bucket for Google Natural Language API calls, shared by
+every thread and (through a small SQLite file) every worker process.
+
+The bucket is kept in its GCRA form: one "theoretical arrival time" per API
+key. A call reserves the next free slot in a single atomic update and then
+sleeps until its slot, so callers are admitted strictly in arrival order
+and nobody polls. A 429 response pushes the key's next slot back by the
+server's Retry-After (or an exponential backoff), with jitter, so every
+caller sharing the key slows down together instead of retrying in a burst.
+"""
+
+import asyncio
+import datetime
+import email.utils
+import hashlib
+import logging
+import math
+import os
+import random
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional
+
+from config.settings import Config
+
+if TYPE_CHECKING:
+    import requests
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS_CODES = (429,)
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+class RateLimitExceeded(Exception):
+    """The wait for a slot would exceed the configured maximum."""
+
+
+def _bucket_key(api_key: str) -> str:
+    # Buckets are stored under a digest so API keys never reach the disk
+    return hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:32]
+
+
+class MemoryBucketStore:
+    """Slot times for buckets used by a single process."""
+
+    def __init__(self):
+        self._times: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def update(self, key: str, change: Callable[[Optional[float]], Optional[float]]) -> Optional[float]:
+        """Atomically replace a bucket's time with change(time); returns the new time."""
+        with self._lock:
+            new_time = change(self._times.get(key))
+            if new_time is not None:
+                self._times[key] = new_time
+            return new_time
+
+
+class SQLiteBucketStore:
+    """Slot times shared by every process that opens the same file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect().execute(
+            "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tat REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')
+            self._local.conn = conn
+        return conn
+
+    def update(self, key: str, change: Callable[[Optional[float]], Optional[float]]) -> Optional[float]:
+        """Atomically replace a bucket's time with change(time); returns the new time."""
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            row = conn.execute("SELECT tat FROM buckets WHERE key = ?", (key,)).fetchone()
+            new_time = change(row[0] if row else None)
+            if new_time is not None:
+                conn.execute("INSERT OR REPLACE INTO buckets (key, tat) VALUES (?, ?)", (key, new_time))
+            conn.execute('COMMIT')
+        except BaseException:
+            # Also on KeyboardInterrupt and the like, or the write lock stays held
+            conn.execute('ROLLBACK')
+            raise
+        return new_time
+
+
+class RateLimiter:
+    """
+    Per-key token bucket admitting ``qps`` calls per second on average and
+    up to ``burst`` at once.
+
+    Args:
+        qps (float): Sustained calls per second per API key
+        burst (int): Calls allowed back to back after an idle period
+        max_wait (float): Longest a call may queue for a slot, in seconds
+        store: MemoryBucketStore or SQLiteBucketStore
+    """
+
+    def __init__(self, qps: float, burst: int = 1, max_wait: float = 30.0, store=None):
+        self.interval = 1.0 / qps
+        self.tolerance = self.interval * (max(burst, 1) - 1)
+        self.max_wait = max_wait
+        self.store = store or MemoryBucketStore()
+
+    def reserve(self, api_key: str) -> float:
+        """
+        Reserve the next slot for ``api_key``.
+
+        Returns:
+            float: Seconds to wait before making the call
+
+        Raises:
+            RateLimitExceeded: If the slot is more than max_wait away; no
+                slot is taken in that case
+        """
+        now = time.time()
+        wait = {}
+
+        def take_slot(tat):
+            tat = max(tat or now, now)
+            wait['seconds'] = max(0.0, tat - self.tolerance - now)
+            if wait['seconds'] > self.max_wait:
+                return None
+            return tat + self.interval
+
+        self.store.update(_bucket_key(api_key), take_slot)
+        if wait['seconds'] > self.max_wait:
+            raise RateLimitExceeded(
+                f"Rate limit queue is full (next slot in {wait['seconds']:.1f}s)"
+            )
+        return wait['seconds']
+
+    def acquire(self, api_key: str) -> None:
+        """Block until the caller may make its call."""
+        delay = self.reserve(api_key)
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, api_key: str, seconds: float) -> None:
+        """Admit no calls for ``api_key`` for the next ``seconds``."""
+        until = time.time() + seconds + self.tolerance
+        self.store.update(_bucket_key(api_key), lambda tat: max(tat or 0.0, until))
+
+
+def retry_delay(response, attempt: int) -> float:
+    """
+    Seconds to wait before retrying a throttled response.
+
+    The server's Retry-After (seconds or an HTTP date) is a lower bound;
+    without one, the delay doubles from Config.GOOGLE_API_RETRY_BASE_DELAY
+    on each attempt. Up to 50% jitter is added so that callers throttled at
+    the same moment do not come back at the same moment.
+    """
+    delay = Config.GOOGLE_API_RETRY_BASE_DELAY * (2 ** attempt)
+
+    retry_after = response.headers.get('Retry-After')
+    if retry_after:
+        try:
+            seconds = float(retry_after)
+        except ValueError:
+            # A malformed date is ignored in favour of the backoff
+            try:
+                parsed = email.utils.parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError, IndexError):
+                parsed = None
+            if parsed is not None:
+                if parsed.tzinfo is None:
+                    # HTTP dates are always GMT, even when the zone is left out
+                    parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+                delay = max(delay, parsed.timestamp() - time.time())
+        else:
+            # "inf" and "nan" parse as floats but are not usable delays
+            if math.isfinite(seconds):
+                delay = max(delay, seconds)
+
+    return delay * (1 + random.random() * 0.5)
+
+
+def call_with_rate_limit(api_key: str, send: Callable[[], 'requests.Response']) -> 'requests.Response':
+    """
+    Make an API call within the key's rate limit, retrying throttled calls.
+
+    With the limiter off (Config.GOOGLE_API_QPS = 0), throttled calls are
+    still retried after the same jittered delay.
+
+    Args:
+        api_key (str): Key whose bucket the call draws from
+        send (Callable): Performs the HTTP call and returns the response
+
+    Returns:
+        requests.Response: The first non-429 response, or the last 429 once
+        Config.GOOGLE_API_MAX_THROTTLE_RETRIES retries are used up
+
+    Raises:
+        RateLimitExceeded: If the call would have to queue too long
+    """
+    limiter = get_rate_limiter()
+
+    attempt = 0
+    while True:
+        if limiter is not None:
+            limiter.acquire(api_key)
+        response = send()
+        if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= Config.GOOGLE_API_MAX_THROTTLE_RETRIES:
+            return response
+
+        delay = retry_delay(response, attempt)
+        logger.warning(f"Google API throttled the call (HTTP {response.status_code}), "
+                       f"retrying in {delay:.1f}s")
+        if limiter is not None:
+            limiter.pause(api_key, delay)
+        else:
+            time.sleep(delay)
+        attempt += 1
+
+
+async def call_with_rate_limit_async(api_key: str, send: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Coroutine form of call_with_rate_limit for non-blocking clients.
+
+    ``send`` is a coroutine function returning a response with
+    ``status_code`` and ``headers``; waiting for a slot or a retry sleeps
+    without blocking the event loop.
+    """
+    limiter = get_rate_limiter()
+    loop = asyncio.get_running_loop()
+
+    attempt = 0
+    while True:
+        if limiter is not None:
+            # The SQLite store may wait on its lock, so it is used from the executor
+            delay = await loop.run_in_executor(None, limiter.reserve, api_key)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        response = await send()
+        if response.status_code not in RETRYABLE_STATUS_CODES or attempt >= Config.GOOGLE_API_MAX_THROTTLE_RETRIES:
+            return response
+
+        delay = retry_delay(response, attempt)
+        logger.warning(f"Google API throttled the call (HTTP {response.status_code}), "
+                       f"retrying in {delay:.1f}s")
+        if limiter is not None:
+            await loop.run_in_executor(None, limiter.pause, api_key, delay)
+        else:
+            await asyncio.sleep(delay)
+        attempt += 1
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Return the process-wide limiter, or None when Config.GOOGLE_API_QPS is 0."""
+    global _limiter
+    if Config.GOOGLE_API_QPS <= 0:
+        return None
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                store = None
+                if Config.RATE_LIMIT_DB_PATH:
+                    try:
+                        store = SQLiteBucketStore(Config.RATE_LIMIT_DB_PATH)
+                    except sqlite3.Error as e:
+                        logger.warning(f"Rate limit store unavailable, limiting per process: {str(e)}")
+                _limiter = RateLimiter(Config.GOOGLE_API_QPS, burst=Config.GOOGLE_API_BURST,
+                                       max_wait=Config.GOOGLE_API_MAX_QUEUE_WAIT, store=store)
+    return _limiter
@@ -0,0 +1,265 @@
+"""
+Result Cache
+Content-addressed cache for analysis results with an in-process LRU tier and
+an optional SQLite tier shared between worker processes.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from config.settings import Config
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def cache_key(mode: str, text: str) -> str:
+    """Hash of the analysis mode and the exact text that was analyzed."""
+    digest = hashlib.sha256(mode.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(text.encode('utf-8', 'surrogatepass'))
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory LRU of serialized values.
+
+    Entries are evicted least-recently-used first once either ``max_entries``
+    or ``max_bytes`` is exceeded, and expire ``ttl`` seconds after insertion.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: float = 3600):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._data: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._bytes += len(value)
+            while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._data)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def _remove(self, key: str) -> None:
+        value, _ = self._data.pop(key)
+        self._bytes -= len(value)
+
+
+class SQLiteCache:
+    """
+    Key/value store in a SQLite file, safe to share between processes.
+
+    Entries expire ``ttl`` seconds after insertion. Once the table grows past
+    ``max_entries`` or ``max_bytes``, the least recently read entries are
+    deleted. Each thread keeps its own connection.
+    """
+
+    def __init__(self, path: str, table: str = 'cache', max_entries: int = 100000,
+                 max_bytes: int = None, ttl: float = None):
+        self.path = path
+        self.table = table
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._local = threading.local()
+        self._writes = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        conn = self._connect()
+        row = conn.execute(f"SELECT value, created_at FROM {self.table} WHERE key = ?",
+                           (key,)).fetchone()
+        if row is None:
+            return None
+        now = time.time()
+        if self.ttl is not None and row[1] + self.ttl < now:
+            conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            return None
+        conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def set(self, key: str, value) -> None:
+        conn = self._connect()
+        now = time.time()
+        conn.execute(
+            f"INSERT OR REPLACE INTO {self.table} (key, value, size, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, value, len(value), now, now)
+        )
+        # Bounding the table costs a couple of aggregate queries, so it is
+        # only enforced every few writes.
+        self._writes += 1
+        if self._writes % 32 == 0:
+            self.evict()
+
+    def evict(self) -> None:
+        """Drop expired entries, then least recently read ones over the limits."""
+        conn = self._connect()
+        if self.ttl is not None:
+            conn.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl,))
+        count, total = conn.execute(f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}").fetchone()
+        if count > self.max_entries:
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} "
+                "ORDER BY accessed_at LIMIT ?)", (count - self.max_entries,)
+            )
+        if self.max_bytes is not None and total > self.max_bytes:
+            excess = total - self.max_bytes
+            freed = 0
+            stale = []
+            for key, size in conn.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed_at"):
+                if freed >= excess:
+                    break
+                stale.append((key,))
+                freed += size
+            conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", stale)
+
+    def clear(self) -> None:
+        self._connect().execute(f"DELETE FROM {self.table}")
+
+
+class ResultCache:
+    """
+    Two-tier cache of JSON-serialisable analysis results.
+
+    Values are stored serialized, so callers always receive a fresh copy
+    they are free to modify.
+    """
+
+    def __init__(self, memory: LRUCache, disk: Optional[SQLiteCache] = None):
+        self.memory = memory
+        self.disk = disk
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'stores': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def get(self, mode: str, text: str) -> Optional[Any]:
+        """Return the cached result for ``text`` under ``mode`` or None."""
+        key = cache_key(mode, text)
+        value = self.memory.get(key)
+        if value is not None:
+            self._count('memory_hits')
+            return json.loads(value)
+
+        if self.disk is not None:
+            try:
+                value = self.disk.get(key)
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache disk read failed: {str(e)}")
+                value = None
+            if value is not None:
+                self._count('disk_hits')
+                self.memory.set(key, value)
+                return json.loads(value)
+
+        self._count('misses')
+        return None
+
+    def set(self, mode: str, text: str, result: Any) -> None:
+        """Store ``result`` for ``text`` under ``mode`` in every tier."""
+        key = cache_key(mode, text)
+        value = json.dumps(result, separators=(',', ':'))
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.set(key, value)
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache disk write failed: {str(e)}")
+        self._count('stores')
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process plus the current tier sizes."""
+        with self._lock:
+            stats = dict(self._counters)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_ratio'] = round((lookups - stats['misses']) / lookups, 3) if lookups else 0.0
+        stats['memory_entries'] = len(self.memory)
+        stats['disk_enabled'] = self.disk is not None
+        return stats
+
+    def clear(self) -> None:
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> Optional[ResultCache]:
+    """Return the process-wide cache, or None when caching is disabled."""
+    global _result_cache
+    if not Config.RESULT_CACHE_ENABLED:
+        return None
+    if _result_cache is None:
+        with _result_cache_lock:
+            if _result_cache is None:
+                disk = None
+                if Config.RESULT_CACHE_DB_PATH:
+                    disk = SQLiteCache(Config.RESULT_CACHE_DB_PATH, table='results',
+                                       max_entries=Config.RESULT_CACHE_DISK_MAX_ENTRIES,
+                                       ttl=Config.RESULT_CACHE_TTL)
+                _result_cache = ResultCache(
+                    LRUCache(Config.RESULT_CACHE_MAX_ENTRIES, Config.RESULT_CACHE_MAX_BYTES,
+                             Config.RESULT_CACHE_TTL),
+                    disk
+                )
+    return _result_cache
@@ -0,0 +1,153 @@
+"""
+Sentiment Score Mapping
+Turns analyzeSentiment-style responses into the overall label and the
+positive/negative/neutral percentages shown to users, for many responses at
+once with NumPy. The single-response functions are thin wrappers over the
+bulk ones, so every path classifies with the same Config thresholds.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from config.settings import Config
+
+# Document scores closer to zero than this are replaced by the mean of the
+# non-zero sentence scores, which is more informative for mixed documents
+SENTENCE_FALLBACK_THRESHOLD = 0.01
+
+# Percentages start from these values and are clamped to [MIN, MAX]
+POLAR_BASE = 60.0
+NEUTRAL_BASE = 50.0
+MIN_PERCENTAGE = 5.0
+MAX_PERCENTAGE = 95.0
+
+
+LABELS = np.array(['Negative', 'Neutral', 'Positive'])
+
+
+def aggregate_sentence_scores(document_scores: np.ndarray, sentence_scores: np.ndarray,
+                              sentence_owners: np.ndarray) -> np.ndarray:
+    """
+    Apply the sentence-mean fallback to near-zero document scores.
+
+    Args:
+        document_scores (np.ndarray): One score per response
+        sentence_scores (np.ndarray): Scores of every sentence of every response
+        sentence_owners (np.ndarray): Index of the response each sentence belongs to
+
+    Returns:
+        np.ndarray: Document scores, with near-zero ones replaced by the mean
+        of their response's non-zero sentence scores where there are any
+    """
+    count = len(document_scores)
+    nonzero = sentence_scores != 0
+    owners = sentence_owners[nonzero]
+    totals = np.bincount(owners, weights=sentence_scores[nonzero], minlength=count)
+    counts = np.bincount(owners, minlength=count)
+
+    replace = (np.abs(document_scores) < SENTENCE_FALLBACK_THRESHOLD) & (counts > 0)
+    return np.where(replace, totals / np.maximum(counts, 1), document_scores)
+
+
+def map_sentiment_scores(scores: np.ndarray):
+    """
+    Classify scores and map them to clamped percentages in bulk.
+
+    Scores above Config.POSITIVE_THRESHOLD are Positive and below
+    Config.NEGATIVE_THRESHOLD Negative; polar scores move the percentages
+    by Config.CONFIDENCE_MULTIPLIER per unit, neutral ones by half of it.
+
+    Args:
+        scores (np.ndarray): Document scores in [-1, 1]
+
+    Returns:
+        Tuple: labels, positive, negative and neutral percentage arrays
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    positive_mask = scores > Config.POSITIVE_THRESHOLD
+    negative_mask = scores < Config.NEGATIVE_THRESHOLD
+    polar = positive_mask | negative_mask
+
+    # Positive documents start at 60/40, negative ones at 40/60, neutral at 50/50
+    base = np.where(positive_mask, POLAR_BASE,
+                    np.where(negative_mask, 100.0 - POLAR_BASE, NEUTRAL_BASE))
+    shift = scores * np.where(polar, Config.CONFIDENCE_MULTIPLIER, Config.CONFIDENCE_MULTIPLIER / 2)
+
+    positive = np.clip(base + shift, MIN_PERCENTAGE, MAX_PERCENTAGE)
+    negative = np.clip(100.0 - base - shift, MIN_PERCENTAGE, MAX_PERCENTAGE)
+    neutral = np.maximum(0.0, 100.0 - positive - negative)
+
+    labels = LABELS[positive_mask.astype(np.int8) - negative_mask.astype(np.int8) + 1]
+    return labels, positive, negative, neutral
+
+
+def map_sentiment_score(score: float):
+    """
+    Scalar form of map_sentiment_scores for a single score.
+
+    Returns:
+        Tuple: label, positive, negative and neutral percentages
+    """
+    labels, positive, negative, neutral = map_sentiment_scores(np.array([score], dtype=np.float64))
+    return str(labels[0]), float(positive[0]), float(negative[0]), float(neutral[0])
+
+
+def _result(label, positive, negative, neutral, score, magnitude) -> Dict[str, Any]:
+    return {
+        'overall_sentiment': label,
+        'positive_percentage': round(positive, 1),
+        'negative_percentage': round(negative, 1),
+        'neutral_percentage': round(neutral, 1),
+        'confidence_score': round(abs(score), 3),
+        'magnitude': round(magnitude, 3),
+        'google_raw_score': score
+    }
+
+
+def process_sentiment_responses(api_responses: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Build the user-facing sentiment result for each of many API responses.
+
+    Args:
+        api_responses (Sequence[Dict[str, Any]]): analyzeSentiment-style responses
+
+    Returns:
+        List[Dict[str, Any]]: One result per response, in order
+
+    Raises:
+        ValueError, TypeError: If a score or magnitude is not a number
+    """
+    document_sentiments = [response.get('documentSentiment', {}) for response in api_responses]
+    document_scores = np.array([float(sentiment.get('score', 0)) for sentiment in document_sentiments],
+                               dtype=np.float64)
+    magnitudes = [float(sentiment.get('magnitude', 0)) for sentiment in document_sentiments]
+
+    # Sentences are only read for the responses that need the fallback
+    fallback = np.flatnonzero(np.abs(document_scores) < SENTENCE_FALLBACK_THRESHOLD).tolist()
+    sentences = [api_responses[position].get('sentences') or () for position in fallback]
+    if any(sentences):
+        sentence_scores = np.array([float(sentence.get('sentiment', {}).get('score', 0))
+                                    for group in sentences for sentence in group], dtype=np.float64)
+        sentence_owners = np.repeat(np.array(fallback, dtype=np.int64), [len(group) for group in sentences])
+        scores = aggregate_sentence_scores(document_scores, sentence_scores, sentence_owners)
+    else:
+        scores = document_scores
+
+    labels, positive, negative, neutral = map_sentiment_scores(scores)
+
+    return [
+        _result(*values)
+        for values in zip(labels.tolist(), positive.tolist(), negative.tolist(), neutral.tolist(),
+                          scores.tolist(), magnitudes)
+    ]
+
+
+def process_sentiment_response(api_response: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the user-facing sentiment result for one API response.
+
+    Raises:
+        ValueError, TypeError: If a score or magnitude is not a number
+    """
+    return process_sentiment_responses([api_response])[0]
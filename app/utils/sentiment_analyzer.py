@@ -3,11 +3,20 @@ Enhanced Sentiment Analysis with Word-Level Insights
 Shows specific words/phrases that contribute to positive and negative sentiment.
 """
 
-import requests
-import json
 import logging
-from typing import Dict, Any, List, Tuple
-import re
+from collections import deque
+from typing import Dict, Any, Iterable, Iterator, List, Tuple
+
+from app.utils.chunking import SentimentAccumulator, iter_text_chunks, split_into_chunks
+from app.utils.fanout import get_chunk_executor, run_parallel
+from app.utils.http_client import google_api_url, post_json
+from app.utils.lexicon_matcher import extract_context
+from app.utils.lexicon_store import get_lexicon_store
+from app.utils.metrics import CACHE_REQUESTS, timed_stage
+from app.utils.result_cache import get_result_cache
+from app.utils.scoring import process_sentiment_response
+from app.utils.text_normalizer import normalize_text
+from config.settings import Config
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -24,29 +33,39 @@ def analyze_sentiment_with_detailed_insights(text: str, api_key: str) -> Dict[st
     Returns:
         Dict[str, Any]: Enhanced sentiment analysis results with word insights
     """
+    # app.engine imports this module, so its explanations are imported on use
+    from app.engine.insights import combine_word_insights
+    
     try:
-        # First, get the standard sentiment analysis
-        base_result = analyze_sentiment_with_google(text, api_key)
+        # The remote call(s) and the local lexicon scan are independent.
+        # annotateText only covers the first window, so long documents that
+        # are scored in full use the separate calls instead.
+        if Config.GOOGLE_NL_BACKEND == 'annotate' and not _use_full_document(text):
+            results, timings = run_parallel({
+                'annotate': lambda: analyze_with_annotate_text(text, api_key),
+                'word_level': lambda: analyze_word_level_sentiment(text)
+            })
+            base_result, entity_result = results['annotate']
+        else:
+            results, timings = run_parallel({
+                'sentiment': lambda: analyze_sentiment_with_google(text, api_key),
+                'entity': lambda: analyze_entity_sentiment(text, api_key),
+                'word_level': lambda: analyze_word_level_sentiment(text)
+            })
+            base_result = results['sentiment']
+            entity_result = results['entity']
         
         if 'error' in base_result:
             return base_result
         
-        # Get detailed entity sentiment analysis
-        entity_result = analyze_entity_sentiment(text, api_key)
-        
-        # Analyze text for specific positive/negative indicators
-        word_insights = analyze_word_level_sentiment(text)
+        word_insights = results['word_level']
         
         # Combine results
-        enhanced_result = base_result.copy()
+        enhanced_result = combine_word_insights(base_result, word_insights)
         enhanced_result.update({
-            'positive_words': word_insights['positive_words'],
-            'negative_words': word_insights['negative_words'],
-            'positive_phrases': word_insights['positive_phrases'],
-            'negative_phrases': word_insights['negative_phrases'],
-            'sentiment_explanation': generate_sentiment_explanation(base_result, word_insights),
             'entity_sentiment': entity_result.get('entities', []),
-            'detailed_breakdown': generate_detailed_breakdown(base_result, word_insights)
+            'detailed_breakdown': generate_detailed_breakdown(base_result, word_insights),
+            'timings': timings
         })
         
         return enhanced_result
@@ -55,16 +74,67 @@ def analyze_sentiment_with_detailed_insights(text: str, api_key: str) -> Dict[st
         logger.error(f"Enhanced sentiment analysis failed: {str(e)}")
         return {'error': f'Enhanced analysis failed: {str(e)}'}
 
+@timed_stage('sentiment')
 def analyze_sentiment_with_google(text: str, api_key: str) -> Dict[str, Any]:
     """
     Standard Google Cloud sentiment analysis (your existing function).
+    
+    Texts longer than Config.MAX_TEXT_LENGTH are scored in full by
+    analyze_full_document_sentiment when Config.FULL_DOCUMENT_SENTIMENT is on.
     """
     try:
-        url = f"https://language.googleapis.com/v1/documents:analyzeSentiment?key={api_key}"
+        if _use_full_document(text):
+            return analyze_full_document_sentiment(text, api_key)
+        
+        url = google_api_url('analyzeSentiment', api_key)
         
         # Preprocess text
         text = _preprocess_text_for_api(text)
         
+        cached = _cache_lookup('sentiment', text)
+        if cached is not None:
+            return cached
+        
+        payload = {
+            "document": {
+                "type": "PLAIN_TEXT",
+                "content": text
+            },
+            "encodingType": "UTF8"
+        }
+        
+        response = post_json(url, payload, rate_limit_key=api_key)
+        
+        if response.status_code == 200:
+            result = _process_sentiment_response(response.json(), text)
+            _cache_store('sentiment', text, result)
+            return result
+        else:
+            return {'error': f'Google API Error: {response.status_code}', 'status_code': response.status_code}
+            
+    except Exception as e:
+        return {'error': f'API request failed: {str(e)}'}
+
+def analyze_chunk_sentiment(text: str, api_key: str) -> Dict[str, Any]:
+    """
+    Get the raw analyzeSentiment response for one chunk of a longer document.
+    
+    Args:
+        text (str): Chunk text, already cut to the chunk size
+        api_key (str): Google Cloud API key
+        
+    Returns:
+        Dict[str, Any]: Raw API response, or a dict with an 'error' key
+    """
+    try:
+        url = google_api_url('analyzeSentiment', api_key)
+        
+        text = _preprocess_chunk_for_api(text)
+        
+        cached = _cache_lookup('sentiment_raw', text)
+        if cached is not None:
+            return cached
+        
         payload = {
             "document": {
                 "type": "PLAIN_TEXT",
@@ -73,27 +143,257 @@ def analyze_sentiment_with_google(text: str, api_key: str) -> Dict[str, Any]:
             "encodingType": "UTF8"
         }
         
-        headers = {"Content-Type": "application/json"}
-        response = requests.post(url, data=json.dumps(payload), headers=headers)
+        response = post_json(url, payload, rate_limit_key=api_key)
         
         if response.status_code == 200:
             result = response.json()
-            return _process_sentiment_response(result, text)
+            _cache_store('sentiment_raw', text, result)
+            return result
         else:
-            return {'error': f'Google API Error: {response.status_code}'}
+            return {'error': f'Google API Error: {response.status_code}', 'status_code': response.status_code}
             
     except Exception as e:
         return {'error': f'API request failed: {str(e)}'}
 
+def analyze_full_document_sentiment(text: str, api_key: str, max_chars: int = None,
+                                    max_concurrency: int = None) -> Dict[str, Any]:
+    """
+    Score a whole document by splitting it into chunks sent concurrently.
+    
+    The text is split on sentence boundaries into API-sized chunks, at most
+    max_concurrency of which are in flight at once. Their document scores
+    and sentences are merged into a single analyzeSentiment-style response
+    before the usual processing.
+    
+    Args:
+        text (str): Full document text
+        api_key (str): Google Cloud API key
+        max_chars (int): Chunk size, defaults to Config.FULL_DOCUMENT_CHUNK_LENGTH
+        max_concurrency (int): In-flight chunk limit, defaults to
+            Config.CHUNK_MAX_CONCURRENCY
+        
+    Returns:
+        Dict[str, Any]: Sentiment results as from _process_sentiment_response
+        plus 'chunks_analyzed', or a dict with an 'error' key
+    """
+    max_chars = max_chars or Config.FULL_DOCUMENT_CHUNK_LENGTH
+    
+    cached = _cache_lookup(f'sentiment_full:{max_chars}', text)
+    if cached is not None:
+        return cached
+    
+    chunks = []
+    responses = []
+    for chunk, response in _iter_chunk_responses(split_into_chunks(text, max_chars),
+                                                 api_key, max_concurrency):
+        if 'error' in response:
+            return response
+        chunks.append(chunk)
+        responses.append(response)
+    
+    accumulator = SentimentAccumulator(keep_sentences=True)
+    accumulator.add_many(responses, [len(chunk) for chunk in chunks])
+    
+    if accumulator.chunks == 0:
+        return {'error': 'No text to analyze'}
+    
+    result = _process_sentiment_response(accumulator.to_response(), text)
+    result['chunks_analyzed'] = accumulator.chunks
+    _cache_store(f'sentiment_full:{max_chars}', text, result)
+    return result
+
+def analyze_pages_streaming(pages: Iterable[str], api_key: str, max_chars: int = None) -> Dict[str, Any]:
+    """
+    Analyze a document page by page without assembling its full text.
+    
+    Pages are grouped into sentence-aligned, API-sized chunks with a bounded
+    number in flight at once; only running totals are kept, so memory stays
+    bounded however long the document is. The document score weights each chunk by
+    its length and magnitude.
+    
+    Args:
+        pages (Iterable[str]): Page texts in document order
+        api_key (str): Google Cloud API key
+        max_chars (int): Chunk size, defaults to Config.FULL_DOCUMENT_CHUNK_LENGTH
+        
+    Returns:
+        Dict[str, Any]: 'sentiment_analysis' in the usual format plus
+        'chunks_analyzed', with 'word_count', 'character_count' and an
+        'extracted_text' preview, or a dict with an 'error' key
+    """
+    max_chars = max_chars or Config.FULL_DOCUMENT_CHUNK_LENGTH
+    accumulator = SentimentAccumulator()
+    preview = []
+    preview_length = 0
+    word_count = 0
+    
+    for chunk, response in _iter_chunk_responses(iter_text_chunks(pages, max_chars), api_key):
+        if preview_length <= 300:
+            preview.append(chunk)
+            preview_length += len(chunk) + 1
+        word_count += len(chunk.split())
+        
+        if 'error' in response:
+            return response
+        accumulator.add(response, len(chunk))
+    
+    if accumulator.chunks == 0:
+        return {'error': 'Could not extract text from PDF'}
+    
+    sentiment_result = _process_sentiment_response(accumulator.to_response(), '')
+    sentiment_result['chunks_analyzed'] = accumulator.chunks
+    
+    # Chunks are separated by single spaces in the normalised document
+    character_count = accumulator.characters + accumulator.chunks - 1
+    preview_text = ' '.join(preview)
+    
+    return {
+        'extracted_text': preview_text[:300] + '...' if character_count > 300 else preview_text,
+        'word_count': word_count,
+        'character_count': character_count,
+        'sentiment_analysis': sentiment_result
+    }
+
+def iter_analysis_events(pages: Iterable[str], api_key: str, max_chars: int = None,
+                         max_concurrency: int = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Analyze a document and yield progress events as each stage happens.
+    
+    Chunks are sent as soon as enough pages have been read, at most
+    max_concurrency at once, and the running document sentiment is reported
+    after every response, so the first partial result arrives after one
+    round trip instead of after the whole document.
+    
+    Events, as (name, data) pairs:
+        'extract': {'pages'} as pages are read, plus 'done' at the end
+        'chunk_sent': {'chunk', 'characters'} when a request is issued
+        'chunk_done': {'chunk', 'chunks_analyzed', 'pages', 'word_count',
+            'character_count', 'sentiment'} with the partial sentiment
+        'word_level': counts of matched lexicon words and phrases
+        'result': the final /analyze-style result
+        'error': {'error'}, plus 'stage' ('sentiment') and 'status_code'
+            when a scoring request failed; no further events follow
+    
+    Args:
+        pages (Iterable[str]): Page texts in document order
+        api_key (str): Google Cloud API key
+        max_chars (int): Chunk size, defaults to Config.FULL_DOCUMENT_CHUNK_LENGTH
+        max_concurrency (int): In-flight chunk limit, defaults to
+            Config.CHUNK_MAX_CONCURRENCY
+    """
+    from app.engine.insights import combine_word_insights
+    
+    max_chars = max_chars or Config.FULL_DOCUMENT_CHUNK_LENGTH
+    max_concurrency = max(1, max_concurrency or Config.CHUNK_MAX_CONCURRENCY)
+    executor = get_chunk_executor()
+    
+    pages_read = 0
+    
+    def counted(source):
+        nonlocal pages_read
+        for page_text in source:
+            pages_read += 1
+            yield page_text
+    
+    chunk_source = iter_text_chunks(counted(pages), max_chars)
+    accumulator = SentimentAccumulator(keep_sentences=True)
+    chunks = []
+    window = deque()
+    reported_pages = 0
+    exhausted = False
+    word_count = 0
+    offset = 0
+    
+    try:
+        while True:
+            # Keep up to max_concurrency requests in flight
+            while not exhausted and len(window) < max_concurrency:
+                chunk = next(chunk_source, None)
+                if pages_read != reported_pages:
+                    reported_pages = pages_read
+                    yield 'extract', {'pages': pages_read}
+                if chunk is None:
+                    exhausted = True
+                    yield 'extract', {'pages': pages_read, 'done': True}
+                    break
+                window.append((len(chunks), chunk, executor.submit(analyze_chunk_sentiment, chunk, api_key)))
+                chunks.append(chunk)
+                yield 'chunk_sent', {'chunk': len(chunks) - 1, 'characters': len(chunk)}
+            
+            if not window:
+                break
+            
+            index, chunk, future = window.popleft()
+            response = future.result()
+            if 'error' in response:
+                error = {'error': response['error'], 'stage': 'sentiment'}
+                if 'status_code' in response:
+                    error['status_code'] = response['status_code']
+                yield 'error', error
+                return
+            
+            accumulator.add(response, len(chunk), offset)
+            offset += len(chunk) + 1
+            word_count += len(chunk.split())
+            
+            # The partial score only needs the running totals, not the sentences
+            partial = _process_sentiment_response(
+                {'documentSentiment': {'score': accumulator.score, 'magnitude': accumulator.magnitude}}, ''
+            )
+            yield 'chunk_done', {
+                'chunk': index,
+                'chunks_analyzed': accumulator.chunks,
+                'pages': pages_read,
+                'word_count': word_count,
+                'character_count': offset - 1,
+                'sentiment': partial
+            }
+    finally:
+        # Stop outstanding requests when the client disconnects
+        for _, _, future in window:
+            future.cancel()
+    
+    if accumulator.chunks == 0:
+        yield 'error', {'error': 'Could not extract text from PDF'}
+        return
+    
+    text = ' '.join(chunks)
+    base_result = _process_sentiment_response(accumulator.to_response(), text)
+    if 'error' in base_result:
+        yield 'error', base_result
+        return
+    base_result['chunks_analyzed'] = accumulator.chunks
+    
+    word_insights = analyze_word_level_sentiment(text)
+    yield 'word_level', {key: len(word_insights[key]) for key in (
+        'positive_words', 'negative_words', 'positive_phrases', 'negative_phrases')}
+    
+    sentiment_result = combine_word_insights(base_result, word_insights)
+    sentiment_result.update({
+        'detailed_breakdown': generate_detailed_breakdown(base_result, word_insights)
+    })
+    
+    yield 'result', {
+        'extracted_text': text[:300] + '...' if len(text) > 300 else text,
+        'word_count': word_count,
+        'character_count': len(text),
+        'sentiment_analysis': sentiment_result
+    }
+
+@timed_stage('entities')
 def analyze_entity_sentiment(text: str, api_key: str) -> Dict[str, Any]:
     """
     Analyze sentiment of specific entities in the text.
     """
     try:
-        url = f"https://language.googleapis.com/v1/documents:analyzeEntitySentiment?key={api_key}"
+        url = google_api_url('analyzeEntitySentiment', api_key)
         
         text = _preprocess_text_for_api(text)
         
+        cached = _cache_lookup('entity', text)
+        if cached is not None:
+            return cached
+        
         payload = {
             "document": {
                 "type": "PLAIN_TEXT",
@@ -102,11 +402,12 @@ def analyze_entity_sentiment(text: str, api_key: str) -> Dict[str, Any]:
             "encodingType": "UTF8"
         }
         
-        headers = {"Content-Type": "application/json"}
-        response = requests.post(url, data=json.dumps(payload), headers=headers)
+        response = post_json(url, payload, rate_limit_key=api_key)
         
         if response.status_code == 200:
-            return response.json()
+            result = response.json()
+            _cache_store('entity', text, result)
+            return result
         else:
             logger.warning(f"Entity sentiment analysis failed: {response.status_code}")
             return {'entities': []}
@@ -115,150 +416,105 @@ def analyze_entity_sentiment(text: str, api_key: str) -> Dict[str, Any]:
         logger.warning(f"Entity sentiment analysis error: {str(e)}")
         return {'entities': []}
 
+@timed_stage('annotate')
+def analyze_with_annotate_text(text: str, api_key: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Get document and entity sentiment from a single annotateText request.
+    
+    Args:
+        text (str): Text content to analyze
+        api_key (str): Google Cloud API key
+        
+    Returns:
+        Tuple[Dict[str, Any], Dict[str, Any]]: The same results as
+        analyze_sentiment_with_google and analyze_entity_sentiment
+    """
+    try:
+        url = google_api_url('annotateText', api_key)
+        
+        text = _preprocess_text_for_api(text)
+        
+        cached = _cache_lookup('annotate', text)
+        if cached is not None:
+            return tuple(cached)
+        
+        payload = {
+            "document": {
+                "type": "PLAIN_TEXT",
+                "content": text
+            },
+            "features": {
+                "extractDocumentSentiment": True,
+                "extractEntitySentiment": True
+            },
+            "encodingType": "UTF8"
+        }
+        
+        response = post_json(url, payload, rate_limit_key=api_key)
+        
+        if response.status_code == 200:
+            result = response.json()
+            entity_result = {
+                'entities': result.get('entities', []),
+                'language': result.get('language', '')
+            }
+            base_result = _process_sentiment_response(result, text)
+            # The pair is cached as a list, which _cache_store cannot check for errors
+            if 'error' not in base_result:
+                _cache_store('annotate', text, [base_result, entity_result])
+            return base_result, entity_result
+        else:
+            return ({'error': f'Google API Error: {response.status_code}', 'status_code': response.status_code},
+                    {'entities': []})
+            
+    except Exception as e:
+        return {'error': f'API request failed: {str(e)}'}, {'entities': []}
+
+@timed_stage('word_level')
 def analyze_word_level_sentiment(text: str) -> Dict[str, List[str]]:
     """
     Analyze individual words and phrases for sentiment indicators.
     """
-    # Define sentiment word lists
-    positive_words = [
-        'good', 'great', 'excellent', 'amazing', 'wonderful', 'fantastic', 
-        'love', 'like', 'enjoy', 'happy', 'satisfied', 'pleased', 'perfect',
-        'best', 'awesome', 'brilliant', 'outstanding', 'impressive', 'beautiful',
-        'quality', 'recommend', 'worth', 'value', 'comfortable', 'easy'
-    ]
-    
-    negative_words = [
-        'bad', 'terrible', 'awful', 'horrible', 'disgusting', 'hate', 'dislike',
-        'disappointed', 'frustrated', 'angry', 'furious', 'worst', 'poor',
-        'waste', 'money', 'regret', 'problem', 'issue', 'broken', 'useless',
-        'cheap', 'uncomfortable', 'difficult', 'annoying', 'ridiculous'
-    ]
-    
-    # Convert text to lowercase for analysis
-    text_lower = text.lower()
-    words = re.findall(r'\b\w+\b', text_lower)
-    
-    # Find positive and negative words
+    # Results depend on the lexicon, so its signature is part of the key
+    store = get_lexicon_store()
+    mode = 'word_level:' + store.index().signature.hex()
+    cached = _cache_lookup(mode, text)
+    if cached is not None:
+        return cached
+    
     found_positive = []
     found_negative = []
+    positive_phrases = []
+    negative_phrases = []
     
-    for word in positive_words:
-        if word in text_lower:
-            # Count occurrences and find context
-            count = text_lower.count(word)
-            context = _find_word_context(text, word)
-            found_positive.append({
-                'word': word,
-                'count': count,
-                'context': context[:100] + '...' if len(context) > 100 else context
+    # A single scan finds every word and phrase hit with its first offsets
+    for hit in store.matcher().scan(text):
+        # Weight-0 entries are neutral and listed on neither side
+        if hit['weight'] == 0:
+            continue
+        if hit['tokens'] > 1:
+            target = positive_phrases if hit['weight'] > 0 else negative_phrases
+            target.append({
+                'phrase': hit['term'],
+                'context': extract_context(text, hit['start'], hit['end'], 30)
             })
-    
-    for word in negative_words:
-        if word in text_lower:
-            count = text_lower.count(word)
-            context = _find_word_context(text, word)
-            found_negative.append({
-                'word': word,
-                'count': count,
+        else:
+            target = found_positive if hit['weight'] > 0 else found_negative
+            context = extract_context(text, hit['start'], hit['end'])
+            target.append({
+                'word': hit['term'],
+                'count': hit['count'],
                 'context': context[:100] + '...' if len(context) > 100 else context
             })
     
-    # Find sentiment phrases
-    positive_phrases = _find_sentiment_phrases(text, positive=True)
-    negative_phrases = _find_sentiment_phrases(text, positive=False)
-    
-    return {
+    result = {
         'positive_words': found_positive,
         'negative_words': found_negative,
         'positive_phrases': positive_phrases,
         'negative_phrases': negative_phrases
     }
-
-def _find_word_context(text: str, word: str, context_length: int = 50) -> str:
-    """
-    Find the context around a specific word in the text.
-    """
-    import re
-    
-    # Case-insensitive search for word boundaries
-    pattern = r'\b' + re.escape(word) + r'\b'
-    match = re.search(pattern, text, re.IGNORECASE)
-    
-    if match:
-        start = max(0, match.start() - context_length)
-        end = min(len(text), match.end() + context_length)
-        return text[start:end].strip()
-    
-    return f"...{word}..."
-
-def _find_sentiment_phrases(text: str, positive: bool = True) -> List[str]:
-    """
-    Find common sentiment phrases in the text.
-    """
-    if positive:
-        phrases = [
-            'love it', 'really good', 'highly recommend', 'works great',
-            'very satisfied', 'excellent quality', 'money well spent',
-            'perfect for', 'really happy', 'great value'
-        ]
-    else:
-        phrases = [
-            'waste of money', 'completely useless', 'terrible quality',
-            'deeply regret', 'absolutely furious', 'worst product',
-            'total disappointment', 'complete waste', 'hands down the worst',
-            'awful experience', 'really disappointed'
-        ]
-    
-    found_phrases = []
-    text_lower = text.lower()
-    
-    for phrase in phrases:
-        if phrase in text_lower:
-            context = _find_word_context(text, phrase, 30)
-            found_phrases.append({
-                'phrase': phrase,
-                'context': context
-            })
-    
-    return found_phrases
-
-def generate_sentiment_explanation(base_result: Dict[str, Any], word_insights: Dict[str, List]) -> Dict[str, str]:
-    """
-    Generate explanations for why the sentiment percentages were calculated.
-    """
-    positive_pct = base_result.get('positive_percentage', 0)
-    negative_pct = base_result.get('negative_percentage', 0)
-    overall = base_result.get('overall_sentiment', 'Neutral')
-    
-    positive_words_count = len(word_insights['positive_words'])
-    negative_words_count = len(word_insights['negative_words'])
-    
-    explanations = {}
-    
-    # Positive explanation
-    if positive_pct > 0:
-        pos_words = [item['word'] for item in word_insights['positive_words']]
-        explanations['positive_explanation'] = (
-            f"The {positive_pct}% positive sentiment comes from {positive_words_count} positive indicators "
-            f"found in the text. Key positive words include: {', '.join(pos_words[:5])}. "
-            f"However, these are overshadowed by stronger negative sentiment."
-        )
-    
-    # Negative explanation
-    if negative_pct > 0:
-        neg_words = [item['word'] for item in word_insights['negative_words']]
-        explanations['negative_explanation'] = (
-            f"The {negative_pct}% negative sentiment is driven by {negative_words_count} negative indicators "
-            f"such as: {', '.join(neg_words[:5])}. These words create a strongly negative overall tone."
-        )
-    
-    # Overall explanation
-    explanations['overall_explanation'] = (
-        f"The document is classified as '{overall}' because "
-        f"{'negative sentiment significantly outweighs positive sentiment' if overall == 'Negative' else 'positive and negative sentiments are balanced' if overall == 'Neutral' else 'positive sentiment dominates the text'}."
-    )
-    
-    return explanations
+    _cache_store(mode, text, result)
+    return result
 
 def generate_detailed_breakdown(base_result: Dict[str, Any], word_insights: Dict[str, List]) -> Dict[str, Any]:
     """
@@ -275,65 +531,79 @@ def generate_detailed_breakdown(base_result: Dict[str, Any], word_insights: Dict
         'dominant_sentiment': 'negative' if base_result.get('negative_percentage', 0) > base_result.get('positive_percentage', 0) else 'positive'
     }
 
+def _use_full_document(text: str) -> bool:
+    """
+    Whether text is long enough to be scored in chunks rather than truncated.
+    """
+    return Config.FULL_DOCUMENT_SENTIMENT and len(text.strip()) > Config.MAX_TEXT_LENGTH
+
+def _iter_chunk_responses(chunks: Iterable[str], api_key: str,
+                          max_concurrency: int = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Send chunks to the API concurrently and yield (chunk, response) in order.
+    
+    At most max_concurrency requests are in flight; chunks are pulled from
+    the iterable only as slots free up, so a lazy source stays lazy.
+    """
+    max_concurrency = max(1, max_concurrency or Config.CHUNK_MAX_CONCURRENCY)
+    executor = get_chunk_executor()
+    window = deque()
+    
+    try:
+        for chunk in chunks:
+            window.append((chunk, executor.submit(analyze_chunk_sentiment, chunk, api_key)))
+            if len(window) >= max_concurrency:
+                chunk, future = window.popleft()
+                yield chunk, future.result()
+        while window:
+            chunk, future = window.popleft()
+            yield chunk, future.result()
+    finally:
+        # Stop outstanding requests when the caller bails out early
+        for _, future in window:
+            future.cancel()
+
+def _cache_lookup(mode: str, text: str) -> Any:
+    """
+    Return a cached result for text analyzed in the given mode, if any.
+    """
+    cache = get_result_cache()
+    if cache is None:
+        return None
+    result = cache.get(mode, text)
+    CACHE_REQUESTS.inc(cache='result', result='miss' if result is None else 'hit')
+    return result
+
+def _cache_store(mode: str, text: str, result: Any) -> None:
+    """
+    Cache a successful result for text analyzed in the given mode.
+    """
+    cache = get_result_cache()
+    if cache is not None and 'error' not in result:
+        cache.set(mode, text, result)
+
 def _preprocess_text_for_api(text: str) -> str:
     """
     Preprocess text for Google Cloud API.
     """
-    text = text.strip()
-    if len(text) > 1000:
-        text = text[:1000]
-    text = ''.join(char for char in text if ord(char) < 128)
-    return text
+    return normalize_text(text, Config.MAX_TEXT_LENGTH)
+
+def _preprocess_chunk_for_api(text: str) -> str:
+    """
+    Preprocess one chunk of a document scored in full; chunks are already
+    cut to size, so they are not truncated again.
+    """
+    return normalize_text(text)
 
 def _process_sentiment_response(api_response: Dict[str, Any], original_text: str) -> Dict[str, Any]:
     """
     Process Google Cloud API response (your existing function).
+    
+    Classification and percentage mapping follow the thresholds in Config;
+    see app.utils.scoring.
     """
     try:
-        document_sentiment = api_response.get('documentSentiment', {})
-        doc_score = float(document_sentiment.get('score', 0))
-        doc_magnitude = float(document_sentiment.get('magnitude', 0))
-        
-        # If document score is near zero, calculate from sentences
-        if abs(doc_score) < 0.01 and 'sentences' in api_response:
-            sentence_scores = []
-            for sentence in api_response['sentences']:
-                sent_sentiment = sentence.get('sentiment', {})
-                sent_score = sent_sentiment.get('score', 0)
-                if sent_score != 0:
-                    sentence_scores.append(float(sent_score))
-            
-            if sentence_scores:
-                doc_score = sum(sentence_scores) / len(sentence_scores)
-        
-        # Calculate sentiment classification
-        if doc_score > 0.02:
-            overall_sentiment = "Positive"
-            positive_percentage = 60 + (doc_score * 200)
-            negative_percentage = 40 - (doc_score * 200)
-        elif doc_score < -0.02:
-            overall_sentiment = "Negative"
-            positive_percentage = 40 + (doc_score * 200)
-            negative_percentage = 60 - (doc_score * 200)
-        else:
-            overall_sentiment = "Neutral"
-            positive_percentage = 50 + (doc_score * 100)
-            negative_percentage = 50 - (doc_score * 100)
-        
-        # Ensure bounds
-        positive_percentage = max(5, min(95, positive_percentage))
-        negative_percentage = max(5, min(95, negative_percentage))
-        neutral_percentage = max(0, 100 - positive_percentage - negative_percentage)
-        
-        return {
-            'overall_sentiment': overall_sentiment,
-            'positive_percentage': round(positive_percentage, 1),
-            'negative_percentage': round(negative_percentage, 1),
-            'neutral_percentage': round(neutral_percentage, 1),
-            'confidence_score': round(abs(doc_score), 3),
-            'magnitude': round(doc_magnitude, 3),
-            'google_raw_score': doc_score
-        }
+        return process_sentiment_response(api_response)
         
     except Exception as e:
-        return {'error': f'Failed to process sentiment data: {str(e)}'}
\ No newline at end of file
+        return {'error': f'Failed to process sentiment data: {str(e)}'}
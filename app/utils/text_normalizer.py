@@ -0,0 +1,109 @@
+"""
+Text Normalization
+Prepares extracted text for analysis with C-level string operations:
+truncation, ASCII folding with transliteration, whitespace collapsing and
+counting meaningful characters, without per-character Python loops.
+"""
+
+import codecs
+import unicodedata
+
+# Characters NFKD does not decompose into ASCII, mapped to their usual spelling
+_TRANSLITERATIONS = str.maketrans({
+    '‘': "'", '’': "'", '‚': "'", '‛': "'", '′': "'",
+    '“': '"', '”': '"', '„': '"', '″': '"', '«': '"', '»': '"',
+    '‐': '-', '‑': '-', '‒': '-', '–': '-', '—': '-', '―': '-', '−': '-',
+    '•': '*', '·': '.',
+    'ß': 'ss', 'æ': 'ae', 'Æ': 'AE', 'œ': 'oe', 'Œ': 'OE', 'ø': 'o', 'Ø': 'O',
+    'ł': 'l', 'Ł': 'L', 'đ': 'd', 'Đ': 'D', 'ð': 'd', 'Ð': 'D', 'þ': 'th', 'Þ': 'Th',
+    'ı': 'i', '€': 'EUR', '£': 'GBP', '©': '(c)', '®': '(R)', '™': 'TM',
+})
+
+
+class _FoldTable(dict):
+    """Code point to ASCII replacement, computed on first sight of each character."""
+
+    def __missing__(self, code_point):
+        char = chr(code_point)
+        folded = char.translate(_TRANSLITERATIONS)
+        if folded == char:
+            folded = unicodedata.normalize('NFKD', char)
+        folded = folded.encode('ascii', 'ignore').decode('ascii')
+        # Bounded so text full of distinct rare characters cannot grow it without limit
+        if len(self) < 65536:
+            self[code_point] = folded
+        return folded
+
+
+_FOLD_TABLE = _FoldTable()
+
+
+def _transliterate_errors(error):
+    # Called by the ASCII encoder with each run of characters it cannot encode
+    return error.object[error.start:error.end].translate(_FOLD_TABLE), error.end
+
+
+def _alnum_placeholder_errors(error):
+    # Stands in an ASCII letter for each alphanumeric character of the run
+    run = error.object[error.start:error.end]
+    return 'a' * sum(1 for char in run if char.isalnum()), error.end
+
+
+codecs.register_error('ascii_transliterate', _transliterate_errors)
+codecs.register_error('alnum_placeholder', _alnum_placeholder_errors)
+
+_NON_ALNUM_BYTES = bytes(code for code in range(256) if not (code < 128 and chr(code).isalnum()))
+
+
+def fold_to_ascii(text: str, transliterate: bool = True) -> str:
+    """
+    Reduce text to ASCII.
+
+    With ``transliterate``, accented letters keep their base letter
+    ("café" becomes "cafe") and common typographic characters are spelled
+    out; anything else outside ASCII is dropped. Without it, every
+    non-ASCII character is simply dropped.
+    """
+    if text.isascii():
+        return text
+    # The encoder copies ASCII runs in C; only non-ASCII runs reach Python
+    errors = 'ascii_transliterate' if transliterate else 'ignore'
+    return text.encode('ascii', errors).decode('ascii')
+
+
+def count_alnum(text: str) -> int:
+    """Count the characters for which str.isalnum() is true."""
+    # Deleting every non-alphanumeric byte leaves only the ones to count
+    return len(text.encode('ascii', 'alnum_placeholder').translate(None, _NON_ALNUM_BYTES))
+
+
+def normalize_text(text: str, max_length: int = None, collapse_whitespace: bool = True,
+                   transliterate: bool = True) -> str:
+    """
+    Normalize text for the sentiment API.
+
+    The raw text is cut to ``max_length`` first, so huge inputs cost no more
+    than their head; it is then folded to ASCII, whitespace runs are
+    collapsed to single spaces, and the result is stripped and cut to
+    ``max_length`` again (transliteration can lengthen it slightly).
+
+    Args:
+        text (str): Raw text
+        max_length (int): Maximum length of the result, or None for no limit
+        collapse_whitespace (bool): Replace whitespace runs with one space
+        transliterate (bool): Transliterate rather than drop non-ASCII letters
+
+    Returns:
+        str: Normalized text
+    """
+    if not text:
+        return ''
+    if max_length is not None:
+        text = text[:max_length]
+
+    text = fold_to_ascii(text, transliterate)
+    text = ' '.join(text.split()) if collapse_whitespace else text.strip()
+
+    if max_length is not None:
+        text = text[:max_length].rstrip()
+    return text
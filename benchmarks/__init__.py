@@ -0,0 +1,8 @@
+"""
+Benchmarks
+Standalone performance scripts for the Sentiment Analysis Platform.
+
+Run from the project root, e.g. ``python -m benchmarks.bench_lexicon_matcher``.
+``python -m benchmarks.suite`` runs the standard set and compares it with a
+baseline.
+"""
@@ -0,0 +1,71 @@
+"""
+Sentiment Backend Throughput Benchmark
+Compares documents per second of the local scorer with the Google backend
+against the mock API.
+
+Usage:
+    python -m benchmarks.bench_backends --docs 200 --sentences 40 --latency-ms 80
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.mock_google_nl import MockGoogleNLServer
+from benchmarks.synthetic_pdf import make_sentences
+from config.settings import Config
+
+
+def run(backend, documents, api_key=None):
+    """Score every document and return (seconds, results)."""
+    from app.utils.backends import analyze_sentiment
+
+    start = time.perf_counter()
+    results = [analyze_sentiment(text, api_key, backend) for text in documents]
+    elapsed = time.perf_counter() - start
+    errors = [result['error'] for result in results if 'error' in result]
+    if errors:
+        raise SystemExit(f'{backend}: {errors[0]}')
+    return elapsed, results
+
+
+def report(label, elapsed, count, characters):
+    print(f"{label:<22} {elapsed:8.2f} s {count / elapsed:10.1f} docs/s "
+          f"{characters / elapsed / 1e6:8.2f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sentiment backend throughput benchmark')
+    parser.add_argument('--docs', type=int, default=200)
+    parser.add_argument('--sentences', type=int, default=40, help='Sentences per document')
+    parser.add_argument('--latency-ms', type=float, default=80.0,
+                        help='Mock API latency per request')
+    parser.add_argument('--remote-docs', type=int, default=50,
+                        help='Documents sent to the remote path (it is much slower)')
+    args = parser.parse_args()
+
+    # Every run must do the work, and failures must not fall back
+    Config.RESULT_CACHE_ENABLED = False
+    Config.SENTIMENT_FALLBACK_BACKEND = ''
+
+    rng = random.Random(0)
+    documents = [' '.join(make_sentences(rng, args.sentences)) for _ in range(args.docs)]
+    characters = sum(len(text) for text in documents)
+    print(f"{args.docs} documents, {characters / args.docs:.0f} characters each on average")
+
+    # Warm the lexicon index before timing
+    run('local', documents[:1])
+    elapsed, _ = run('local', documents)
+    report('local', elapsed, len(documents), characters)
+
+    remote_documents = documents[:args.remote_docs]
+    remote_characters = sum(len(text) for text in remote_documents)
+    with MockGoogleNLServer(latency_ms=args.latency_ms) as server:
+        Config.GOOGLE_NL_BASE_URL = server.base_url
+        elapsed, _ = run('google', remote_documents, 'bench-key')
+        report(f'google ({args.latency_ms:.0f} ms RTT)', elapsed, len(remote_documents), remote_characters)
+        print(f"  {server.stats['requests']} API requests")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Chunked Sentiment Throughput Benchmark
+Scores a synthetic 50-page document in full against the mock API at several
+concurrency limits.
+
+Usage:
+    python -m benchmarks.bench_chunked_sentiment --pages 50 --latency-ms 80
+"""
+
+import argparse
+import io
+import time
+
+import PyPDF2
+
+from app.utils.pdf_processor import join_pages
+from benchmarks.mock_google_nl import MockGoogleNLServer
+from benchmarks.synthetic_pdf import generate_pdf
+from config.settings import Config
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Chunked sentiment throughput benchmark')
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--latency-ms', type=float, default=80.0,
+                        help='Mock API latency per request')
+    parser.add_argument('--concurrency', default='1,4,8,16',
+                        help='Comma-separated in-flight chunk limits')
+    args = parser.parse_args()
+
+    # Every run must reach the mock API
+    Config.RESULT_CACHE_ENABLED = False
+    from app.utils.sentiment_analyzer import analyze_full_document_sentiment
+
+    data = generate_pdf(args.pages)
+    text = join_pages(page.extract_text() for page in PyPDF2.PdfReader(io.BytesIO(data)).pages)
+    print(f"Document: {args.pages} pages, {len(text)} characters, "
+          f"chunk size {Config.FULL_DOCUMENT_CHUNK_LENGTH}")
+    print(f"{'concurrency':>12} {'chunks':>7} {'seconds':>8} {'chunks/s':>9} {'pages/s':>8}")
+
+    with MockGoogleNLServer(latency_ms=args.latency_ms) as server:
+        Config.GOOGLE_NL_BASE_URL = server.base_url
+        for limit in (int(value) for value in args.concurrency.split(',')):
+            start = time.perf_counter()
+            result = analyze_full_document_sentiment(text, 'bench-key', max_concurrency=limit)
+            elapsed = time.perf_counter() - start
+            if 'error' in result:
+                raise SystemExit(result['error'])
+            chunks = result['chunks_analyzed']
+            print(f"{limit:>12} {chunks:>7} {elapsed:>8.2f} {chunks / elapsed:>9.1f} "
+                  f"{args.pages / elapsed:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+HTTP Client Benchmark
+Compares per-call ``requests.post`` with the pooled keep-alive session.
+
+The mock server charges ``--connect-delay-ms`` for every new connection to
+stand in for the TCP and TLS handshakes a real call to Google would pay.
+
+Usage:
+    python -m benchmarks.bench_http_client --calls 200 --connect-delay-ms 30
+"""
+
+import argparse
+import json
+import statistics
+import time
+
+import requests
+
+from app.utils import http_client
+from benchmarks.mock_google_nl import MockGoogleNLServer
+from config.settings import Config
+
+PAYLOAD = {
+    'document': {'type': 'PLAIN_TEXT', 'content': 'The product works great. Support was slow.'},
+    'encodingType': 'UTF8'
+}
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run(label, call, calls, server):
+    connections_before = server.stats['connections']
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        response = call()
+        response.raise_for_status()
+        samples.append((time.perf_counter() - start) * 1000)
+    print(f"{label:<14} p50 {statistics.median(samples):7.2f} ms   "
+          f"p95 {_percentile(samples, 0.95):7.2f} ms   "
+          f"connections {server.stats['connections'] - connections_before}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP client benchmark')
+    parser.add_argument('--calls', type=int, default=200)
+    parser.add_argument('--latency-ms', type=float, default=2.0,
+                        help='Server processing time per request')
+    parser.add_argument('--connect-delay-ms', type=float, default=30.0,
+                        help='Simulated handshake cost per new connection')
+    args = parser.parse_args()
+
+    with MockGoogleNLServer(latency_ms=args.latency_ms,
+                            connect_delay_ms=args.connect_delay_ms) as server:
+        Config.GOOGLE_NL_BASE_URL = server.base_url
+        url = http_client.google_api_url('analyzeSentiment', 'bench-key')
+        headers = {'Content-Type': 'application/json'}
+
+        run('bare post', lambda: requests.post(url, data=json.dumps(PAYLOAD), headers=headers),
+            args.calls, server)
+        run('pooled session', lambda: http_client.post_json(url, PAYLOAD), args.calls, server)
+        http_client.close_session()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""
+Lexicon Matcher Benchmark
+Compares the single-pass matcher, in memory and over a compiled index,
+with the per-word scan it replaced.
+
+Usage:
+    python -m benchmarks.bench_lexicon_matcher
+    python -m benchmarks.bench_lexicon_matcher --words 20000 --sizes 100,1000,10000,50000
+"""
+
+import argparse
+import random
+import os
+import re
+import string
+import tempfile
+import time
+
+from app.utils.lexicon_matcher import LexiconMatcher, build_matcher
+from app.utils.lexicon_store import LexiconIndex, compile_lexicon
+
+
+def _random_word(rng, length):
+    return ''.join(rng.choice(string.ascii_lowercase) for _ in range(length))
+
+
+def make_lexicon(size, rng):
+    """Build ``size`` unique terms, roughly one in ten being a two-word phrase."""
+    terms = set()
+    while len(terms) < size:
+        term = _random_word(rng, rng.randint(4, 9))
+        if rng.random() < 0.1:
+            term += ' ' + _random_word(rng, rng.randint(3, 7))
+        terms.add(term)
+    terms = sorted(terms)
+    half = len(terms) // 2
+    return terms[:half], terms[half:]
+
+
+def make_document(word_count, vocabulary, rng):
+    """Build a document mixing lexicon terms with filler words."""
+    words = []
+    for _ in range(word_count):
+        if rng.random() < 0.05:
+            words.append(rng.choice(vocabulary))
+        else:
+            words.append(_random_word(rng, rng.randint(2, 8)))
+    return ' '.join(words)
+
+
+def legacy_scan(text, positive_terms, negative_terms):
+    """The previous implementation: substring test, count and regex per term."""
+    text_lower = text.lower()
+    found = []
+    for term in positive_terms + negative_terms:
+        if term in text_lower:
+            count = text_lower.count(term)
+            match = re.search(r'\b' + re.escape(term) + r'\b', text, re.IGNORECASE)
+            found.append((term, count, match.start() if match else -1))
+    return found
+
+
+def build_index_matcher(positive_terms, negative_terms, directory):
+    """Compile the terms into a memory-mapped index and return its matcher."""
+    source = os.path.join(directory, 'lexicon.tsv')
+    with open(source, 'w', encoding='utf-8') as handle:
+        for term in positive_terms:
+            handle.write(f"{term}\t1\n")
+        for term in negative_terms:
+            handle.write(f"{term}\t-1\n")
+    index_path = os.path.join(directory, 'lexicon.idx')
+    compile_lexicon([source], index_path)
+    return LexiconMatcher(LexiconIndex(index_path))
+
+
+def _best_of(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lexicon matcher benchmark')
+    parser.add_argument('--words', type=int, default=20000,
+                        help='Document length in words (default: 20000)')
+    parser.add_argument('--sizes', default='100,1000,10000,50000',
+                        help='Comma-separated lexicon sizes')
+    parser.add_argument('--legacy-limit', type=int, default=10000,
+                        help='Largest lexicon size to run the legacy scan on')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    print(f"Document: {args.words} words")
+    print(f"{'lexicon':>10} {'build ms':>10} {'scan ms':>10} {'index ms':>10} "
+          f"{'legacy ms':>10} {'speedup':>9}")
+    workdir = tempfile.mkdtemp(prefix='bench-lexicon-')
+
+    for size in sizes:
+        positive, negative = make_lexicon(size, rng)
+        text = make_document(args.words, positive + negative, rng)
+
+        start = time.perf_counter()
+        matcher = build_matcher(positive, negative)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        scan_ms = _best_of(lambda: matcher.scan(text), args.repeat) * 1000
+
+        index_matcher = build_index_matcher(positive, negative, workdir)
+        index_ms = _best_of(lambda: index_matcher.scan(text), args.repeat) * 1000
+
+        if size <= args.legacy_limit:
+            legacy_ms = _best_of(lambda: legacy_scan(text, positive, negative), 1) * 1000
+            print(f"{size:>10} {build_ms:>10.1f} {scan_ms:>10.1f} {index_ms:>10.1f} "
+                  f"{legacy_ms:>10.1f} {legacy_ms / scan_ms:>8.1f}x")
+        else:
+            print(f"{size:>10} {build_ms:>10.1f} {scan_ms:>10.1f} {index_ms:>10.1f} "
+                  f"{'-':>10} {'-':>9}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+"""
+PDF Text Assembly Memory Benchmark
+Compares peak memory (tracemalloc) of the old concatenate-then-normalise
+assembly with ``join_pages`` on a synthetic multi-page PDF.
+
+Usage:
+    python -m benchmarks.bench_pdf_memory --pages 1000
+    python -m benchmarks.bench_pdf_memory --pages 200 --with-extract
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+
+import PyPDF2
+
+from app.utils.pdf_processor import iter_pdf_pages, join_pages
+from benchmarks.synthetic_pdf import generate_pdf
+
+
+def legacy_assemble(pages):
+    """The previous assembly: repeated concatenation, strip, split and join."""
+    text = ""
+    for page_text in pages:
+        text += page_text + "\n"
+    text = text.strip()
+    return ' '.join(text.split())
+
+
+def legacy_extract(data):
+    return legacy_assemble(page.extract_text() for page in PyPDF2.PdfReader(io.BytesIO(data)).pages)
+
+
+def streaming_extract(data):
+    return join_pages(iter_pdf_pages(io.BytesIO(data), use_cache=False))
+
+
+def measure(func, *args):
+    """Return (result, peak bytes above the starting point, seconds)."""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return result, peak, elapsed
+
+
+def report(label, peak, elapsed, text_size):
+    print(f"{label:<28} peak {peak / 1e6:8.2f} MB  ({peak / text_size:5.1f}x text)  "
+          f"{elapsed * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PDF text assembly memory benchmark')
+    parser.add_argument('--pages', type=int, default=1000)
+    parser.add_argument('--lines', type=int, default=40, help='Text lines per page')
+    parser.add_argument('--with-extract', action='store_true',
+                        help='Also measure end-to-end extraction (slow under tracemalloc)')
+    args = parser.parse_args()
+
+    data = generate_pdf(args.pages, args.lines)
+    pages = [page.extract_text() for page in PyPDF2.PdfReader(io.BytesIO(data)).pages]
+    print(f"Synthetic PDF: {args.pages} pages, {len(data) / 1e6:.1f} MB file")
+
+    legacy_text, legacy_peak, legacy_time = measure(legacy_assemble, pages)
+    text, peak, elapsed = measure(join_pages, pages)
+    assert text == legacy_text, 'join_pages output differs from the legacy assembly'
+    print(f"Assembled text: {len(text) / 1e6:.2f} MB")
+    report('assembly: legacy', legacy_peak, legacy_time, len(text))
+    report('assembly: join_pages', peak, elapsed, len(text))
+
+    if args.with_extract:
+        legacy_text, legacy_peak, legacy_time = measure(legacy_extract, data)
+        text, peak, elapsed = measure(streaming_extract, data)
+        assert text == legacy_text, 'streaming extraction differs from the legacy path'
+        report('extract+assemble: legacy', legacy_peak, legacy_time, len(text))
+        report('extract+assemble: pages', peak, elapsed, len(text))
+
+
+if __name__ == '__main__':
+    main()
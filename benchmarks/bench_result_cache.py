@@ -0,0 +1,70 @@
+"""
+Result Cache Benchmark
+Measures first-upload and repeat-upload latency of the detailed analysis.
+
+Usage:
+    python -m benchmarks.bench_result_cache --repeats 20 --latency-ms 150
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from benchmarks.mock_google_nl import MockGoogleNLServer
+from config.settings import Config
+
+TEXT = (
+    "The new release from Acme is excellent and the setup was easy. "
+    "Support was slow and the manual is a waste of money. "
+) * 40
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Result cache benchmark')
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--latency-ms', type=float, default=150.0,
+                        help='Mock API latency per request')
+    parser.add_argument('--no-disk', action='store_true',
+                        help='Benchmark the in-memory tier only')
+    args = parser.parse_args()
+
+    # Isolated cache for the run; the disk tier lives in a throwaway file
+    Config.RESULT_CACHE_DB_PATH = '' if args.no_disk else os.path.join(
+        tempfile.mkdtemp(prefix='bench-cache-'), 'results.sqlite3')
+
+    from app.utils.result_cache import get_result_cache
+    from app.utils.sentiment_analyzer import analyze_sentiment_with_detailed_insights
+
+    with MockGoogleNLServer(latency_ms=args.latency_ms) as server:
+        Config.GOOGLE_NL_BASE_URL = server.base_url
+
+        start = time.perf_counter()
+        analyze_sentiment_with_detailed_insights(TEXT, 'bench-key')
+        first_ms = (time.perf_counter() - start) * 1000
+
+        samples = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            analyze_sentiment_with_detailed_insights(TEXT, 'bench-key')
+            samples.append((time.perf_counter() - start) * 1000)
+
+        print(f"first upload        {first_ms:8.2f} ms")
+        print(f"repeat upload p50   {statistics.median(samples):8.2f} ms")
+
+        cache = get_result_cache()
+        if cache.disk is not None:
+            # A fresh worker process only sees the shared disk tier
+            cache.memory.clear()
+            start = time.perf_counter()
+            analyze_sentiment_with_detailed_insights(TEXT, 'bench-key')
+            disk_ms = (time.perf_counter() - start) * 1000
+            print(f"disk tier hit       {disk_ms:8.2f} ms")
+
+        print(f"upstream requests   {server.stats['requests']}")
+        print(f"cache stats         {cache.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+"""
+Sentiment Score Mapping Benchmark
+Compares the mapping _process_sentiment_response used to do with the current
+Config-driven routines, one response at a time and in bulk, and checks they
+agree.
+
+Usage:
+    python -m benchmarks.bench_score_mapping --responses 10000 --sentences 20
+"""
+
+import argparse
+import random
+import time
+
+from app.utils.scoring import process_sentiment_response, process_sentiment_responses
+
+
+def legacy_process(api_response):
+    """The previous scalar implementation, with its literal thresholds."""
+    document_sentiment = api_response.get('documentSentiment', {})
+    doc_score = float(document_sentiment.get('score', 0))
+    doc_magnitude = float(document_sentiment.get('magnitude', 0))
+
+    if abs(doc_score) < 0.01 and 'sentences' in api_response:
+        sentence_scores = []
+        for sentence in api_response['sentences']:
+            sent_score = sentence.get('sentiment', {}).get('score', 0)
+            if sent_score != 0:
+                sentence_scores.append(float(sent_score))
+        if sentence_scores:
+            doc_score = sum(sentence_scores) / len(sentence_scores)
+
+    if doc_score > 0.02:
+        overall_sentiment = "Positive"
+        positive_percentage = 60 + (doc_score * 200)
+        negative_percentage = 40 - (doc_score * 200)
+    elif doc_score < -0.02:
+        overall_sentiment = "Negative"
+        positive_percentage = 40 + (doc_score * 200)
+        negative_percentage = 60 - (doc_score * 200)
+    else:
+        overall_sentiment = "Neutral"
+        positive_percentage = 50 + (doc_score * 100)
+        negative_percentage = 50 - (doc_score * 100)
+
+    positive_percentage = max(5, min(95, positive_percentage))
+    negative_percentage = max(5, min(95, negative_percentage))
+    neutral_percentage = max(0, 100 - positive_percentage - negative_percentage)
+
+    return {
+        'overall_sentiment': overall_sentiment,
+        'positive_percentage': round(positive_percentage, 1),
+        'negative_percentage': round(negative_percentage, 1),
+        'neutral_percentage': round(neutral_percentage, 1),
+        'confidence_score': round(abs(doc_score), 3),
+        'magnitude': round(doc_magnitude, 3),
+        'google_raw_score': doc_score
+    }
+
+
+def make_responses(count, sentences, seed=0):
+    """Random responses; a fifth have a zero document score to hit the sentence fallback."""
+    rng = random.Random(seed)
+    responses = []
+    for _ in range(count):
+        score = 0.0 if rng.random() < 0.2 else round(rng.uniform(-1, 1), 2)
+        responses.append({
+            'documentSentiment': {'score': score, 'magnitude': round(rng.uniform(0, 10), 2)},
+            'sentences': [{'sentiment': {'score': round(rng.uniform(-1, 1), 1)}}
+                          for _ in range(sentences)]
+        })
+    return responses
+
+
+def best_of(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sentiment score mapping benchmark')
+    parser.add_argument('--responses', type=int, default=10000)
+    parser.add_argument('--sentences', type=int, default=20, help='Sentences per response')
+    args = parser.parse_args()
+
+    responses = make_responses(args.responses, args.sentences)
+
+    legacy, legacy_time = best_of(lambda: [legacy_process(response) for response in responses])
+    single, single_time = best_of(lambda: [process_sentiment_response(response) for response in responses])
+    bulk, bulk_time = best_of(lambda: process_sentiment_responses(responses))
+    assert legacy == single == bulk, 'mapping differs from the legacy implementation'
+
+    print(f"{args.responses} responses x {args.sentences} sentences")
+    for label, elapsed in (('legacy loop', legacy_time), ('current, one at a time', single_time),
+                           ('current, bulk', bulk_time)):
+        print(f"{label:<26} {elapsed * 1000:9.1f} ms {args.responses / elapsed:12.0f} responses/s")
+
+    # One merged chunked-document response with many sentences
+    merged = {'documentSentiment': {'score': 0.0, 'magnitude': 500.0},
+              'sentences': [sentence for response in responses for sentence in response['sentences']]}
+    legacy_result, legacy_time = best_of(lambda: legacy_process(merged))
+    result, elapsed = best_of(lambda: process_sentiment_response(merged))
+    assert abs(legacy_result['google_raw_score'] - result['google_raw_score']) < 1e-9
+    print(f"merged document, {len(merged['sentences'])} sentences: "
+          f"legacy {legacy_time * 1000:.1f} ms, current {elapsed * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
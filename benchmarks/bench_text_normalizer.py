@@ -0,0 +1,80 @@
+"""
+Text Normalization Microbenchmark
+Compares the per-character generator ASCII filter and isalnum count that the
+analyzer and PDF processor used with app.utils.text_normalizer on
+multi-megabyte text.
+
+Usage:
+    python -m benchmarks.bench_text_normalizer --megabytes 4 --non-ascii 0.02
+"""
+
+import argparse
+import random
+import time
+
+from app.utils.text_normalizer import count_alnum, fold_to_ascii, normalize_text
+from benchmarks.synthetic_pdf import make_sentences
+
+ACCENTED = 'éèêàçüöäñøß’“”—…'
+
+
+def legacy_filter(text):
+    return ''.join(char for char in text if ord(char) < 128)
+
+
+def legacy_count(text):
+    return sum(1 for char in text if char.isalnum())
+
+
+def make_text(megabytes, non_ascii, seed=0):
+    """Sentence text of roughly ``megabytes`` MB with a share of accented characters."""
+    rng = random.Random(seed)
+    text = list(' '.join(make_sentences(rng, int(megabytes * 1e6 / 60))))
+    for position in rng.sample(range(len(text)), int(len(text) * non_ascii)):
+        text[position] = rng.choice(ACCENTED)
+    return ''.join(text)
+
+
+def timed(func, *args, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Text normalization microbenchmark')
+    parser.add_argument('--megabytes', type=float, default=4.0)
+    parser.add_argument('--non-ascii', default='0,0.002,0.02',
+                        help='Comma-separated fractions of characters replaced with accented ones')
+    args = parser.parse_args()
+
+    for ratio in (float(value) for value in args.non_ascii.split(',')):
+        text = make_text(args.megabytes, ratio)
+        print(f"{len(text) / 1e6:.1f}M characters, {ratio:.1%} non-ASCII")
+
+        legacy, legacy_time = timed(legacy_filter, text)
+        dropped, elapsed = timed(fold_to_ascii, text, False)
+        assert dropped == legacy, 'fold_to_ascii(transliterate=False) differs from the generator'
+        _, fold_time = timed(fold_to_ascii, text)
+        legacy_total, count_legacy_time = timed(legacy_count, text)
+        total, count_time = timed(count_alnum, text)
+        assert total == legacy_total, 'count_alnum differs from the isalnum loop'
+        _, normalize_time = timed(normalize_text, text)
+
+        for name, seconds, baseline in (
+                ('filter: generator', legacy_time, None),
+                ('filter: encode/ignore', elapsed, legacy_time),
+                ('fold: transliterate', fold_time, legacy_time),
+                ('count: isalnum loop', count_legacy_time, None),
+                ('count: count_alnum', count_time, count_legacy_time),
+                ('normalize_text (+collapse)', normalize_time, legacy_time)):
+            speedup = f'{baseline / seconds:8.1f}x' if baseline and seconds else ''
+            print(f"  {name:<28} {seconds * 1000:9.2f} ms {speedup}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Upload Memory Benchmark
+Posts several large PDFs to /analyze at once through the Flask test client
+and reports the peak Python heap (tracemalloc) and the process peak RSS
+while they are ingested and parsed.
+
+Usage:
+    python -m benchmarks.bench_upload_memory --uploads 8 --pages 20 --image-mb 24
+"""
+
+import argparse
+import io
+import resource
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.synthetic_pdf import generate_pdf
+from config.settings import Config
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Upload memory benchmark')
+    parser.add_argument('--uploads', type=int, default=8, help='Concurrent uploads')
+    parser.add_argument('--pages', type=int, default=20, help='Pages of text per PDF')
+    parser.add_argument('--image-mb', type=float, default=24.0, help='Image data per PDF')
+    args = parser.parse_args()
+
+    # Parsing must not be skipped, and scoring stays local
+    Config.PDF_CACHE_DB_PATH = ''
+    Config.RESULT_CACHE_ENABLED = False
+    Config.PDF_PARALLEL_WORKERS = 1
+    Config.UPLOAD_FOLDER = tempfile.mkdtemp()
+
+    from app.main import create_app
+
+    app = create_app()
+    documents = [generate_pdf(args.pages, seed=number, image_bytes=int(args.image_mb * 1024 * 1024))
+                 for number in range(args.uploads)]
+    size = sum(len(data) for data in documents)
+
+    def upload(data):
+        with app.test_client() as client:
+            response = client.post('/analyze', content_type='multipart/form-data',
+                                   data={'backend': 'local', 'pdf_file': (io.BytesIO(data), 'doc.pdf')})
+            return response.get_json()
+
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.uploads) as executor:
+        results = list(executor.map(upload, documents))
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+
+    errors = [result['error'] for result in results if 'error' in result]
+    if errors:
+        raise SystemExit(errors[0])
+    print(f"{args.uploads} uploads of {size / args.uploads / 1e6:.1f} MB: {elapsed:.2f} s, "
+          f"peak heap {peak / 1e6:.1f} MB, peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,168 @@
+"""
+Async Serving Load Test
+Fires hundreds of concurrent /analyze uploads, each a distinct synthetic PDF,
+at the ASGI application (uvicorn, one process) and at the WSGI application
+on a fixed pool of threads like a gunicorn gthread worker. Both talk to the
+mock API, so every analysis spends most of its time waiting on the network.
+
+Reports throughput, latency percentiles, errors and the most API calls the
+mock saw in flight at once, which is how many analyses the server kept
+going concurrently.
+
+Usage:
+    python -m benchmarks.load_test_async --requests 400 --concurrency 200 --latency-ms 300
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from socketserver import ThreadingMixIn
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from benchmarks.mock_google_nl import MockGoogleNLServer
+from benchmarks.synthetic_pdf import generate_pdf
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class PooledWSGIServer(ThreadingMixIn, WSGIServer):
+    """WSGI server handling requests on a fixed number of threads."""
+
+    request_queue_size = 1024
+    threads = 8
+
+    def process_request(self, request, client_address):
+        if not hasattr(self, 'pool'):
+            self.pool = ThreadPoolExecutor(max_workers=self.threads)
+        self.pool.submit(self.process_request_thread, request, client_address)
+
+
+def serve_wsgi(port, threads):
+    """Serve the Flask app on ``threads`` threads (run in a child process)."""
+    from app.main import create_app
+
+    PooledWSGIServer.threads = threads
+    server = make_server('127.0.0.1', port, create_app(), server_class=PooledWSGIServer,
+                         handler_class=_QuietHandler)
+    server.serve_forever()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def start_server(kind, port, args, environ):
+    """Start the server under test in a child process and wait until it accepts requests."""
+    if kind == 'asgi':
+        command = [sys.executable, '-m', 'uvicorn', 'app.asgi:application', '--port', str(port),
+                   '--log-level', 'warning', '--no-access-log', '--backlog', '2048']
+    else:
+        command = [sys.executable, '-m', 'benchmarks.load_test_async', '--serve-wsgi', str(port),
+                   '--wsgi-threads', str(args.wsgi_threads)]
+    process = subprocess.Popen(command, env=environ)
+
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise SystemExit(f'{kind} server did not start')
+
+
+async def fire(url, documents, concurrency):
+    """Upload every document with at most ``concurrency`` requests open; returns (seconds, latencies, errors)."""
+    import httpx
+
+    slots = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=300) as client:
+        async def upload(number, data):
+            async with slots:
+                start = time.perf_counter()
+                try:
+                    response = await client.post(url, files={'pdf_file': (f'doc{number}.pdf', data, 'application/pdf')},
+                                                 data={'api_key': 'load-test-key', 'backend': 'google'})
+                    body = response.json()
+                    if 'error' in body:
+                        errors.append(body['error'])
+                except httpx.HTTPError as e:
+                    errors.append(repr(e))
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(upload(number, data) for number, data in enumerate(documents)))
+        return time.perf_counter() - start, latencies, errors
+
+
+def run(kind, label, documents, args, server, environ):
+    port = _free_port()
+    process = start_server(kind, port, args, environ)
+    try:
+        server.stats['max_in_flight'] = 0
+        elapsed, latencies, errors = asyncio.run(fire(f'http://127.0.0.1:{port}/analyze', documents,
+                                                      args.concurrency))
+    finally:
+        process.terminate()
+        process.wait()
+
+    print(f"{label:<26} {len(documents) / elapsed:8.1f} req/s {_percentile(latencies, 0.5) * 1000:8.0f} "
+          f"{_percentile(latencies, 0.95) * 1000:8.0f} {max(latencies) * 1000:8.0f} ms "
+          f"{len(errors):6d} errors {server.stats['max_in_flight']:6d} in flight")
+    if errors:
+        print(f"    first error: {errors[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Async serving load test')
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=200, help='Open client requests')
+    parser.add_argument('--latency-ms', type=float, default=300.0, help='Mock API latency per call')
+    parser.add_argument('--pages', type=int, default=2, help='Pages per synthetic PDF')
+    parser.add_argument('--wsgi-threads', type=int, default=8, help='Threads of the WSGI server')
+    parser.add_argument('--only', choices=('asgi', 'wsgi'), help='Test one server')
+    parser.add_argument('--serve-wsgi', type=int, metavar='PORT', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_wsgi:
+        serve_wsgi(args.serve_wsgi, args.wsgi_threads)
+        return
+
+    documents = [generate_pdf(args.pages, seed=number) for number in range(args.requests)]
+
+    with MockGoogleNLServer(latency_ms=args.latency_ms) as server:
+        # Every upload must be parsed and scored; nothing may be served from a cache
+        environ = dict(os.environ, GOOGLE_NL_BASE_URL=server.base_url, RESULT_CACHE_ENABLED='false',
+                       PDF_CACHE_DB_PATH='', GOOGLE_API_QPS='0', SENTIMENT_FALLBACK_BACKEND='')
+        print(f"{args.requests} uploads of {args.pages} pages, {args.concurrency} concurrent, "
+              f"API latency {args.latency_ms:g} ms")
+        print(f"{'server':<26} {'':>14} {'p50':>8} {'p95':>8} {'max':>8}")
+
+        if args.only in (None, 'wsgi'):
+            run('wsgi', f'WSGI, {args.wsgi_threads} threads', documents, args, server, environ)
+        if args.only in (None, 'asgi'):
+            run('asgi', 'ASGI (uvicorn)', documents, args, server, environ)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,243 @@
+"""
+Mock Google Natural Language API
+Local stand-in for language.googleapis.com used by the benchmarks.
+
+Serves ``documents:analyzeSentiment``, ``documents:analyzeEntitySentiment``
+and ``documents:annotateText`` over HTTP/1.1 with keep-alive. Scores are derived deterministically from the
+document content. ``connect_delay_ms`` is paid once per new TCP connection to
+emulate TCP/TLS handshake round-trips; ``latency_ms`` is paid per request.
+With ``quota_qps``, requests beyond that rate per API key are refused with
+429 and a Retry-After header, like the real per-minute quota. With
+``error_rate``, that fraction of requests fails with ``error_status`` (503 by
+default) after the usual latency, chosen by a generator seeded with ``seed``
+so a run can be repeated.
+
+Usage:
+    python -m benchmarks.mock_google_nl --port 8765 --latency-ms 20 --error-rate 0.05
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_SENTENCE_PATTERN = re.compile(r'[^.!?]+[.!?]*')
+_ENTITY_PATTERN = re.compile(r'\b[A-Z][a-z]{2,}\b')
+
+
+def _score(text):
+    """Deterministic pseudo-score in [-1, 1] for a piece of text."""
+    return round((zlib.crc32(text.encode('utf-8')) % 2001) / 1000.0 - 1.0, 3)
+
+
+def sentiment_response(content):
+    sentences = []
+    for match in _SENTENCE_PATTERN.finditer(content):
+        sentence = match.group().strip()
+        if sentence:
+            score = _score(sentence)
+            sentences.append({
+                'text': {'content': sentence, 'beginOffset': match.start()},
+                'sentiment': {'score': score, 'magnitude': abs(score)}
+            })
+    score = _score(content)
+    return {
+        'documentSentiment': {'score': score, 'magnitude': round(abs(score) * 2, 3)},
+        'language': 'en',
+        'sentences': sentences
+    }
+
+
+def entity_response(content):
+    entities = []
+    for name in sorted(set(_ENTITY_PATTERN.findall(content)))[:20]:
+        score = _score(name)
+        entities.append({
+            'name': name,
+            'type': 'OTHER',
+            'salience': 0.1,
+            'sentiment': {'score': score, 'magnitude': abs(score)}
+        })
+    return {'entities': entities, 'language': 'en'}
+
+
+def annotate_response(content, features):
+    response = {'language': 'en', 'sentences': [], 'tokens': [], 'entities': []}
+    if features.get('extractDocumentSentiment'):
+        response.update(sentiment_response(content))
+    if features.get('extractEntitySentiment') or features.get('extractEntities'):
+        response['entities'] = entity_response(content)['entities']
+    return response
+
+
+class MockGoogleNLHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.stats['connections'] += 1
+        if self.server.connect_delay:
+            time.sleep(self.server.connect_delay)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _inject_error(self):
+        with self.server.quota_lock:
+            return self.server.error_rng.random() < self.server.error_rate
+
+    def _over_quota(self):
+        # One token bucket per API key, refilled at quota_qps and holding one second's worth
+        key = self.path.partition('key=')[2]
+        with self.server.quota_lock:
+            now = time.monotonic()
+            tokens, updated = self.server.quota_buckets.get(key, (self.server.quota_qps, now))
+            tokens = min(self.server.quota_qps, tokens + (now - updated) * self.server.quota_qps)
+            if tokens < 1:
+                self.server.quota_buckets[key] = (tokens, now)
+                return True
+            self.server.quota_buckets[key] = (tokens - 1, now)
+            return False
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length)
+        self.server.stats['requests'] += 1
+
+        if self.server.quota_qps and self._over_quota():
+            self.server.stats['throttled'] += 1
+            data = json.dumps({'error': {'code': 429, 'message': 'Quota exceeded'}}).encode('utf-8')
+            self.send_response(429)
+            self.send_header('Retry-After', '1')
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+
+        if self.server.latency:
+            # Track how many calls are waiting at once, i.e. how many the client has in flight
+            with self.server.quota_lock:
+                self.server.stats['in_flight'] += 1
+                self.server.stats['max_in_flight'] = max(self.server.stats['max_in_flight'],
+                                                         self.server.stats['in_flight'])
+            time.sleep(self.server.latency)
+            with self.server.quota_lock:
+                self.server.stats['in_flight'] -= 1
+
+        if self.server.error_rate and self._inject_error():
+            self.server.stats['errors'] += 1
+            status = self.server.error_status
+            self._send_json(status, {'error': {'code': status, 'message': 'Injected failure'}})
+            return
+
+        try:
+            content = json.loads(body)['document']['content']
+        except (ValueError, KeyError, TypeError):
+            self._send_json(400, {'error': {'code': 400, 'message': 'Invalid document'}})
+            return
+
+        method = self.path.split('?', 1)[0].rsplit(':', 1)[-1]
+        if method == 'analyzeSentiment':
+            self._send_json(200, sentiment_response(content))
+        elif method == 'analyzeEntitySentiment':
+            self._send_json(200, entity_response(content))
+        elif method == 'annotateText':
+            self._send_json(200, annotate_response(content, json.loads(body).get('features', {})))
+        else:
+            self._send_json(404, {'error': {'code': 404, 'message': f'Unknown method {method}'}})
+
+
+class _MockHTTPServer(ThreadingHTTPServer):
+    # Load tests open hundreds of connections at once
+    request_queue_size = 1024
+
+
+class MockGoogleNLServer:
+    """
+    Threaded mock server that can be used as a context manager.
+
+    ``base_url`` is suitable for ``Config.GOOGLE_NL_BASE_URL``.
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, latency_ms=0.0, connect_delay_ms=0.0, quota_qps=0.0,
+                 error_rate=0.0, error_status=503, seed=0):
+        self.httpd = _MockHTTPServer((host, port), MockGoogleNLHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.latency = latency_ms / 1000.0
+        self.httpd.connect_delay = connect_delay_ms / 1000.0
+        self.httpd.quota_qps = quota_qps
+        self.httpd.quota_buckets = {}
+        self.httpd.quota_lock = threading.Lock()
+        self.httpd.error_rate = error_rate
+        self.httpd.error_status = error_status
+        self.httpd.error_rng = random.Random(seed)
+        self.httpd.stats = {'connections': 0, 'requests': 0, 'throttled': 0, 'errors': 0,
+                            'in_flight': 0, 'max_in_flight': 0}
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    @property
+    def stats(self):
+        return self.httpd.stats
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Mock Google Natural Language API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help='Delay added to every request')
+    parser.add_argument('--connect-delay-ms', type=float, default=0.0,
+                        help='Delay added once per new connection')
+    parser.add_argument('--quota-qps', type=float, default=0.0,
+                        help='Requests per second per API key before 429s (0: unlimited)')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='Fraction of requests that fail with --error-status')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--seed', type=int, default=0, help='Seed for choosing failed requests')
+    args = parser.parse_args()
+
+    server = MockGoogleNLServer(args.host, args.port, args.latency_ms, args.connect_delay_ms, args.quota_qps,
+                                args.error_rate, args.error_status, args.seed)
+    print(f"Mock Google NL API listening on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
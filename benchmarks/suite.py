@@ -0,0 +1,259 @@
+"""
+Benchmark Suite
+Repeatable performance run with machine-readable results.
+
+Builds a seeded synthetic PDF corpus, times the hot functions of the
+pipeline (text extraction through AnalysisPipeline.extract and normalise,
+analyze_word_level_sentiment and _process_sentiment_response) and measures
+end-to-end /analyze throughput and latency percentiles. The end-to-end run serves the WSGI app on a pool of
+threads in a child process, talking to the mock API with the given latency
+and injected error rate; caches and the rate limiter are off, so every
+request does the full work.
+
+Results are written as JSON. Given a baseline (the results of an earlier
+run on the same machine), every metric is compared with it and the exit
+status is 1 if any got worse by more than the tolerance.
+
+Usage:
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --output results.json
+    python -m benchmarks.suite --only e2e --latency-ms 100 --error-rate 0.02
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import timeit
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.load_test_async import _free_port, _percentile, start_server
+from benchmarks.mock_google_nl import MockGoogleNLServer, sentiment_response
+from benchmarks.synthetic_pdf import generate_pdf
+from config.settings import Config
+
+LOWER = 'lower'
+HIGHER = 'higher'
+
+
+def _metric(value, unit, better):
+    return {'value': round(value, 6), 'unit': unit, 'better': better}
+
+
+def build_corpus(page_counts, lines_per_page, image_kb, seed):
+    """Synthetic PDFs keyed by label, e.g. ``{'20p': b'%PDF...'}``."""
+    return {f'{pages}p': generate_pdf(pages, lines_per_page, seed + index, int(image_kb * 1024))
+            for index, pages in enumerate(page_counts)}
+
+
+def time_call(func, repeat):
+    """Median seconds per call of ``func``, over ``repeat`` runs of at least 0.2 s each."""
+    func()  # Warm up imports, the lexicon index and the like
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return statistics.median(timer.repeat(repeat, number)) / number
+
+
+def run_micro(corpus, args):
+    """Per-function timings for every document of the corpus."""
+    from app.engine import AnalysisPipeline
+    from app.utils.sentiment_analyzer import _process_sentiment_response, analyze_word_level_sentiment
+
+    pipeline = AnalysisPipeline()
+
+    def extract_text(data):
+        return pipeline.normalise(pipeline.extract(io.BytesIO(data)))
+
+    metrics = {}
+    for label, data in corpus.items():
+        text = extract_text(data)
+        response = sentiment_response(text)
+
+        timings = {
+            'extract_text': lambda: extract_text(data),
+            'analyze_word_level_sentiment': lambda: analyze_word_level_sentiment(text),
+            '_process_sentiment_response': lambda: _process_sentiment_response(response, text),
+        }
+        for name, func in timings.items():
+            seconds = time_call(func, args.repeat)
+            metrics[f'micro.{name}[{label}]'] = _metric(seconds * 1000, 'ms', LOWER)
+            print(f"{name + ' [' + label + ']':<44} {seconds * 1000:10.3f} ms")
+    return metrics
+
+
+def run_e2e(args):
+    """Throughput and latency of /analyze over HTTP, with the API mocked."""
+    import requests
+
+    documents = [generate_pdf(args.e2e_pages, args.lines, args.seed + 1000 + number, int(args.image_kb * 1024))
+                 for number in range(args.requests)]
+    sessions = threading.local()
+
+    with MockGoogleNLServer(latency_ms=args.latency_ms, error_rate=args.error_rate, seed=args.seed) as server:
+        # No caches, limiter or fallback: every request reaches the mock and its failures show
+        environ = dict(os.environ, GOOGLE_NL_BASE_URL=server.base_url, RESULT_CACHE_ENABLED='false',
+                       PDF_CACHE_DB_PATH='', GOOGLE_API_QPS='0', SENTIMENT_FALLBACK_BACKEND='',
+                       METRICS_DIR='', ANALYSIS_INSIGHTS=args.insights)
+        port = _free_port()
+        url = f'http://127.0.0.1:{port}/analyze'
+        process = start_server('wsgi', port, args, environ)
+
+        def upload(number, data):
+            if not hasattr(sessions, 'session'):
+                sessions.session = requests.Session()
+            start = time.perf_counter()
+            try:
+                response = sessions.session.post(
+                    url, files={'pdf_file': (f'doc{number}.pdf', data, 'application/pdf')},
+                    data={'api_key': 'bench-key', 'backend': 'google'}, timeout=300)
+                failed = response.status_code != 200 or 'error' in response.json()
+            except (requests.RequestException, ValueError):
+                failed = True
+            return time.perf_counter() - start, failed
+
+        try:
+            upload(-1, documents[0])  # Warm up the server's imports
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+                outcomes = list(executor.map(upload, range(len(documents)), documents))
+            elapsed = time.perf_counter() - start
+        finally:
+            process.terminate()
+            process.wait()
+
+    latencies = [seconds for seconds, _ in outcomes]
+    failures = sum(1 for _, failed in outcomes if failed)
+    metrics = {
+        'e2e.analyze.throughput': _metric(len(documents) / elapsed, 'req/s', HIGHER),
+        'e2e.analyze.p50': _metric(_percentile(latencies, 0.50) * 1000, 'ms', LOWER),
+        'e2e.analyze.p95': _metric(_percentile(latencies, 0.95) * 1000, 'ms', LOWER),
+        'e2e.analyze.p99': _metric(_percentile(latencies, 0.99) * 1000, 'ms', LOWER),
+        # Depends on the injected error rate and retry timing, so it is reported, not compared
+        'e2e.analyze.failed_requests': _metric(failures, 'requests', None),
+        'e2e.mock.injected_errors': _metric(server.stats['errors'], 'responses', None),
+    }
+    for name, metric in metrics.items():
+        print(f"{name:<44} {metric['value']:10.3f} {metric['unit']}")
+    return metrics
+
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print each metric against the baseline.
+
+    Returns:
+        list: Names of the metrics that got worse by more than ``tolerance``
+    """
+    if baseline['environment'].get('machine') != results['environment'].get('machine'):
+        print('warning: the baseline was recorded on a different machine')
+    changed = sorted(name for name, value in results['parameters'].items()
+                     if name not in ('only', 'tolerance') and baseline['parameters'].get(name) != value)
+    if changed:
+        print(f"warning: the baseline was run with different {', '.join(changed)}")
+
+    regressions = []
+    print(f"\n{'metric':<44} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, metric in results['metrics'].items():
+        base = baseline['metrics'].get(name)
+        if base is None:
+            print(f"{name:<44} {'-':>10} {metric['value']:10.3f} {'new':>8}")
+            continue
+        if not metric['better'] or not base['value']:
+            print(f"{name:<44} {base['value']:10.3f} {metric['value']:10.3f} {'':>8}")
+            continue
+
+        change = (metric['value'] - base['value']) / base['value']
+        worse = change > tolerance if metric['better'] == LOWER else change < -tolerance
+        if worse:
+            regressions.append(name)
+        print(f"{name:<44} {base['value']:10.3f} {metric['value']:10.3f} {change:+8.1%}"
+              f"{'  REGRESSION' if worse else ''}")
+    return regressions
+
+
+def _write_json(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as handle:
+        json.dump(data, handle, indent=2, sort_keys=True)
+        handle.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark suite')
+    parser.add_argument('--only', choices=('micro', 'e2e'), help='Run one part of the suite')
+    parser.add_argument('--output', default='bench_results.json', help='Where to write the results')
+    parser.add_argument('--baseline', help='Results of an earlier run to compare with')
+    parser.add_argument('--save-baseline', metavar='PATH', help='Also write the results here')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Relative change counted as a regression')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the corpus and injected errors')
+    parser.add_argument('--pages', default='2,20,100', help='Comma-separated page counts of the corpus')
+    parser.add_argument('--lines', type=int, default=40, help='Text lines per page')
+    parser.add_argument('--image-kb', type=float, default=0.0, help='Non-text data added to each PDF')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing runs per microbenchmark')
+    parser.add_argument('--requests', type=int, default=200, help='End-to-end uploads')
+    parser.add_argument('--concurrency', type=int, default=8, help='Uploads in flight at once')
+    parser.add_argument('--e2e-pages', type=int, default=5, help='Pages per end-to-end upload')
+    parser.add_argument('--insights', default='none', choices=('none', 'words', 'detailed'))
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Mock API latency per call')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of mock API calls that fail')
+    parser.add_argument('--wsgi-threads', type=int, default=8, help='Threads of the server under test')
+    args = parser.parse_args()
+
+    # Time the work itself, not cache hits
+    Config.RESULT_CACHE_ENABLED = False
+    Config.PDF_CACHE_DB_PATH = ''
+
+    results = {
+        'environment': {
+            'python': platform.python_version(),
+            'machine': f'{platform.node()} {platform.machine()} {os.cpu_count()} CPUs',
+            'platform': platform.platform(),
+            'revision': _git_revision(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        },
+        'parameters': {name: value for name, value in vars(args).items()
+                       if name not in ('output', 'baseline', 'save_baseline')},
+        'metrics': {},
+    }
+
+    if args.only in (None, 'micro'):
+        corpus = build_corpus([int(pages) for pages in args.pages.split(',')], args.lines, args.image_kb,
+                              args.seed)
+        results['metrics'].update(run_micro(corpus, args))
+    if args.only in (None, 'e2e'):
+        results['metrics'].update(run_e2e(args))
+
+    _write_json(args.output, results)
+    print(f"\nResults written to {args.output}")
+    if args.save_baseline:
+        _write_json(args.save_baseline, results)
+        print(f"Baseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as handle:
+            baseline = json.load(handle)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+Synthetic PDF Generator
+Writes text-only PDFs of configurable size for benchmarks.
+
+The generator emits PDF syntax directly (one Helvetica content stream per
+page), so it needs no PDF-writing dependency and PyPDF2 can extract the text
+back out.
+
+Usage:
+    python -m benchmarks.synthetic_pdf out.pdf --pages 1000 --lines 40 --image-kb 512
+"""
+
+import argparse
+import io
+import random
+
+WORDS = (
+    'the product service team report quarter growth customer support release '
+    'update quality price value delivery market result performance feature '
+    'excellent great good reliable easy impressive recommend satisfied '
+    'poor bad terrible broken difficult disappointed problem issue waste slow'
+).split()
+
+
+def make_sentences(rng, count):
+    """Generate ``count`` short pseudo-English sentences."""
+    sentences = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(6, 12))]
+        sentences.append(' '.join(words).capitalize() + '.')
+    return sentences
+
+
+def _escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def build_pdf(pages, image_bytes=0):
+    """
+    Build a PDF document from a list of pages.
+
+    Args:
+        pages (list): One list of text lines per page
+        image_bytes (int): Size of an unreferenced binary stream added to
+            the file, standing in for the images that make real PDFs large
+
+    Returns:
+        bytes: The complete PDF file
+    """
+    page_count = len(pages)
+    font_id = 3
+    first_page_id = 4
+    objects = {
+        1: b'<< /Type /Catalog /Pages 2 0 R >>',
+        font_id: b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>',
+    }
+    kids = []
+    for index, lines in enumerate(pages):
+        page_id = first_page_id + index * 2
+        content_id = page_id + 1
+        kids.append(f'{page_id} 0 R')
+
+        stream = io.StringIO()
+        stream.write('BT /F1 10 Tf 14 TL 50 780 Td\n')
+        for line in lines:
+            stream.write(f'({_escape(line)}) Tj T*\n')
+        stream.write('ET')
+        content = stream.getvalue().encode('latin-1', 'replace')
+
+        objects[page_id] = (
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            f'/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>'
+        ).encode('ascii')
+        objects[content_id] = (f'<< /Length {len(content)} >>\nstream\n'.encode('ascii')
+                               + content + b'\nendstream')
+    objects[2] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {page_count} >>'.encode('ascii')
+    if image_bytes:
+        objects[max(objects) + 1] = (f'<< /Length {image_bytes} >>\nstream\n'.encode('ascii')
+                                     + bytes(image_bytes) + b'\nendstream')
+
+    output = io.BytesIO()
+    output.write(b'%PDF-1.4\n')
+    offsets = {}
+    for object_id in sorted(objects):
+        offsets[object_id] = output.tell()
+        output.write(f'{object_id} 0 obj\n'.encode('ascii'))
+        output.write(objects[object_id])
+        output.write(b'\nendobj\n')
+
+    xref_offset = output.tell()
+    size = max(objects) + 1
+    output.write(f'xref\n0 {size}\n0000000000 65535 f \n'.encode('ascii'))
+    for object_id in range(1, size):
+        output.write(f'{offsets[object_id]:010d} 00000 n \n'.encode('ascii'))
+    output.write(f'trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n'.encode('ascii'))
+    return output.getvalue()
+
+
+def generate_pdf(page_count=10, lines_per_page=40, seed=0, image_bytes=0):
+    """Generate a synthetic PDF with ``page_count`` pages of random sentences."""
+    rng = random.Random(seed)
+    return build_pdf([make_sentences(rng, lines_per_page) for _ in range(page_count)], image_bytes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic PDF')
+    parser.add_argument('output', help='Path of the PDF to write')
+    parser.add_argument('--pages', type=int, default=10)
+    parser.add_argument('--lines', type=int, default=40, help='Text lines per page')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--image-kb', type=float, default=0.0, help='Non-text data added to the file')
+    args = parser.parse_args()
+
+    with open(args.output, 'wb') as handle:
+        handle.write(generate_pdf(args.pages, args.lines, args.seed, int(args.image_kb * 1024)))
+
+
+if __name__ == '__main__':
+    main()
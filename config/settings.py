@@ -17,20 +17,118 @@ class Config:
     DEBUG = os.environ.get('DEBUG', 'True').lower() == 'true'
     
     # File Upload Settings
-    MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
-    UPLOAD_FOLDER = os.path.join(BASE_DIR, 'uploads')
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', 64 * 1024 * 1024))  # 64MB max request size
+    UPLOAD_FOLDER = os.environ.get('UPLOAD_FOLDER', os.path.join(BASE_DIR, 'uploads'))  # Spilled uploads (see app.utils.uploads)
+    UPLOAD_SPOOL_MAX_MEMORY = int(os.environ.get('UPLOAD_SPOOL_MAX_MEMORY', 512 * 1024))  # Larger uploads go to disk
     ALLOWED_EXTENSIONS = {'pdf'}
     
     # API Settings
     GOOGLE_CLOUD_API_URL = "https://language.googleapis.com/v1/documents:analyzeSentiment"
-    MAX_TEXT_LENGTH = 1000  # Maximum text length for API processing
+    MAX_TEXT_LENGTH = int(os.environ.get('MAX_TEXT_LENGTH', 1000))  # Maximum text length per API request (chunk size)
     MIN_TEXT_LENGTH = 10    # Minimum text length for analysis
+    GOOGLE_NL_BASE_URL = os.environ.get('GOOGLE_NL_BASE_URL', 'https://language.googleapis.com/v1')
+    # 'annotate' fetches document and entity sentiment in one annotateText call;
+    # 'separate' issues analyzeSentiment and analyzeEntitySentiment in parallel
+    GOOGLE_NL_BACKEND = os.environ.get('GOOGLE_NL_BACKEND', 'annotate')
+    
+    # HTTP Client Settings
+    GOOGLE_API_POOL_SIZE = int(os.environ.get('GOOGLE_API_POOL_SIZE', 32))  # Keep-alive connections per host (>= concurrent API threads)
+    GOOGLE_API_CONNECT_TIMEOUT = float(os.environ.get('GOOGLE_API_CONNECT_TIMEOUT', 5))  # seconds
+    GOOGLE_API_READ_TIMEOUT = float(os.environ.get('GOOGLE_API_READ_TIMEOUT', 30))  # seconds
+    GOOGLE_API_MAX_RETRIES = int(os.environ.get('GOOGLE_API_MAX_RETRIES', 3))
+    GOOGLE_API_BACKOFF_FACTOR = float(os.environ.get('GOOGLE_API_BACKOFF_FACTOR', 0.5))
+    
+    # Rate Limit Settings (per API key, shared by every worker through RATE_LIMIT_DB_PATH;
+    # GOOGLE_API_QPS=0 turns the limiter off, an empty path limits each process separately).
+    # On by default: 10/s is the Natural Language API's default quota of 600 requests a minute.
+    # Documents scored in full use one call per FULL_DOCUMENT_CHUNK_LENGTH characters (a
+    # 60-page PDF is ~9 calls, within the burst). Raise it with the quota.
+    GOOGLE_API_QPS = float(os.environ.get('GOOGLE_API_QPS', 10))  # Sustained calls per second
+    GOOGLE_API_BURST = int(os.environ.get('GOOGLE_API_BURST', 10))  # Calls allowed back to back when idle
+    GOOGLE_API_MAX_QUEUE_WAIT = float(os.environ.get('GOOGLE_API_MAX_QUEUE_WAIT', 30))  # seconds
+    GOOGLE_API_MAX_THROTTLE_RETRIES = int(os.environ.get('GOOGLE_API_MAX_THROTTLE_RETRIES', 3))  # Retries after a 429
+    GOOGLE_API_RETRY_BASE_DELAY = float(os.environ.get('GOOGLE_API_RETRY_BASE_DELAY', 1.0))  # seconds, doubled per retry
+    RATE_LIMIT_DB_PATH = os.environ.get('RATE_LIMIT_DB_PATH', os.path.join(BASE_DIR, 'cache', 'rate_limit.sqlite3'))
+    
+    # Concurrency Settings
+    ANALYSIS_FANOUT_WORKERS = int(os.environ.get('ANALYSIS_FANOUT_WORKERS', 16))  # Threads for parallel API calls
+    
+    # Async Serving Settings (app.asgi)
+    ASYNC_HTTP_MAX_CONNECTIONS = int(os.environ.get('ASYNC_HTTP_MAX_CONNECTIONS', 256))  # Open API connections per process
+    ASYNC_HTTP_POOL_SIZE = int(os.environ.get('ASYNC_HTTP_POOL_SIZE', 16))  # Connections per client (see async_http_client)
+    ASYNC_PARSE_WORKERS = int(os.environ.get('ASYNC_PARSE_WORKERS', min(4, os.cpu_count() or 1)))  # Threads parsing PDFs
+    ASYNC_WSGI_THREADS = int(os.environ.get('ASYNC_WSGI_THREADS', 32))  # Threads serving the other Flask routes
+    
+    # Chunked Document Settings (with FULL_DOCUMENT_SENTIMENT, texts longer than
+    # MAX_TEXT_LENGTH are split on sentences and scored in full, not truncated)
+    FULL_DOCUMENT_SENTIMENT = os.environ.get('FULL_DOCUMENT_SENTIMENT', 'True').lower() == 'true'
+    # Characters per chunk request: every chunk is one rate-limited call, so chunks are
+    # much larger than MAX_TEXT_LENGTH (the API accepts documents of up to 1 MB)
+    FULL_DOCUMENT_CHUNK_LENGTH = int(os.environ.get('FULL_DOCUMENT_CHUNK_LENGTH', 20000))
+    CHUNK_MAX_CONCURRENCY = int(os.environ.get('CHUNK_MAX_CONCURRENCY', 8))  # In-flight chunks per document
+    CHUNK_DISPATCH_WORKERS = int(os.environ.get('CHUNK_DISPATCH_WORKERS', 32))  # Threads shared by all documents
+    
+    # Batch Analysis Settings
+    BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', 8))  # Documents analyzed concurrently
+    BATCH_MAX_FILES = int(os.environ.get('BATCH_MAX_FILES', 500))  # PDFs per batch request
     
     # Sentiment Analysis Settings
     POSITIVE_THRESHOLD = 0.02
     NEGATIVE_THRESHOLD = -0.02
     CONFIDENCE_MULTIPLIER = 200
     
+    # Lexicon Settings (LEXICON_SOURCES is an os.pathsep-separated list of
+    # AFINN/VADER-style files; empty means the bundled default lexicon)
+    LEXICON_SOURCES = [path for path in os.environ.get('LEXICON_SOURCES', '').split(os.pathsep) if path]
+    LEXICON_INDEX_PATH = os.environ.get('LEXICON_INDEX_PATH', os.path.join(BASE_DIR, 'cache', 'lexicon.idx'))
+    LEXICON_RELOAD_INTERVAL = float(os.environ.get('LEXICON_RELOAD_INTERVAL', 5))  # seconds
+    
+    # Result Cache Settings (an empty RESULT_CACHE_DB_PATH disables the shared disk tier)
+    RESULT_CACHE_ENABLED = os.environ.get('RESULT_CACHE_ENABLED', 'True').lower() == 'true'
+    RESULT_CACHE_MAX_ENTRIES = int(os.environ.get('RESULT_CACHE_MAX_ENTRIES', 1024))
+    RESULT_CACHE_MAX_BYTES = int(os.environ.get('RESULT_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    RESULT_CACHE_TTL = float(os.environ.get('RESULT_CACHE_TTL', 24 * 3600))  # seconds
+    RESULT_CACHE_DB_PATH = os.environ.get('RESULT_CACHE_DB_PATH', os.path.join(BASE_DIR, 'cache', 'results.sqlite3'))
+    RESULT_CACHE_DISK_MAX_ENTRIES = int(os.environ.get('RESULT_CACHE_DISK_MAX_ENTRIES', 100000))
+    
+    # PDF Extraction Cache Settings (an empty PDF_CACHE_DB_PATH disables it)
+    PDF_CACHE_DB_PATH = os.environ.get('PDF_CACHE_DB_PATH', os.path.join(BASE_DIR, 'cache', 'pdf_extractions.sqlite3'))
+    PDF_CACHE_MAX_ENTRIES = int(os.environ.get('PDF_CACHE_MAX_ENTRIES', 10000))
+    PDF_CACHE_MAX_BYTES = int(os.environ.get('PDF_CACHE_MAX_BYTES', 512 * 1024 * 1024))
+    
+    # Parallel PDF Extraction Settings (documents with at least
+    # PDF_PARALLEL_PAGE_THRESHOLD pages are split across a process pool)
+    PDF_PARALLEL_PAGE_THRESHOLD = int(os.environ.get('PDF_PARALLEL_PAGE_THRESHOLD', 50))
+    PDF_PARALLEL_WORKERS = int(os.environ.get('PDF_PARALLEL_WORKERS', min(4, os.cpu_count() or 1)))
+    
+    # Sentiment Backend Settings ('google' or 'local'; an empty fallback disables it)
+    SENTIMENT_BACKEND = os.environ.get('SENTIMENT_BACKEND', 'google')
+    SENTIMENT_FALLBACK_BACKEND = os.environ.get('SENTIMENT_FALLBACK_BACKEND', 'local')
+    
+    # Bulk CLI Settings (python run.py analyze)
+    CLI_WORKERS = int(os.environ.get('CLI_WORKERS', os.cpu_count() or 1))  # Worker processes
+    CLI_FILE_TIMEOUT = float(os.environ.get('CLI_FILE_TIMEOUT', 300))  # Seconds per file, 0 for none
+    
+    # Analysis Pipeline Settings ('none', 'words' or 'detailed' insights in /analyze results)
+    ANALYSIS_INSIGHTS = os.environ.get('ANALYSIS_INSIGHTS', 'none')
+    
+    # Background Job Settings (uploads wait in JOB_QUEUE_DB_PATH + '-data'; API keys are never stored)
+    JOB_QUEUE_DB_PATH = os.environ.get('JOB_QUEUE_DB_PATH', os.path.join(BASE_DIR, 'cache', 'jobs.sqlite3'))
+    JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))  # Jobs run concurrently per process
+    JOB_POLL_INTERVAL = float(os.environ.get('JOB_POLL_INTERVAL', 1.0))  # Seconds between idle queue checks
+    JOB_RESULT_TTL = int(os.environ.get('JOB_RESULT_TTL', 24 * 60 * 60))  # Finished jobs are kept this long
+    
+    # Metrics Settings (/metrics; an empty METRICS_DIR reports each worker separately)
+    METRICS_DIR = os.environ.get('METRICS_DIR', os.path.join(BASE_DIR, 'cache', 'metrics'))  # Per-worker snapshot files
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 5.0))  # Seconds between snapshot writes
+    
+    # Profiling Settings (opt-in cProfile of /analyze; see app/utils/profiling.py)
+    PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN', '')  # Requests carrying it are profiled; also guards /admin/profiles
+    PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', 0.0))  # Fraction of requests profiled at random
+    PROFILE_MIN_SECONDS = float(os.environ.get('PROFILE_MIN_SECONDS', 1.0))  # Sampled profiles faster than this are dropped
+    PROFILE_DIR = os.environ.get('PROFILE_DIR', os.path.join(BASE_DIR, 'cache', 'profiles'))
+    PROFILE_KEEP = int(os.environ.get('PROFILE_KEEP', 50))  # Newest profiles kept
+    
     # Logging Configuration
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     
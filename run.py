@@ -8,6 +8,7 @@ Usage:
     python run.py --prod            # Run in production mode
     python run.py --host 0.0.0.0    # Run with custom host
     python run.py --port 8080       # Run with custom port
+    python run.py analyze DIR -o results.jsonl  # Analyze every PDF under DIR (see app/cli.py)
 
 Author: [Your Name]
 Created: July 2025
@@ -35,6 +36,11 @@ def parse_arguments():
 
 def main():
     """Main application entry point."""
+    # Bulk analysis runs without starting the server
+    if len(sys.argv) > 1 and sys.argv[1] == 'analyze':
+        from app.cli import main as analyze_main
+        sys.exit(analyze_main(sys.argv[2:]))
+    
     args = parse_arguments()
     
     # Determine configuration
@@ -0,0 +1,9 @@
+"""
+Shared pytest setup: makes the application packages importable when the
+suite is run with a bare ``pytest`` from the repository root.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
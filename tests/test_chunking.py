@@ -0,0 +1,87 @@
+"""
+Tests for merging per-chunk sentiment responses.
+"""
+
+import pytest
+
+from app.utils.chunking import SentimentAccumulator
+
+
+def response(score, magnitude, sentences=()):
+    return {
+        'documentSentiment': {'score': score, 'magnitude': magnitude},
+        'sentences': [{'text': {'content': content, 'beginOffset': offset},
+                       'sentiment': {'score': score, 'magnitude': magnitude}}
+                      for content, offset in sentences]
+    }
+
+
+class TestSentimentAccumulator:
+    def test_empty_accumulator_is_neutral(self):
+        accumulator = SentimentAccumulator()
+        assert accumulator.score == 0.0
+        assert accumulator.to_response() == {'documentSentiment': {'score': 0.0, 'magnitude': 0.0}}
+
+    def test_weights_scores_by_length_and_magnitude(self):
+        accumulator = SentimentAccumulator()
+        accumulator.add(response(0.8, 2.0), 100)
+        accumulator.add(response(-0.5, 0.5), 300)
+        expected = (0.8 * 100 * 2.0 - 0.5 * 300 * 0.5) / (100 * 2.0 + 300 * 0.5)
+        assert accumulator.score == pytest.approx(expected)
+        assert accumulator.magnitude == pytest.approx(2.5)
+        assert accumulator.chunks == 2
+        assert accumulator.characters == 400
+
+    def test_falls_back_to_length_weighting_without_magnitude(self):
+        accumulator = SentimentAccumulator()
+        accumulator.add(response(0.6, 0.0), 100)
+        accumulator.add(response(-0.2, 0.0), 300)
+        assert accumulator.score == pytest.approx((0.6 * 100 - 0.2 * 300) / 400)
+
+    def test_sentences_are_dropped_unless_kept(self):
+        accumulator = SentimentAccumulator()
+        accumulator.add(response(0.5, 1.0, [('Fine.', 0)]), 5)
+        assert accumulator.sentences == []
+        assert 'sentences' not in accumulator.to_response()
+
+    def test_sentence_offsets_are_shifted_to_the_document(self):
+        accumulator = SentimentAccumulator(keep_sentences=True)
+        accumulator.add(response(0.5, 1.0, [('Fine.', 3)]), 10, offset=40)
+        sentence, = accumulator.to_response()['sentences']
+        assert sentence['text'] == {'content': 'Fine.', 'beginOffset': 43}
+
+    def test_add_many_matches_add(self):
+        responses = [
+            response(0.9, 3.0, [('Great.', 0), ('Really great.', 7)]),
+            response(-0.4, 0.0, [('Meh.', 0)]),
+            response(-0.7, 1.5, [('Awful.', 2)]),
+        ]
+        lengths = [20, 8, 15]
+
+        one_by_one = SentimentAccumulator(keep_sentences=True)
+        offset = 0
+        for api_response, length in zip(responses, lengths):
+            one_by_one.add(api_response, length, offset)
+            # Chunks are joined by one separator character
+            offset += length + 1
+
+        at_once = SentimentAccumulator(keep_sentences=True)
+        at_once.add_many(responses, lengths)
+
+        assert at_once.score == pytest.approx(one_by_one.score)
+        assert at_once.magnitude == pytest.approx(one_by_one.magnitude)
+        assert (at_once.chunks, at_once.characters) == (one_by_one.chunks, one_by_one.characters)
+        assert at_once.sentences == one_by_one.sentences
+        assert [s['text']['beginOffset'] for s in at_once.sentences] == [0, 7, 21, 32]
+
+    def test_add_many_continues_after_earlier_chunks(self):
+        accumulator = SentimentAccumulator(keep_sentences=True)
+        accumulator.add(response(0.1, 1.0), 10)
+        accumulator.add_many([response(0.2, 1.0, [('Next.', 0)])], [5])
+        assert accumulator.sentences[0]['text']['beginOffset'] == 11
+        assert accumulator.chunks == 2
+
+    def test_add_many_without_responses_changes_nothing(self):
+        accumulator = SentimentAccumulator()
+        accumulator.add_many([], [])
+        assert (accumulator.chunks, accumulator.characters, accumulator.score) == (0, 0, 0.0)
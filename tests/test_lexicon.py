@@ -0,0 +1,160 @@
+"""
+Tests for the lexicon matcher and the compiled lexicon store.
+"""
+
+import logging
+import os
+
+import pytest
+
+from app.utils.lexicon_matcher import InMemoryLexicon, LexiconMatcher, build_matcher, term_key
+from app.utils.lexicon_store import (LexiconIndex, LexiconStore, compile_lexicon,
+                                     load_lexicon_file)
+
+
+def write_lexicon(path, lines):
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+    return str(path)
+
+
+def terms_found(matcher, text):
+    return {hit['term']: (hit['weight'], hit['count']) for hit in matcher.scan(text)}
+
+
+class TestTermKey:
+    def test_tokenizes_like_the_text(self):
+        assert term_key('Good') == 'good'
+        assert term_key("can't  stand") == 'can t stand'
+        assert term_key('well-known') == 'well known'
+
+    def test_terms_without_word_characters_have_no_key(self):
+        assert term_key(':)') == ''
+
+
+class TestLexiconMatcher:
+    def test_counts_words_case_insensitively(self):
+        matcher = build_matcher(['good'], ['bad'])
+        found = terms_found(matcher, 'Good, good and BAD.')
+        assert found == {'good': (1.0, 2), 'bad': (-1.0, 1)}
+
+    def test_matches_phrases_and_their_words(self):
+        matcher = LexiconMatcher(InMemoryLexicon({'not good': -2.0, 'good': 3.0}))
+        hits = matcher.scan('It was not good, but good enough.')
+        by_term = {hit['term']: hit for hit in hits}
+        assert by_term['not good']['weight'] == -2.0
+        assert by_term['not good']['tokens'] == 2
+        assert by_term['good']['count'] == 2
+
+    def test_phrases_join_across_apostrophes_and_hyphens(self):
+        matcher = LexiconMatcher(InMemoryLexicon({"can't stand": -3.0, 'well-known': 1.0}))
+        found = terms_found(matcher, "I can't stand it. A well-known brand.")
+        assert found == {"can't stand": (-3.0, 1), 'well-known': (1.0, 1)}
+
+    def test_phrases_do_not_cross_punctuation(self):
+        matcher = LexiconMatcher(InMemoryLexicon({'not good': -2.0}))
+        assert matcher.scan('That is not. Good things happen.') == []
+
+    def test_reports_first_match_offsets(self):
+        text = 'fine, really fine'
+        hit, = build_matcher(['fine'], []).scan(text)
+        assert text[hit['start']:hit['end']] == 'fine'
+        assert hit['start'] == 0
+
+
+class TestLoadLexiconFile:
+    def test_reads_afinn_and_vader_lines(self, tmp_path):
+        path = write_lexicon(tmp_path / 'lexicon.tsv', [
+            '# comment',
+            'good\t3',
+            'Well-Known\t1.5\t0.5\t[1, 2]',
+            '',
+        ])
+        assert load_lexicon_file(path) == {'good': 3.0, 'well known': 1.5}
+
+    def test_skips_malformed_lines(self, tmp_path, caplog):
+        path = write_lexicon(tmp_path / 'lexicon.tsv', ['good\t3', 'nothing', 'bad\tworse'])
+        with caplog.at_level(logging.WARNING):
+            assert load_lexicon_file(path) == {'good': 3.0}
+        assert 'line 2' in caplog.text
+        assert 'line 3' in caplog.text
+
+    def test_warns_about_unmatchable_entries(self, tmp_path, caplog):
+        path = write_lexicon(tmp_path / 'lexicon.tsv', ['good\t3', ':)\t2', ':(\t-2'])
+        with caplog.at_level(logging.WARNING):
+            assert load_lexicon_file(path) == {'good': 3.0}
+        assert 'Skipping 2 lexicon entries' in caplog.text
+
+
+class TestCompiledLexicon:
+    def test_index_matches_in_memory_lexicon(self, tmp_path):
+        source = write_lexicon(tmp_path / 'lexicon.tsv', [
+            'good\t3', 'not good\t-2', "can't stand\t-3", 'very very good\t4', 'meh\t0',
+        ])
+        index_path = str(tmp_path / 'lexicon.idx')
+        compile_lexicon([source], index_path)
+        index = LexiconIndex(index_path)
+        try:
+            expected = InMemoryLexicon(load_lexicon_file(source))
+            assert len(expected) == 5
+            assert index.max_tokens == expected.max_tokens == 3
+            assert dict(index.items()) == {'good': 3.0, 'not good': -2.0, 'can t stand': -3.0,
+                                           'very very good': 4.0, 'meh': 0.0}
+            # "very" and "very very" are only phrase prefixes, "not" likewise
+            assert index.weight('very') is None
+            assert index.is_prefix('very very')
+            assert index.weight('missing') is None
+
+            text = "Not good. I can't stand very very good meh things, not good at all."
+            assert LexiconMatcher(index).scan(text) == LexiconMatcher(expected).scan(text)
+        finally:
+            index.close()
+
+    def test_later_sources_override_earlier_ones(self, tmp_path):
+        first = write_lexicon(tmp_path / 'first.tsv', ['good\t3', 'bad\t-3'])
+        second = write_lexicon(tmp_path / 'second.tsv', ['good\t1'])
+        index_path = str(tmp_path / 'lexicon.idx')
+        compile_lexicon([first, second], index_path)
+        index = LexiconIndex(index_path)
+        try:
+            assert dict(index.items()) == {'bad': -3.0, 'good': 1.0}
+        finally:
+            index.close()
+
+    def test_rejects_files_that_are_not_an_index(self, tmp_path):
+        path = tmp_path / 'lexicon.idx'
+        path.write_bytes(b'\0' * 64)
+        with pytest.raises(ValueError):
+            LexiconIndex(str(path))
+
+
+class TestLexiconStore:
+    def test_recompiles_when_a_source_changes(self, tmp_path):
+        source = tmp_path / 'lexicon.tsv'
+        write_lexicon(source, ['good\t3'])
+        store = LexiconStore([str(source)], str(tmp_path / 'lexicon.idx'), reload_interval=0)
+        assert store.index().weight('good') == 3.0
+
+        write_lexicon(source, ['good\t1', 'terrible\t-4'])
+        stat = os.stat(source)
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert store.index().weight('good') == 1.0
+        assert terms_found(store.matcher(), 'terrible') == {'terrible': (-4.0, 1)}
+
+    def test_reuses_a_current_index(self, tmp_path):
+        source = write_lexicon(tmp_path / 'lexicon.tsv', ['good\t3'])
+        index_path = str(tmp_path / 'lexicon.idx')
+        LexiconStore([source], index_path).matcher()
+        mtime = os.stat(index_path).st_mtime_ns
+
+        other = LexiconStore([source], index_path)
+        assert other.index().weight('good') == 3.0
+        assert os.stat(index_path).st_mtime_ns == mtime
+
+    def test_replaces_an_unreadable_index(self, tmp_path, caplog):
+        source = write_lexicon(tmp_path / 'lexicon.tsv', ['good\t3'])
+        index_path = tmp_path / 'lexicon.idx'
+        index_path.write_bytes(b'garbage')
+        with caplog.at_level(logging.WARNING):
+            store = LexiconStore([source], str(index_path))
+            assert store.index().weight('good') == 3.0
+        assert 'Discarding unreadable lexicon index' in caplog.text
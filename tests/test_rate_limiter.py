@@ -0,0 +1,174 @@
+"""
+Tests for the GCRA rate limiter and the Retry-After handling.
+"""
+
+import email.utils
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils import rate_limiter
+from app.utils.rate_limiter import (MemoryBucketStore, RateLimiter, RateLimitExceeded,
+                                    SQLiteBucketStore, call_with_rate_limit, retry_delay)
+from config.settings import Config
+
+NOW = 1_700_000_000.0
+
+
+def slot(expected):
+    # Slot times are epoch-sized floats, good to about a microsecond
+    return pytest.approx(expected, abs=1e-6)
+
+
+class FakeClock:
+    """Stands in for the time module so slot times are exact."""
+
+    def __init__(self):
+        self.now = NOW
+        self.slept = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter, 'time', clock)
+    return clock
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def make_store(request, tmp_path):
+    if request.param == 'memory':
+        return MemoryBucketStore
+    return lambda: SQLiteBucketStore(str(tmp_path / 'buckets.db'))
+
+
+def throttled(retry_after=None):
+    headers = {'Retry-After': retry_after} if retry_after is not None else {}
+    return SimpleNamespace(status_code=429, headers=headers)
+
+
+class TestRateLimiter:
+    def test_spaces_calls_by_the_interval(self, clock, make_store):
+        limiter = RateLimiter(qps=10, store=make_store())
+        assert [limiter.reserve('key') for _ in range(3)] == slot([0.0, 0.1, 0.2])
+
+    def test_burst_is_admitted_at_once(self, clock, make_store):
+        limiter = RateLimiter(qps=10, burst=3, store=make_store())
+        assert [limiter.reserve('key') for _ in range(4)] == slot([0.0, 0.0, 0.0, 0.1])
+
+    def test_bucket_refills_while_idle(self, clock, make_store):
+        limiter = RateLimiter(qps=10, burst=2, store=make_store())
+        for _ in range(4):
+            limiter.reserve('key')
+        clock.now += 10
+        assert limiter.reserve('key') == 0.0
+
+    def test_keys_have_separate_buckets(self, clock, make_store):
+        limiter = RateLimiter(qps=1, store=make_store())
+        assert limiter.reserve('first') == 0.0
+        assert limiter.reserve('second') == 0.0
+        assert limiter.reserve('first') == slot(1.0)
+
+    def test_full_queue_raises_without_taking_a_slot(self, clock, make_store):
+        limiter = RateLimiter(qps=1, max_wait=1.5, store=make_store())
+        limiter.reserve('key')
+        limiter.reserve('key')
+        with pytest.raises(RateLimitExceeded):
+            limiter.reserve('key')
+        clock.now += 1
+        assert limiter.reserve('key') == slot(1.0)
+
+    def test_pause_holds_back_every_caller(self, clock, make_store):
+        limiter = RateLimiter(qps=10, burst=3, store=make_store())
+        limiter.pause('key', 5.0)
+        assert limiter.reserve('key') == slot(5.0)
+
+    def test_pause_never_brings_slots_forward(self, clock, make_store):
+        limiter = RateLimiter(qps=1, max_wait=60, store=make_store())
+        for _ in range(10):
+            limiter.reserve('key')
+        limiter.pause('key', 1.0)
+        assert limiter.reserve('key') == slot(10.0)
+
+    def test_sqlite_buckets_are_shared(self, clock, tmp_path):
+        path = str(tmp_path / 'buckets.db')
+        first = RateLimiter(qps=10, store=SQLiteBucketStore(path))
+        second = RateLimiter(qps=10, store=SQLiteBucketStore(path))
+        assert first.reserve('key') == 0.0
+        assert second.reserve('key') == slot(0.1)
+
+    def test_api_keys_are_not_stored(self, clock, tmp_path):
+        path = tmp_path / 'buckets.db'
+        RateLimiter(qps=10, store=SQLiteBucketStore(str(path))).reserve('secret-api-key')
+        assert b'secret-api-key' not in path.read_bytes()
+
+
+class TestRetryDelay:
+    @pytest.fixture(autouse=True)
+    def no_jitter(self, monkeypatch):
+        monkeypatch.setattr(rate_limiter.random, 'random', lambda: 0.0)
+        monkeypatch.setattr(Config, 'GOOGLE_API_RETRY_BASE_DELAY', 1.0)
+
+    @pytest.fixture
+    def local_time_zone(self, monkeypatch):
+        # A zone far from UTC, so a date read as local time would be hours off
+        monkeypatch.setenv('TZ', 'Pacific/Kiritimati')
+        time.tzset()
+        yield
+        monkeypatch.undo()
+        time.tzset()
+
+    def test_backoff_doubles_without_retry_after(self):
+        assert [retry_delay(throttled(), attempt) for attempt in range(4)] == [1.0, 2.0, 4.0, 8.0]
+
+    def test_retry_after_seconds_is_a_lower_bound(self):
+        assert retry_delay(throttled('7'), 0) == 7.0
+        assert retry_delay(throttled('0.5'), 2) == 4.0
+
+    def test_retry_after_http_date(self):
+        date = email.utils.formatdate(time.time() + 30, usegmt=True)
+        assert retry_delay(throttled(date), 0) == pytest.approx(30, abs=2)
+
+    def test_timezone_less_http_date_is_read_as_gmt(self, local_time_zone):
+        date = email.utils.formatdate(time.time() + 30, usegmt=True)[:-len(' GMT')]
+        assert retry_delay(throttled(date), 0) == pytest.approx(30, abs=2)
+
+    def test_past_http_date_falls_back_to_backoff(self):
+        date = email.utils.formatdate(time.time() - 3600, usegmt=True)
+        assert retry_delay(throttled(date), 1) == 2.0
+
+    @pytest.mark.parametrize('value', ['soon', 'Wed, 99 Foo 2015', 'inf', 'nan', '-5', ''])
+    def test_malformed_retry_after_falls_back_to_backoff(self, value):
+        assert retry_delay(throttled(value), 1) == 2.0
+
+    def test_jitter_adds_at_most_half(self, monkeypatch):
+        monkeypatch.setattr(rate_limiter.random, 'random', lambda: 0.999)
+        assert 4.0 < retry_delay(throttled(), 2) < 6.0
+
+
+class TestCallWithRateLimit:
+    @pytest.fixture(autouse=True)
+    def settings(self, monkeypatch, clock):
+        monkeypatch.setattr(Config, 'GOOGLE_API_QPS', 0)
+        monkeypatch.setattr(Config, 'GOOGLE_API_MAX_THROTTLE_RETRIES', 2)
+        monkeypatch.setattr(Config, 'GOOGLE_API_RETRY_BASE_DELAY', 1.0)
+        monkeypatch.setattr(rate_limiter.random, 'random', lambda: 0.0)
+
+    def test_retries_throttled_calls(self, clock):
+        responses = iter([throttled('3'), throttled(), SimpleNamespace(status_code=200, headers={})])
+        response = call_with_rate_limit('key', lambda: next(responses))
+        assert response.status_code == 200
+        assert clock.slept == [3.0, 2.0]
+
+    def test_gives_up_after_the_retry_limit(self, clock):
+        response = call_with_rate_limit('key', throttled)
+        assert response.status_code == 429
+        assert clock.slept == [1.0, 2.0]